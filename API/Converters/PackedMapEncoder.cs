@@ -0,0 +1,64 @@
+using System.Buffers.Binary;
+using Microsoft.Net.Http.Headers;
+
+namespace API.Converters;
+
+// Compact map encoding for clients that accept application/x-fle-packed (see IsAccepted).
+// Layout (little-endian): "FLEM", int32 version, int32 water/land/offshore pump counts,
+// then int32 x, y pairs for the water tiles, land tiles and offshore pump locations.
+public static class PackedMapEncoder
+{
+    public const string MediaType = "application/x-fle-packed";
+    private const int Version = 1;
+    private const int HeaderLength = 4 * 5;
+
+    // Packed only when the Accept header lists the media type with a non-zero quality that
+    // is not below the quality given to application/json; wildcards never select it.
+    public static bool IsAccepted(HttpRequest request)
+    {
+        if (!MediaTypeHeaderValue.TryParseList(request.Headers.Accept, out var accepted))
+        {
+            return false;
+        }
+
+        var packed = QualityOf(accepted, MediaType);
+        return packed > 0 && packed >= QualityOf(accepted, "application/json");
+    }
+
+    private static double QualityOf(IList<MediaTypeHeaderValue> accepted, string mediaType) =>
+        accepted
+            .Where(value => value.MediaType.Equals(mediaType, StringComparison.OrdinalIgnoreCase))
+            .Select(value => value.Quality ?? 1.0)
+            .DefaultIfEmpty(0.0)
+            .Max();
+
+    public static byte[] Encode(MapData mapData)
+    {
+        var water = mapData.Tiles.WaterTiles;
+        var land = mapData.Tiles.LandTiles;
+        var pumps = mapData.OffshorePumpLocations;
+
+        var buffer = new byte[HeaderLength + 8 * (water.Count + land.Count + pumps.Count)];
+        var span = buffer.AsSpan();
+
+        "FLEM"u8.CopyTo(span);
+        BinaryPrimitives.WriteInt32LittleEndian(span[4..], Version);
+        BinaryPrimitives.WriteInt32LittleEndian(span[8..], water.Count);
+        BinaryPrimitives.WriteInt32LittleEndian(span[12..], land.Count);
+        BinaryPrimitives.WriteInt32LittleEndian(span[16..], pumps.Count);
+
+        var offset = HeaderLength;
+        foreach (var tiles in new[] { water, land, pumps })
+        {
+            foreach (var tile in tiles)
+            {
+                // Tile positions are the integer top-left corner of the tile
+                BinaryPrimitives.WriteInt32LittleEndian(span[offset..], (int)Math.Floor(tile.Position.X));
+                BinaryPrimitives.WriteInt32LittleEndian(span[(offset + 4)..], (int)Math.Floor(tile.Position.Y));
+                offset += 8;
+            }
+        }
+
+        return buffer;
+    }
+}
@@ -0,0 +1,38 @@
+namespace API.Models;
+
+public class ActionsStatus
+{
+    [JsonPropertyName("tick")]
+    public long Tick { get; set; }
+
+    [JsonPropertyName("paused")]
+    public bool Paused { get; set; }
+
+    [JsonPropertyName("speed")]
+    public double Speed { get; set; } = 1;
+
+    // Set while an execute with `untilIdle` is running; the game pauses itself when it ends.
+    [JsonPropertyName("until_idle")]
+    public bool UntilIdle { get; set; }
+
+    [JsonPropertyName("done")]
+    public bool Done { get; set; }
+
+    [JsonPropertyName("agents")]
+    public List<AgentActionsStatus> Agents { get; set; } = [];
+}
+
+public class AgentActionsStatus
+{
+    [JsonPropertyName("agent_id")]
+    public int AgentId { get; set; }
+
+    [JsonPropertyName("completed")]
+    public int Completed { get; set; }
+
+    [JsonPropertyName("total")]
+    public int Total { get; set; }
+
+    [JsonPropertyName("done")]
+    public bool Done { get; set; }
+}
@@ -0,0 +1,20 @@
+namespace API.Models;
+
+public class Checkpoint
+{
+    [JsonPropertyName("name")]
+    public string Name { get; set; } = string.Empty;
+
+    [JsonPropertyName("tick")]
+    public long Tick { get; set; }
+
+    [JsonPropertyName("agents")]
+    public int Agents { get; set; }
+
+    [JsonPropertyName("error")]
+    public string? Error { get; set; }
+
+    // Names are embedded in RCON commands, so only letters, digits, '-' and '_' are allowed.
+    public static bool IsValidName(string name) =>
+        name.Length is > 0 and <= 64 && name.All(c => char.IsAsciiLetterOrDigit(c) || c is '-' or '_');
+}
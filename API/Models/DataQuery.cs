@@ -0,0 +1,101 @@
+using System.Globalization;
+
+namespace API.Models;
+
+// Narrows a /data request: search `Radius` tiles around the agent, or only `Area` when it is
+// set, and return only the listed `Fields`. Passed to the FLE remote call as an options table,
+// so the mod skips the work for everything that was not asked for.
+public class DataQuery
+{
+    public const int MaxRadius = 1000;
+
+    private static readonly Dictionary<DataType, string[]> FieldsByType = new()
+    {
+        [DataType.Meta] = ["resources", "items", "recipes", "technologies"],
+        [DataType.State] = ["agents", "buildings", "electricity", "flow", "research_queue"],
+        [DataType.Map] = ["tiles", "offshore_pump_locations"]
+    };
+
+    public int Radius { get; init; }
+
+    public BoundingBox? Area { get; init; }
+
+    public List<string>? Fields { get; init; }
+
+    // Parses the `radius`, `bbox` ("left,top,right,bottom") and comma-separated `fields` query parameters.
+    public static bool TryParse(DataType dataType, int? radius, string? bbox, string? fields, int defaultRadius, out DataQuery query, out string error)
+    {
+        query = new DataQuery();
+        error = string.Empty;
+
+        var searchRadius = radius ?? defaultRadius;
+        if (searchRadius is <= 0 or > MaxRadius)
+        {
+            error = $"radius must be between 1 and {MaxRadius}";
+            return false;
+        }
+
+        BoundingBox? area = null;
+        if (!string.IsNullOrWhiteSpace(bbox))
+        {
+            var corners = bbox.Split(',');
+            var values = new double[4];
+            if (corners.Length != 4)
+            {
+                error = "bbox must be four numbers: left,top,right,bottom";
+                return false;
+            }
+            for (var i = 0; i < 4; i++)
+            {
+                if (!double.TryParse(corners[i], NumberStyles.Float, CultureInfo.InvariantCulture, out values[i]) || !double.IsFinite(values[i]))
+                {
+                    error = "bbox must be four numbers: left,top,right,bottom";
+                    return false;
+                }
+            }
+            if (values[0] >= values[2] || values[1] >= values[3])
+            {
+                error = "bbox must have left < right and top < bottom";
+                return false;
+            }
+
+            area = new BoundingBox { LeftTop = new Position(values[0], values[1]), RightBottom = new Position(values[2], values[3]) };
+        }
+
+        List<string>? selected = null;
+        if (!string.IsNullOrWhiteSpace(fields))
+        {
+            selected = fields.Split(',', StringSplitOptions.TrimEntries | StringSplitOptions.RemoveEmptyEntries).Distinct().ToList();
+            var unknown = selected.Except(FieldsByType[dataType]).ToList();
+            if (unknown.Count > 0)
+            {
+                error = $"Unknown fields: {string.Join(", ", unknown)}. Valid fields: {string.Join(", ", FieldsByType[dataType])}";
+                return false;
+            }
+        }
+
+        query = new DataQuery { Radius = searchRadius, Area = area, Fields = selected };
+        return true;
+    }
+
+    // Lua table literal for the remote call, e.g. {area = {{-10, -10}, {10, 10}}, fields = {"buildings"}}.
+    // Only validated numbers and known field names reach it, so nothing needs escaping.
+    public string ToLuaTable()
+    {
+        var entries = new List<string>();
+
+        if (Area is not null)
+        {
+            entries.Add($"area = {{{{{Number(Area.LeftTop.X)}, {Number(Area.LeftTop.Y)}}}, {{{Number(Area.RightBottom.X)}, {Number(Area.RightBottom.Y)}}}}}");
+        }
+
+        if (Fields is not null)
+        {
+            entries.Add($"fields = {{{string.Join(", ", Fields.Select(field => $"\"{field}\""))}}}");
+        }
+
+        return $"{{{string.Join(", ", entries)}}}";
+    }
+
+    private static string Number(double value) => value.ToString("R", CultureInfo.InvariantCulture);
+}
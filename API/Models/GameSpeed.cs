@@ -0,0 +1,16 @@
+namespace API.Models;
+
+public class GameSpeed
+{
+    // Factorio's lower bound; at the upper one a headless server runs as fast as the CPU allows.
+    public const double MinSpeed = 0.01;
+    public const double MaxSpeed = 1000;
+
+    [JsonPropertyName("speed")]
+    public double Speed { get; set; }
+
+    [JsonPropertyName("error")]
+    public string? Error { get; set; }
+
+    public static bool IsValid(double speed) => speed is >= MinSpeed and <= MaxSpeed;
+}
@@ -0,0 +1,16 @@
+namespace API.Models;
+
+public class HealthStatus
+{
+    [JsonPropertyName("status")]
+    public string Status { get; set; } = string.Empty;
+
+    [JsonPropertyName("rcon")]
+    public bool Rcon { get; set; }
+
+    [JsonPropertyName("tick")]
+    public long? Tick { get; set; }
+
+    [JsonPropertyName("error")]
+    public string? Error { get; set; }
+}
@@ -5,6 +5,12 @@ public class Building
     [JsonPropertyName("name")]
     public string Name { get; set; } = string.Empty;
 
+    [JsonPropertyName("unit_number")]
+    public long? UnitNumber { get; set; }
+
+    [JsonPropertyName("key")]
+    public string? Key { get; set; }
+
     [JsonPropertyName("position")]
     public Position Position { get; set; } = new(0, 0);
 
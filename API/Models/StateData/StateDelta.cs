@@ -0,0 +1,32 @@
+namespace API.Models;
+
+// Sections the caller did not ask for are null and left out of the response.
+public class StateDelta
+{
+    [JsonPropertyName("version")]
+    public int Version { get; set; }
+
+    [JsonPropertyName("full")]
+    public bool Full { get; set; }
+
+    [JsonPropertyName("agents")]
+    public List<Agent>? Agents { get; set; }
+
+    [JsonPropertyName("removed_agents")]
+    public List<int>? RemovedAgents { get; set; }
+
+    [JsonPropertyName("buildings")]
+    public List<Building>? Buildings { get; set; }
+
+    [JsonPropertyName("removed_buildings")]
+    public List<string>? RemovedBuildings { get; set; }
+
+    [JsonPropertyName("electricity")]
+    public ElectricityData? Electricity { get; set; }
+
+    [JsonPropertyName("flow")]
+    public FlowData? Flow { get; set; }
+
+    [JsonPropertyName("research_queue")]
+    public List<ResearchQueueItem>? ResearchQueue { get; set; }
+}
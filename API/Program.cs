@@ -1,3 +1,4 @@
+using Microsoft.AspNetCore.ResponseCompression;
 using Scalar.AspNetCore;
 
 namespace API;
@@ -31,6 +32,12 @@ public class Program
             });
         });
 
+        // Compress JSON and packed responses for clients that accept gzip/brotli
+        builder.Services.AddResponseCompression(options =>
+        {
+            options.MimeTypes = ResponseCompressionDefaults.MimeTypes.Append(PackedMapEncoder.MediaType);
+        });
+
         // Register CommunicationHandler as singleton for RCON communication
         builder.Services.AddSingleton<ICommunicationHandler>(serviceProvider =>
             new CommunicationHandler(serviceProvider.GetRequiredService<IConfiguration>()));
@@ -38,24 +45,64 @@ public class Program
         // Register ActionProcessor
         builder.Services.AddSingleton<IActionProcessor, ActionProcessor>();
 
+        // Register ActionsStatusWatcher for completion notifications
+        builder.Services.AddSingleton<IActionsStatusWatcher, ActionsStatusWatcher>();
+
+        // Register IdempotencyCache so retried action submissions are queued only once
+        builder.Services.AddSingleton<IIdempotencyCache, IdempotencyCache>();
+
         var app = builder.Build();
 
+        app.UseResponseCompression();
+
         // Configure OpenAPI and Scalar UI for all environments (useful for containerized deployment)
         app.MapOpenApi();
         app.MapScalarApiReference();
 
+        // Readiness probe: cheap to serve and only healthy once RCON commands reach the game
+        app.MapGet("/health", async (ICommunicationHandler communicationHandler, IConfiguration configuration) =>
+        {
+            var timeout = TimeSpan.FromMilliseconds(configuration.GetValue<int>("Rcon:HealthTimeoutMs", 2000));
+            try
+            {
+                var tick = await communicationHandler.PingAsync().WaitAsync(timeout);
+                return Results.Ok(new HealthStatus { Status = "healthy", Rcon = true, Tick = tick });
+            }
+            catch (Exception ex)
+            {
+                var health = new HealthStatus { Status = "unhealthy", Rcon = false, Error = ex.Message };
+                return Results.Json(health, AppJsonSerializerContext.Default.HealthStatus, statusCode: StatusCodes.Status503ServiceUnavailable);
+            }
+        })
+        .WithName("GetHealth")
+        .WithSummary("Readiness probe")
+        .WithDescription("Returns 200 once the API can run commands in the game over RCON, and 503 until then.")
+        .Produces<HealthStatus>(200)
+        .Produces<HealthStatus>(503);
+
         var dataApi = app.MapGroup("/data");
 
         // Strongly-typed meta data endpoint
-        dataApi.MapGet("/meta/{agentId:int}", async (int agentId, ICommunicationHandler communicationHandler) =>
+        dataApi.MapGet("/meta/{agentId:int}", async (int agentId, int? radius, string? bbox, string? fields, HttpResponse httpResponse, ICommunicationHandler communicationHandler, IConfiguration configuration) =>
         {
+            if (!DataQuery.TryParse(DataType.Meta, radius, bbox, fields, configuration.GetValue<int>("Data:DefaultRadius", 150), out var query, out var queryError))
+            {
+                return Results.BadRequest(queryError);
+            }
+
             try
             {
-                var jsonData = await communicationHandler.GetDataAsync(agentId, DataType.Meta, 150);
-                var metaData = JsonSerializer.Deserialize<MetaData>(jsonData, AppJsonSerializerContext.Default.MetaData);
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.GetDataAsync(agentId, DataType.Meta, query));
+                var metaData = timing.Measure("deserialize", () => JsonSerializer.Deserialize<MetaData>(jsonData, AppJsonSerializerContext.Default.MetaData));
+                timing.Apply(httpResponse);
                 
                 return Results.Ok(metaData);
             }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
             catch (Exception ex)
             {
                 return Results.BadRequest($"Error parsing meta data: {ex.Message}");
@@ -63,20 +110,32 @@ public class Program
         })
         .WithName("GetMetaData")
         .WithSummary("Get game meta data")
-        .WithDescription("Retrieves meta information about the game including items, recipes, and technologies for the specified agent.")
+        .WithDescription("Retrieves meta information about the game including items, recipes, and technologies for the specified agent. Resources are searched within `radius` tiles of the agent (default 150) or inside `bbox` (left,top,right,bottom); `fields` (comma-separated: resources, items, recipes, technologies) limits what is collected.")
         .Produces<MetaData>(200)
-        .ProducesProblem(400);
+        .ProducesProblem(400)
+        .ProducesProblem(503);
 
         // Strongly-typed state data endpoint
-        dataApi.MapGet("/state/{agentId:int}", async (int agentId, ICommunicationHandler communicationHandler) =>
+        dataApi.MapGet("/state/{agentId:int}", async (int agentId, int? radius, string? bbox, string? fields, HttpResponse httpResponse, ICommunicationHandler communicationHandler, IConfiguration configuration) =>
         {
+            if (!DataQuery.TryParse(DataType.State, radius, bbox, fields, configuration.GetValue<int>("Data:DefaultRadius", 150), out var query, out var queryError))
+            {
+                return Results.BadRequest(queryError);
+            }
+
             try
             {
-                var jsonData = await communicationHandler.GetDataAsync(agentId, DataType.State, 150);
-                var stateData = JsonSerializer.Deserialize<StateData>(jsonData, AppJsonSerializerContext.Default.StateData);
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.GetDataAsync(agentId, DataType.State, query));
+                var stateData = timing.Measure("deserialize", () => JsonSerializer.Deserialize<StateData>(jsonData, AppJsonSerializerContext.Default.StateData));
+                timing.Apply(httpResponse);
                 
                 return Results.Ok(stateData);
             }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
             catch (Exception ex)
             {
                 return Results.BadRequest($"Error parsing state data: {ex.Message}");
@@ -84,20 +143,72 @@ public class Program
         })
         .WithName("GetStateData")
         .WithSummary("Get game state data")
-        .WithDescription("Retrieves current state information including agent status, buildings, and research progress for the specified agent.")
+        .WithDescription("Retrieves current state information including agent status, buildings, and research progress for the specified agent. Buildings are searched within `radius` tiles of the agent (default 150) or inside `bbox` (left,top,right,bottom); `fields` (comma-separated: agents, buildings, electricity, flow, research_queue) limits what is collected.")
         .Produces<StateData>(200)
-        .ProducesProblem(400);
+        .ProducesProblem(400)
+        .ProducesProblem(503);
+
+        // Incremental state endpoint: only agents and buildings changed since `since`
+        dataApi.MapGet("/state/{agentId:int}/delta", async (int agentId, int? since, int? radius, string? bbox, string? fields, HttpResponse httpResponse, ICommunicationHandler communicationHandler, IConfiguration configuration) =>
+        {
+            if (!DataQuery.TryParse(DataType.State, radius, bbox, fields, configuration.GetValue<int>("Data:DefaultRadius", 150), out var query, out var queryError))
+            {
+                return Results.BadRequest(queryError);
+            }
+
+            try
+            {
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.GetStateDeltaAsync(agentId, query, since ?? -1));
+                var stateDelta = timing.Measure("deserialize", () => JsonSerializer.Deserialize<StateDelta>(jsonData, AppJsonSerializerContext.Default.StateDelta));
+                timing.Apply(httpResponse);
+                
+                return Results.Ok(stateDelta);
+            }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error parsing state delta: {ex.Message}");
+            }
+        })
+        .WithName("GetStateDelta")
+        .WithSummary("Get game state changes")
+        .WithDescription("Retrieves the agents and buildings added, changed or removed since the given snapshot version. Omit `since` or pass a stale version to receive a full snapshot (full = true). `radius` and `bbox` scope the search as for the state endpoint; changing them also yields a full snapshot. Only agents and buildings are included unless `fields` lists the sections wanted (agents, buildings, electricity, flow, research_queue); sections left out keep their snapshot for later polls.")
+        .Produces<StateDelta>(200)
+        .ProducesProblem(400)
+        .ProducesProblem(503);
 
         // Strongly-typed map data endpoint
-        dataApi.MapGet("/map/{agentId:int}", async (int agentId, ICommunicationHandler communicationHandler) =>
+        dataApi.MapGet("/map/{agentId:int}", async (int agentId, int? radius, string? bbox, string? fields, HttpRequest request, HttpResponse httpResponse, ICommunicationHandler communicationHandler, IConfiguration configuration) =>
         {
+            if (!DataQuery.TryParse(DataType.Map, radius, bbox, fields, configuration.GetValue<int>("Data:DefaultRadius", 150), out var query, out var queryError))
+            {
+                return Results.BadRequest(queryError);
+            }
+
             try
             {
-                var jsonData = await communicationHandler.GetDataAsync(agentId, DataType.Map, 150);
-                var mapData = JsonSerializer.Deserialize<MapData>(jsonData, AppJsonSerializerContext.Default.MapData);
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.GetDataAsync(agentId, DataType.Map, query));
+                var mapData = timing.Measure("deserialize", () => JsonSerializer.Deserialize<MapData>(jsonData, AppJsonSerializerContext.Default.MapData));
                 
+                if (mapData != null && PackedMapEncoder.IsAccepted(request))
+                {
+                    var packed = timing.Measure("encode", () => PackedMapEncoder.Encode(mapData));
+                    timing.Apply(httpResponse);
+                    return Results.Bytes(packed, PackedMapEncoder.MediaType);
+                }
+
+                timing.Apply(httpResponse);
                 return Results.Ok(mapData);
             }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
             catch (Exception ex)
             {
                 return Results.BadRequest($"Error parsing map data: {ex.Message}");
@@ -105,12 +216,14 @@ public class Program
         })
         .WithName("GetMapData")
         .WithSummary("Get game map data")
-        .WithDescription("Retrieves map information including tile locations and offshore pump positions for the specified agent.")
+        .WithDescription("Retrieves map information including tile locations and offshore pump positions for the specified agent. Tiles are searched within `radius` tiles of the agent (default 150) or inside `bbox` (left,top,right,bottom); `fields` (comma-separated: tiles, offshore_pump_locations) limits what is collected. Send `Accept: application/x-fle-packed` for a packed int32 encoding of the tile positions.")
         .Produces<MapData>(200)
-        .ProducesProblem(400);
+        .Produces(200, contentType: PackedMapEncoder.MediaType)
+        .ProducesProblem(400)
+        .ProducesProblem(503);
 
         // Actions endpoint - moved out of data group
-        app.MapPost("/actions", async (ActionsRequest request, IActionProcessor actionProcessor, ICommunicationHandler communicationHandler, ILogger<Program> logger) =>
+        app.MapPost("/actions", async (ActionsRequest request, HttpRequest httpRequest, HttpResponse httpResponse, IActionProcessor actionProcessor, ICommunicationHandler communicationHandler, IIdempotencyCache idempotencyCache, ILogger<Program> logger) =>
         {
             try
             {
@@ -150,7 +263,8 @@ public class Program
                 }
 
                 logger.LogInformation("Starting action processing...");
-                var processedActions = actionProcessor.ProcessActions(request.AgentActions);
+                var timing = new ServerTiming();
+                var processedActions = timing.Measure("process", () => actionProcessor.ProcessActions(request.AgentActions));
                 
                 logger.LogInformation("Action processing completed. Processed {AgentCount} agents", processedActions.Count);
                 foreach (var kvp in processedActions)
@@ -163,7 +277,17 @@ public class Program
                 }
 
                 logger.LogInformation("Sending actions to communication handler...");
-                var result = await communicationHandler.SendActionsAsync(processedActions);
+                // Retries carry the same Idempotency-Key and get the first send's result back
+                var idempotencyKey = httpRequest.Headers["Idempotency-Key"].ToString();
+                var (result, replayed) = string.IsNullOrEmpty(idempotencyKey)
+                    ? (await timing.MeasureAsync("rcon", () => communicationHandler.SendActionsAsync(processedActions)), false)
+                    : await timing.MeasureAsync("rcon", () => idempotencyCache.GetOrAddAsync(idempotencyKey, progress => communicationHandler.SendActionsAsync(processedActions, progress)));
+                timing.Apply(httpResponse);
+                if (replayed)
+                {
+                    logger.LogInformation("Idempotency-Key {Key} already processed; returning the original result", idempotencyKey);
+                    httpResponse.Headers.Append("Idempotent-Replayed", "true");
+                }
                 logger.LogInformation("Actions sent successfully. Result: {Result}", result);
                 
                 var response = new ActionsResponse 
@@ -183,6 +307,16 @@ public class Program
                 logger.LogError(ex, "JSON deserialization error in actions endpoint");
                 return Results.BadRequest(new { error = "Invalid JSON format", details = ex.Message, type = "JsonException" });
             }
+            catch (IdempotencyConflictException ex)
+            {
+                logger.LogWarning(ex, "Idempotency-Key reused after a partially applied send");
+                return Results.Problem(title: "Idempotency-Key conflict", detail: ex.Message, statusCode: StatusCodes.Status409Conflict);
+            }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                logger.LogWarning(ex, "RCON unavailable in actions endpoint");
+                return RconFailures.ServiceUnavailable(ex);
+            }
             catch (Exception ex)
             {
                 logger.LogError(ex, "Unexpected error in actions endpoint");
@@ -191,16 +325,20 @@ public class Program
         })
         .WithName("ProcessActions")
         .WithSummary("Process game actions")
-        .WithDescription("Processes a list of actions for multiple agents. Each agent can have multiple actions that will be executed in sequence.")
+        .WithDescription("Processes a list of actions for multiple agents. Each agent can have multiple actions that will be executed in sequence. Send an `Idempotency-Key` header to make retries safe: a repeated key returns the original result without queuing the actions again. If the first send failed after some actions may have reached the game, a repeated key gets 409 instead of queuing them twice.")
         .Produces<ActionsResponse>(200)
-        .ProducesProblem(400);
+        .ProducesProblem(400)
+        .ProducesProblem(409)
+        .ProducesProblem(503);
 
         // Reset endpoint - moved out of data group
-        app.MapPost("/reset/{agentCount:int}", async (int agentCount, ICommunicationHandler communicationHandler) =>
+        app.MapPost("/reset/{agentCount:int}", async (int agentCount, HttpResponse httpResponse, ICommunicationHandler communicationHandler) =>
         {
             try
             {
-                var result = await communicationHandler.ResetAsync(agentCount);
+                var timing = new ServerTiming();
+                var result = await timing.MeasureAsync("rcon", () => communicationHandler.ResetAsync(agentCount));
+                timing.Apply(httpResponse);
                 var response = new ActionsResponse 
                 { 
                     Message = "Reset completed successfully", 
@@ -208,6 +346,10 @@ public class Program
                 };
                 return Results.Ok(response);
             }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
             catch (Exception ex)
             {
                 return Results.BadRequest($"Error resetting game: {ex.Message}");
@@ -217,17 +359,147 @@ public class Program
         .WithSummary("Reset game state with specified agent count")
         .WithDescription("Resets the game state and creates the specified number of agents.")
         .Produces<ActionsResponse>(200)
-        .ProducesProblem(400);
+        .ProducesProblem(400)
+        .ProducesProblem(503);
+
+        // Checkpoints: save the game after a prefix of steps once, then restore instead of replaying it
+        var checkpointsApi = app.MapGroup("/checkpoints");
+
+        checkpointsApi.MapGet("/", async (HttpResponse httpResponse, ICommunicationHandler communicationHandler) =>
+        {
+            try
+            {
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.ListCheckpointsAsync());
+                var checkpoints = timing.Measure("deserialize", () => JsonSerializer.Deserialize(jsonData, AppJsonSerializerContext.Default.ListCheckpoint));
+                timing.Apply(httpResponse);
+
+                return Results.Ok(checkpoints);
+            }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error listing checkpoints: {ex.Message}");
+            }
+        })
+        .WithName("ListCheckpoints")
+        .WithSummary("List saved checkpoints")
+        .WithDescription("Lists the checkpoints saved in this game, with the tick and agent count at which each was saved.")
+        .Produces<List<Checkpoint>>(200)
+        .ProducesProblem(400)
+        .ProducesProblem(503);
+
+        checkpointsApi.MapPost("/{name}", async (string name, HttpResponse httpResponse, ICommunicationHandler communicationHandler) =>
+        {
+            if (!Checkpoint.IsValidName(name))
+            {
+                return Results.BadRequest($"Invalid checkpoint name: {name}");
+            }
+
+            try
+            {
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.SaveCheckpointAsync(name));
+                var checkpoint = timing.Measure("deserialize", () => JsonSerializer.Deserialize(jsonData, AppJsonSerializerContext.Default.Checkpoint));
+                timing.Apply(httpResponse);
+
+                return checkpoint?.Error is null ? Results.Ok(checkpoint) : Results.BadRequest(checkpoint.Error);
+            }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error saving checkpoint: {ex.Message}");
+            }
+        })
+        .WithName("SaveCheckpoint")
+        .WithSummary("Save a checkpoint")
+        .WithDescription("Saves the map, every agent (position, inventories and action queue) and the research state under `name`, replacing an existing checkpoint with the same name. Save while the agents are idle: crafting queues are not captured.")
+        .Produces<Checkpoint>(200)
+        .ProducesProblem(400)
+        .ProducesProblem(503);
+
+        checkpointsApi.MapPost("/{name}/restore", async (string name, HttpResponse httpResponse, ICommunicationHandler communicationHandler) =>
+        {
+            if (!Checkpoint.IsValidName(name))
+            {
+                return Results.BadRequest($"Invalid checkpoint name: {name}");
+            }
+
+            try
+            {
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.RestoreCheckpointAsync(name));
+                var checkpoint = timing.Measure("deserialize", () => JsonSerializer.Deserialize(jsonData, AppJsonSerializerContext.Default.Checkpoint));
+                timing.Apply(httpResponse);
+
+                return checkpoint?.Error is null ? Results.Ok(checkpoint) : Results.NotFound(checkpoint.Error);
+            }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error restoring checkpoint: {ex.Message}");
+            }
+        })
+        .WithName("RestoreCheckpoint")
+        .WithSummary("Restore a checkpoint")
+        .WithDescription("Replaces the map, agents and research with a saved checkpoint and pauses the game, like a reset. Queue and execute the remaining actions afterwards.")
+        .Produces<Checkpoint>(200)
+        .ProducesProblem(400)
+        .ProducesProblem(404)
+        .ProducesProblem(503);
+
+        checkpointsApi.MapDelete("/{name}", async (string name, ICommunicationHandler communicationHandler) =>
+        {
+            if (!Checkpoint.IsValidName(name))
+            {
+                return Results.BadRequest($"Invalid checkpoint name: {name}");
+            }
+
+            try
+            {
+                var jsonData = await communicationHandler.DeleteCheckpointAsync(name);
+                using var document = JsonDocument.Parse(jsonData);
+                var deleted = document.RootElement.GetProperty("deleted").GetBoolean();
+
+                return deleted ? Results.NoContent() : Results.NotFound($"Checkpoint {name} does not exist.");
+            }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error deleting checkpoint: {ex.Message}");
+            }
+        })
+        .WithName("DeleteCheckpoint")
+        .WithSummary("Delete a checkpoint")
+        .WithDescription("Deletes a saved checkpoint and frees its copy of the map.")
+        .Produces(204)
+        .ProducesProblem(400)
+        .ProducesProblem(404)
+        .ProducesProblem(503);
 
         // Execute actions endpoint
-        app.MapPost("/actions/execute", async (ICommunicationHandler communicationHandler, ILogger<Program> logger) =>
+        app.MapPost("/actions/execute", async (bool? untilIdle, HttpResponse httpResponse, ICommunicationHandler communicationHandler, ILogger<Program> logger) =>
         {
             try
             {
                 logger.LogInformation("=== Execute actions request received ===");
                 
                 logger.LogInformation("Executing actions via communication handler...");
-                var result = await communicationHandler.ExecuteActionsAsync();
+                var timing = new ServerTiming();
+                var result = await timing.MeasureAsync("rcon", () => communicationHandler.ExecuteActionsAsync(untilIdle ?? false));
+                timing.Apply(httpResponse);
                 logger.LogInformation("Actions executed successfully. Result: {Result}", result);
                 
                 var response = new ActionsResponse 
@@ -237,6 +509,11 @@ public class Program
                 };
                 return Results.Ok(response);
             }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                logger.LogWarning(ex, "RCON unavailable in execute actions endpoint");
+                return RconFailures.ServiceUnavailable(ex);
+            }
             catch (Exception ex)
             {
                 logger.LogError(ex, "Unexpected error in execute actions endpoint");
@@ -245,21 +522,130 @@ public class Program
         })
         .WithName("ExecuteActions")
         .WithSummary("Execute queued actions")
-        .WithDescription("Executes all actions that have been queued for all agents in the game.")
+        .WithDescription("Executes all actions that have been queued for all agents in the game. With `untilIdle=true` the game runs as fast as the server allows and pauses itself, back at its previous speed, once every agent is done.")
         .Produces<ActionsResponse>(200)
+        .ProducesProblem(400)
+        .ProducesProblem(503);
+
+        app.MapPut("/game/speed", async (GameSpeed request, HttpResponse httpResponse, ICommunicationHandler communicationHandler) =>
+        {
+            if (!GameSpeed.IsValid(request.Speed))
+            {
+                return Results.BadRequest($"speed must be between {GameSpeed.MinSpeed} and {GameSpeed.MaxSpeed}");
+            }
+
+            try
+            {
+                var timing = new ServerTiming();
+                var jsonData = await timing.MeasureAsync("rcon", () => communicationHandler.SetGameSpeedAsync(request.Speed));
+                var speed = timing.Measure("deserialize", () => JsonSerializer.Deserialize(jsonData, AppJsonSerializerContext.Default.GameSpeed));
+                timing.Apply(httpResponse);
+
+                return speed?.Error is null ? Results.Ok(speed) : Results.BadRequest(speed.Error);
+            }
+            catch (Exception ex) when (RconFailures.IsTransient(ex))
+            {
+                return RconFailures.ServiceUnavailable(ex);
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error setting game speed: {ex.Message}");
+            }
+        })
+        .WithName("SetGameSpeed")
+        .WithSummary("Set the game speed")
+        .WithDescription("Sets how fast the game runs relative to 60 ticks per second, from 0.01 to 1000. During an `untilIdle` execute the new speed applies once that run ends.")
+        .Produces<GameSpeed>(200)
+        .ProducesProblem(400)
+        .ProducesProblem(503);
+
+        // Action queue progress endpoints
+        app.MapGet("/actions/status", async (IActionsStatusWatcher statusWatcher, CancellationToken cancellationToken) =>
+        {
+            try
+            {
+                return Results.Ok(await statusWatcher.GetStatusAsync(cancellationToken));
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error getting actions status: {ex.Message}");
+            }
+        })
+        .WithName("GetActionsStatus")
+        .WithSummary("Get action queue progress")
+        .WithDescription("Returns how many queued actions each agent has completed and whether every queue has drained.")
+        .Produces<ActionsStatus>(200)
+        .ProducesProblem(400);
+
+        app.MapGet("/actions/wait", async (int? timeoutSeconds, IActionsStatusWatcher statusWatcher, CancellationToken cancellationToken) =>
+        {
+            try
+            {
+                var timeout = TimeSpan.FromSeconds(Math.Clamp(timeoutSeconds ?? 30, 1, 300));
+                return Results.Ok(await statusWatcher.WaitForCompletionAsync(timeout, cancellationToken));
+            }
+            catch (Exception ex)
+            {
+                return Results.BadRequest($"Error waiting for actions: {ex.Message}");
+            }
+        })
+        .WithName("WaitForActions")
+        .WithSummary("Long-poll until all action queues drain")
+        .WithDescription("Blocks until every agent has finished its queued actions or `timeoutSeconds` (default 30, max 300) elapses, then returns the latest status. Check `done` to tell the two apart.")
+        .Produces<ActionsStatus>(200)
         .ProducesProblem(400);
 
+        app.MapGet("/actions/events", async (HttpContext context, IActionsStatusWatcher statusWatcher) =>
+        {
+            var cancellationToken = context.RequestAborted;
+            context.Response.Headers.ContentType = "text/event-stream";
+            context.Response.Headers.CacheControl = "no-cache";
+
+            try
+            {
+                await foreach (var status in statusWatcher.WatchAsync(cancellationToken))
+                {
+                    if (status == null)
+                    {
+                        // SSE comment line, ignored by clients but proves the stream is alive
+                        await context.Response.WriteAsync(": keep-alive\n\n", cancellationToken);
+                        await context.Response.Body.FlushAsync(cancellationToken);
+                        continue;
+                    }
+
+                    var eventName = status.Done ? "done" : "status";
+                    var data = JsonSerializer.Serialize(status, AppJsonSerializerContext.Default.ActionsStatus);
+                    await context.Response.WriteAsync($"event: {eventName}\ndata: {data}\n\n", cancellationToken);
+                    await context.Response.Body.FlushAsync(cancellationToken);
+                }
+            }
+            catch (OperationCanceledException)
+            {
+                // Client disconnected
+            }
+        })
+        .WithName("StreamActionsStatus")
+        .WithSummary("Stream action queue progress as server-sent events")
+        .WithDescription("Sends a `status` event whenever an agent's progress changes and a final `done` event once every queue has drained. While nothing changes a `: keep-alive` comment is sent every `Rcon:StatusKeepAliveMs` (default 5 s), so clients can use a read timeout.")
+        .Produces(200, contentType: "text/event-stream");
+
         app.Run();
     }
 }
 
 [JsonSerializable(typeof(MetaData))]
 [JsonSerializable(typeof(StateData))]
+[JsonSerializable(typeof(StateDelta))]
 [JsonSerializable(typeof(MapData))]
 [JsonSerializable(typeof(ActionsRequest))]
 [JsonSerializable(typeof(ActionsResponse))]
 [JsonSerializable(typeof(AgentActions))]
 [JsonSerializable(typeof(AgentAction))]
+[JsonSerializable(typeof(ActionsStatus))]
+[JsonSerializable(typeof(HealthStatus))]
+[JsonSerializable(typeof(GameSpeed))]
+[JsonSerializable(typeof(Checkpoint))]
+[JsonSerializable(typeof(List<Checkpoint>))]
 [JsonSerializable(typeof(Microsoft.AspNetCore.Mvc.ProblemDetails))]
 internal partial class AppJsonSerializerContext : JsonSerializerContext
 {
@@ -0,0 +1,12 @@
+namespace API.Services;
+
+// How far one /actions send got. A command counts as started once it is handed to RCON;
+// it may have been applied by the game even if no reply came back.
+public class ActionsSendProgress
+{
+    public int Total { get; set; }
+
+    public int Started { get; set; }
+
+    public int Completed { get; set; }
+}
@@ -0,0 +1,83 @@
+using System.Diagnostics;
+using System.Runtime.CompilerServices;
+
+namespace API.Services;
+
+// Factorio cannot push over RCON, so completion is detected by polling the mod's
+// actions_status locally at a short interval and handing clients only the result.
+public class ActionsStatusWatcher : IActionsStatusWatcher
+{
+    private readonly ICommunicationHandler _communicationHandler;
+    private readonly TimeSpan _pollInterval;
+    private readonly TimeSpan _keepAliveInterval;
+
+    public ActionsStatusWatcher(ICommunicationHandler communicationHandler, IConfiguration configuration)
+    {
+        _communicationHandler = communicationHandler;
+        _pollInterval = TimeSpan.FromMilliseconds(configuration.GetValue<int>("Rcon:StatusPollIntervalMs", 50));
+        _keepAliveInterval = TimeSpan.FromMilliseconds(configuration.GetValue<int>("Rcon:StatusKeepAliveMs", 5000));
+    }
+
+    public async Task<ActionsStatus> GetStatusAsync(CancellationToken cancellationToken = default)
+    {
+        cancellationToken.ThrowIfCancellationRequested();
+
+        var jsonData = await _communicationHandler.GetActionsStatusAsync();
+        return JsonSerializer.Deserialize(jsonData, AppJsonSerializerContext.Default.ActionsStatus)
+            ?? throw new JsonException("Empty actions status");
+    }
+
+    public async Task<ActionsStatus> WaitForCompletionAsync(TimeSpan timeout, CancellationToken cancellationToken = default)
+    {
+        using var timeoutSource = CancellationTokenSource.CreateLinkedTokenSource(cancellationToken);
+        timeoutSource.CancelAfter(timeout);
+
+        var status = await GetStatusAsync(cancellationToken);
+        while (!status.Done && !timeoutSource.IsCancellationRequested)
+        {
+            try
+            {
+                await Task.Delay(_pollInterval, timeoutSource.Token);
+            }
+            catch (OperationCanceledException) when (!cancellationToken.IsCancellationRequested)
+            {
+                break; // timed out, report the latest status
+            }
+
+            status = await GetStatusAsync(cancellationToken);
+        }
+
+        return status;
+    }
+
+    public async IAsyncEnumerable<ActionsStatus?> WatchAsync([EnumeratorCancellation] CancellationToken cancellationToken = default)
+    {
+        string? previous = null;
+        var sinceLastYield = Stopwatch.StartNew();
+
+        while (true)
+        {
+            var status = await GetStatusAsync(cancellationToken);
+
+            // Only changes are reported; the tick alone advancing is not a change.
+            var fingerprint = $"{status.Paused}|{status.Done}|" +
+                string.Join(",", status.Agents.Select(agent => $"{agent.AgentId}:{agent.Completed}/{agent.Total}:{agent.Done}"));
+            if (fingerprint != previous)
+            {
+                previous = fingerprint;
+                sinceLastYield.Restart();
+                yield return status;
+            }
+            else if (sinceLastYield.Elapsed >= _keepAliveInterval)
+            {
+                // Nothing changed for a while: null lets the caller show the client it is still alive.
+                sinceLastYield.Restart();
+                yield return null;
+            }
+
+            if (status.Done) yield break;
+
+            await Task.Delay(_pollInterval, cancellationToken);
+        }
+    }
+}
@@ -1,4 +1,5 @@
 using CoreRCON;
+using System.Globalization;
 using System.Text;
 using System.Net;
 
@@ -8,6 +9,7 @@ public class CommunicationHandler : ICommunicationHandler, IDisposable
 {
     private readonly RCON _client;
     private readonly SemaphoreSlim _connectionSemaphore = new(1, 1);
+    private readonly int _maxCommandLength;
     private bool _isConnected = false;
 
     public CommunicationHandler(IConfiguration configuration)
@@ -15,12 +17,13 @@ public class CommunicationHandler : ICommunicationHandler, IDisposable
         var host = configuration.GetValue<string>("Rcon:Host") ?? "127.0.0.1";
         var port = configuration.GetValue<ushort>("Rcon:Port", 27015);
         var password = configuration.GetValue<string>("Rcon:Password") ?? "factorio";
+        _maxCommandLength = configuration.GetValue<int>("Rcon:MaxCommandLength", 65536);
         
         var endpoint = new IPEndPoint(IPAddress.Parse(host), port);
         _client = new RCON(endpoint, password);
     }
 
-    public async Task<string> SendActionsAsync(Dictionary<int, List<string>> agentActions)
+    public async Task<string> SendActionsAsync(Dictionary<int, List<string>> agentActions, ActionsSendProgress? progress = null)
     {
         await EnsureConnectedAsync();
         
@@ -29,27 +32,46 @@ public class CommunicationHandler : ICommunicationHandler, IDisposable
             return "No actions to send for any agent.";
         }
 
+        // Long action lists are split over several add_actions calls so no single RCON
+        // command exceeds the configured length; the mod appends them in order.
+        var agentCommands = agentActions
+            .Where(pair => pair.Value.Any())
+            .Select(pair => (AgentId: pair.Key, Commands: BuildActionsCommands(pair.Key, pair.Value, _maxCommandLength).ToList()))
+            .ToList();
+        progress ??= new ActionsSendProgress();
+        progress.Total = agentCommands.Sum(agent => agent.Commands.Count);
+
         var results = new List<string>();
 
-        foreach (var (agentId, actions) in agentActions)
+        foreach (var (agentId, commands) in agentCommands)
         {
-            if (!actions.Any())
-                continue;
-
-            var command = BuildActionsCommand(agentId, actions);
-            var result = await _client.SendCommandAsync(command);
-            results.Add($"Agent {agentId}: {result}");
+            var agentResults = new List<string>();
+            foreach (var command in commands)
+            {
+                progress.Started++;
+                agentResults.Add(await SendCommandAsync(command));
+                progress.Completed++;
+            }
+            results.Add($"Agent {agentId}: {string.Join(" ", agentResults.Distinct())}");
         }
 
         return string.Join("\n", results);
     }
 
-    public async Task<string> GetDataAsync(int agentId, DataType dataType, int radiusToSearch)
+    public async Task<string> GetDataAsync(int agentId, DataType dataType, DataQuery query)
     {
         await EnsureConnectedAsync();
         
-        var command = $"/sc remote.call(\"FLE\", \"{dataType.ToFactorioString()}\", {agentId}, {radiusToSearch})";
-        return await _client.SendCommandAsync(command);
+        var command = $"/sc remote.call(\"FLE\", \"{dataType.ToFactorioString()}\", {agentId}, {query.Radius}, {query.ToLuaTable()})";
+        return await SendCommandAsync(command);
+    }
+
+    public async Task<string> GetStateDeltaAsync(int agentId, DataQuery query, int sinceVersion)
+    {
+        await EnsureConnectedAsync();
+        
+        var command = $"/sc remote.call(\"FLE\", \"state_data_delta\", {agentId}, {query.Radius}, {sinceVersion}, {query.ToLuaTable()})";
+        return await SendCommandAsync(command);
     }
 
     public async Task<string> ResetAsync(int agentCount)
@@ -57,32 +79,122 @@ public class CommunicationHandler : ICommunicationHandler, IDisposable
         await EnsureConnectedAsync();
         
         var command = $"/sc remote.call(\"FLE\", \"reset\", {agentCount})";
-        return await _client.SendCommandAsync(command);
+        return await SendCommandAsync(command);
+    }
+
+    public async Task<string> ExecuteActionsAsync(bool untilIdle = false)
+    {
+        await EnsureConnectedAsync();
+        
+        var command = untilIdle
+            ? "/sc remote.call(\"FLE\", \"execute_actions\", true)"
+            : "/sc remote.call(\"FLE\", \"execute_actions\")";
+        return await SendCommandAsync(command);
+    }
+
+    public async Task<string> SetGameSpeedAsync(double speed)
+    {
+        if (!GameSpeed.IsValid(speed))
+        {
+            throw new ArgumentOutOfRangeException(nameof(speed), speed, $"Game speed must be between {GameSpeed.MinSpeed} and {GameSpeed.MaxSpeed}");
+        }
+
+        await EnsureConnectedAsync();
+        
+        var command = $"/sc remote.call(\"FLE\", \"set_game_speed\", {speed.ToString("R", CultureInfo.InvariantCulture)})";
+        return await SendCommandAsync(command);
+    }
+
+    public async Task<string> GetActionsStatusAsync()
+    {
+        await EnsureConnectedAsync();
+        
+        var command = "/sc remote.call(\"FLE\", \"actions_status\")";
+        return await SendCommandAsync(command);
+    }
+
+    public Task<string> SaveCheckpointAsync(string name) => SendCheckpointCommandAsync("save_checkpoint", name);
+
+    public Task<string> RestoreCheckpointAsync(string name) => SendCheckpointCommandAsync("restore_checkpoint", name);
+
+    public Task<string> DeleteCheckpointAsync(string name) => SendCheckpointCommandAsync("delete_checkpoint", name);
+
+    public async Task<string> ListCheckpointsAsync()
+    {
+        await EnsureConnectedAsync();
+        
+        var command = "/sc remote.call(\"FLE\", \"list_checkpoints\")";
+        return await SendCommandAsync(command);
     }
 
-    public async Task<string> ExecuteActionsAsync()
+    private async Task<string> SendCheckpointCommandAsync(string function, string name)
     {
+        if (!Checkpoint.IsValidName(name))
+        {
+            throw new ArgumentException($"Invalid checkpoint name: {name}", nameof(name));
+        }
+
         await EnsureConnectedAsync();
         
-        var command = "/sc remote.call(\"FLE\", \"execute_actions\")";
-        return await _client.SendCommandAsync(command);
+        var command = $"/sc remote.call(\"FLE\", \"{function}\", \"{name}\")";
+        return await SendCommandAsync(command);
     }
 
-    private static string BuildActionsCommand(int agentId, List<string> actions)
+    public async Task<long> PingAsync()
     {
-        var command = new StringBuilder($"/sc remote.call(\"FLE\", \"add_actions\", {agentId}, {{");
+        await EnsureConnectedAsync();
         
-        for (int i = 0; i < actions.Count; i++)
+        // Round-trips through the game itself, so a reply means Factorio is running scripts
+        var reply = await SendCommandAsync("/sc rcon.print(game.tick)");
+        return long.TryParse(reply.Trim(), out var tick)
+            ? tick
+            : throw new InvalidOperationException($"Unexpected ping reply: {reply}");
+    }
+
+    private static IEnumerable<string> BuildActionsCommands(int agentId, List<string> actions, int maxCommandLength)
+    {
+        var prefix = $"/sc remote.call(\"FLE\", \"add_actions\", {agentId}, {{";
+        const string suffix = "})";
+
+        var command = new StringBuilder(prefix);
+        var actionsInCommand = 0;
+
+        foreach (var action in actions)
         {
-            command.Append(actions[i]);
-            if (i < actions.Count - 1)
+            // A single oversized action is still sent on its own rather than dropped.
+            if (actionsInCommand > 0 && command.Length + 2 + action.Length + suffix.Length > maxCommandLength)
+            {
+                command.Append(suffix);
+                yield return command.ToString();
+
+                command.Clear().Append(prefix);
+                actionsInCommand = 0;
+            }
+
+            if (actionsInCommand > 0)
             {
                 command.Append(", ");
             }
+            command.Append(action);
+            actionsInCommand++;
+        }
+
+        command.Append(suffix);
+        yield return command.ToString();
+    }
+
+    private async Task<string> SendCommandAsync(string command)
+    {
+        try
+        {
+            return await _client.SendCommandAsync(command);
+        }
+        catch (Exception ex) when (RconFailures.IsTransient(ex))
+        {
+            // Reconnect on the next command instead of failing every later call too.
+            _isConnected = false;
+            throw;
         }
-        
-        command.Append("})");
-        return command.ToString();
     }
 
     private async Task EnsureConnectedAsync()
@@ -0,0 +1,84 @@
+using System.Collections.Concurrent;
+
+namespace API.Services;
+
+// Remembers the result of recent /actions requests by their Idempotency-Key, so a client
+// retrying a send whose response was lost gets the original result instead of queuing
+// the actions a second time. Concurrent requests with the same key share one execution.
+// A failed execution is forgotten only if none of its RCON commands was started; once one
+// may have reached the game, later requests with the key fail with IdempotencyConflictException.
+public class IdempotencyCache : IIdempotencyCache
+{
+    private readonly ConcurrentDictionary<string, Entry> _entries = new();
+    private readonly TimeSpan _timeToLive;
+    private readonly int _maxKeys;
+
+    private sealed record Entry(Lazy<Task<string>> Result, ActionsSendProgress Progress, DateTime CreatedAt);
+
+    public IdempotencyCache(IConfiguration configuration)
+    {
+        _timeToLive = TimeSpan.FromSeconds(configuration.GetValue<int>("Idempotency:TtlSeconds", 600));
+        _maxKeys = configuration.GetValue<int>("Idempotency:MaxKeys", 10000);
+    }
+
+    public async Task<(string Result, bool Replayed)> GetOrAddAsync(string key, Func<ActionsSendProgress, Task<string>> action)
+    {
+        var progress = new ActionsSendProgress();
+        var created = new Entry(new Lazy<Task<string>>(() => action(progress)), progress, DateTime.UtcNow);
+        var entry = _entries.GetOrAdd(key, created);
+        if (entry != created && DateTime.UtcNow - entry.CreatedAt > _timeToLive)
+        {
+            _entries.TryUpdate(key, created, entry);
+            entry = _entries.GetOrAdd(key, created);
+        }
+
+        if (entry == created && _entries.Count > _maxKeys)
+        {
+            Prune();
+        }
+
+        try
+        {
+            return (await entry.Result.Value, entry != created);
+        }
+        catch (Exception ex) when (entry == created)
+        {
+            if (progress.Started == 0)
+            {
+                // Nothing reached the game (e.g. the RCON connect failed), so a retry may send everything.
+                _entries.TryRemove(new KeyValuePair<string, Entry>(key, entry));
+            }
+            else
+            {
+                var conflict = new IdempotencyConflictException(
+                    $"An earlier request with Idempotency-Key {key} failed after {progress.Completed} of {progress.Total} RCON command(s) " +
+                    $"were applied and {progress.Started - progress.Completed} had an unknown outcome: {ex.Message}. " +
+                    "Check /actions/status or reset before resending with a new key.");
+                _entries.TryUpdate(key, created with { Result = new Lazy<Task<string>>(() => Task.FromException<string>(conflict)) }, created);
+            }
+            throw;
+        }
+    }
+
+    private void Prune()
+    {
+        var cutoff = DateTime.UtcNow - _timeToLive;
+        foreach (var (key, entry) in _entries)
+        {
+            if (entry.CreatedAt < cutoff)
+            {
+                _entries.TryRemove(new KeyValuePair<string, Entry>(key, entry));
+            }
+        }
+
+        // Still full of fresh keys: drop the oldest so memory stays bounded.
+        var excess = _entries.Count - _maxKeys;
+        if (excess > 0)
+        {
+            foreach (var (key, entry) in _entries.OrderBy(pair => pair.Value.CreatedAt).Take(excess).ToList())
+            {
+                _entries.TryRemove(new KeyValuePair<string, Entry>(key, entry));
+            }
+        }
+    }
+}
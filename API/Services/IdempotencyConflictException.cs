@@ -0,0 +1,5 @@
+namespace API.Services;
+
+// An earlier /actions request with the same Idempotency-Key failed part-way, so some of its
+// actions may already be queued in the game and replaying it could queue them twice.
+public class IdempotencyConflictException(string message) : Exception(message);
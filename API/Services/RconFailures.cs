@@ -0,0 +1,18 @@
+using System.Net.Sockets;
+
+namespace API.Services;
+
+// Failures of the RCON link itself (as opposed to errors from the FLE mod) are reported
+// as 503 so clients know the call is safe to retry once the game is reachable again.
+public static class RconFailures
+{
+    public static bool IsTransient(Exception ex) => ex switch
+    {
+        SocketException or IOException or TimeoutException or ObjectDisposedException => true,
+        { InnerException: { } inner } => IsTransient(inner),
+        _ => false
+    };
+
+    public static IResult ServiceUnavailable(Exception ex) =>
+        Results.Problem(title: "Game unavailable", detail: ex.Message, statusCode: StatusCodes.Status503ServiceUnavailable);
+}
@@ -0,0 +1,52 @@
+using System.Diagnostics;
+using System.Globalization;
+
+namespace API.Services;
+
+// Collects per-phase durations for one request and reports them in a Server-Timing
+// header (e.g. "rcon;dur=12.3, deserialize;dur=0.8"), so clients can tell the time spent
+// in RCON and the FLE mod apart from serialization and HTTP overhead.
+public class ServerTiming
+{
+    private readonly List<string> _metrics = [];
+
+    public async Task<T> MeasureAsync<T>(string name, Func<Task<T>> phase)
+    {
+        var start = Stopwatch.GetTimestamp();
+        try
+        {
+            return await phase();
+        }
+        finally
+        {
+            Add(name, start);
+        }
+    }
+
+    public T Measure<T>(string name, Func<T> phase)
+    {
+        var start = Stopwatch.GetTimestamp();
+        try
+        {
+            return phase();
+        }
+        finally
+        {
+            Add(name, start);
+        }
+    }
+
+    public void Apply(HttpResponse response)
+    {
+        if (_metrics.Count > 0)
+        {
+            response.Headers.Append("Server-Timing", string.Join(", ", _metrics));
+        }
+    }
+
+    private void Add(string name, long start)
+    {
+        var milliseconds = Stopwatch.GetElapsedTime(start).TotalMilliseconds;
+        _metrics.Add($"{name};dur={milliseconds.ToString("0.###", CultureInfo.InvariantCulture)}");
+    }
+}
@@ -0,0 +1,9 @@
+namespace API.Services;
+
+public interface IActionsStatusWatcher
+{
+    Task<ActionsStatus> GetStatusAsync(CancellationToken cancellationToken = default);
+    Task<ActionsStatus> WaitForCompletionAsync(TimeSpan timeout, CancellationToken cancellationToken = default);
+    // Yields each status change, and null whenever nothing changed for Rcon:StatusKeepAliveMs.
+    IAsyncEnumerable<ActionsStatus?> WatchAsync(CancellationToken cancellationToken = default);
+}
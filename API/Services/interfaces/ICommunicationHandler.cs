@@ -2,8 +2,16 @@ namespace API.Services;
 
 public interface ICommunicationHandler
 {
-    Task<string> SendActionsAsync(Dictionary<int, List<string>> agentActions);
-    Task<string> GetDataAsync(int agentId, DataType dataType, int radiusToSearch);
+    Task<string> SendActionsAsync(Dictionary<int, List<string>> agentActions, ActionsSendProgress? progress = null);
+    Task<string> GetDataAsync(int agentId, DataType dataType, DataQuery query);
+    Task<string> GetStateDeltaAsync(int agentId, DataQuery query, int sinceVersion);
     Task<string> ResetAsync(int agentCount);
-    Task<string> ExecuteActionsAsync();
+    Task<string> ExecuteActionsAsync(bool untilIdle = false);
+    Task<string> SetGameSpeedAsync(double speed);
+    Task<string> GetActionsStatusAsync();
+    Task<string> SaveCheckpointAsync(string name);
+    Task<string> RestoreCheckpointAsync(string name);
+    Task<string> ListCheckpointsAsync();
+    Task<string> DeleteCheckpointAsync(string name);
+    Task<long> PingAsync();
 }
\ No newline at end of file
@@ -0,0 +1,6 @@
+namespace API.Services;
+
+public interface IIdempotencyCache
+{
+    Task<(string Result, bool Replayed)> GetOrAddAsync(string key, Func<ActionsSendProgress, Task<string>> action);
+}
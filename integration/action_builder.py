@@ -0,0 +1,356 @@
+import numbers
+from typing import List, Dict, Any, Iterable, Optional, Sequence, Tuple, Union
+from models.position import Position
+from models.defines import InventoryType, Direction
+
+class Action:
+    """One queued action.
+
+    Slotted rather than a dict so long action queues stay small; to_dict() gives the
+    JSON shape expected by the /actions endpoint, leaving out unset fields.
+    """
+
+    __slots__ = (
+        "type", "position", "item_name", "quantity", "inventory_type", "direction",
+        "ticks", "technology_name", "recipe_name", "reverse"
+    )
+
+    def __init__(
+        self,
+        type: str,
+        position: Optional[Position] = None,
+        item_name: Optional[str] = None,
+        quantity: Optional[int] = None,
+        inventory_type: Optional[str] = None,
+        direction: Optional[str] = None,
+        ticks: Optional[int] = None,
+        technology_name: Optional[str] = None,
+        recipe_name: Optional[str] = None,
+        reverse: Optional[bool] = None
+    ):
+        self.type = type
+        self.position = position
+        self.item_name = item_name
+        self.quantity = quantity
+        self.inventory_type = inventory_type
+        self.direction = direction
+        self.ticks = ticks
+        self.technology_name = technology_name
+        self.recipe_name = recipe_name
+        self.reverse = reverse
+
+    def to_dict(self) -> Dict[str, Any]:
+        action = {}
+        for name in self.__slots__:
+            value = getattr(self, name)
+            if value is not None:
+                action[name] = value.to_dict() if isinstance(value, Position) else value
+        return action
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Action):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    # Actions compare by value but their fields can be reassigned, so they are left
+    # unhashable like the dicts they replaced.
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"Action({self.to_dict()!r})"
+
+# An item name and quantity, as taken from or put into an inventory.
+ItemStack = Tuple[str, int]
+
+def action_dict(action) -> Dict[str, Any]:
+    """JSON shape of a queued Action, passing plain action dicts through unchanged."""
+    return action.to_dict() if isinstance(action, Action) else action
+
+class ActionBuilder:
+    """Accumulates agent actions for the /actions endpoint."""
+
+    def __init__(self):
+        self.actions: List[Action] = []
+
+    def _add_action(self, action: Action) -> None:
+        self.actions.append(action)
+
+    def action_dicts(self) -> List[Dict[str, Any]]:
+        """The queued actions in the JSON shape expected by the /actions endpoint."""
+        return [action_dict(action) for action in self.actions]
+
+    def _validate_quantity(self, quantity: int) -> None:
+        if quantity != -1 and quantity <= 0:
+            raise ValueError("quantity must be either -1 or positive")
+
+    def _validate_ticks(self, ticks: int) -> None:
+        if ticks <= 0:
+            raise ValueError("ticks must be positive")
+
+    def _transfer_many(
+        self,
+        action_type: str,
+        position: Position,
+        items: Iterable[ItemStack],
+        inventory_type: InventoryType
+    ) -> int:
+        # Shared arguments are checked once; nothing is queued unless every item is valid.
+        if position is None:
+            raise ValueError("position cannot be None")
+        if inventory_type is None:
+            raise ValueError("inventory_type cannot be None")
+        inventory = inventory_type.value
+
+        actions = []
+        for item_name, quantity in items:
+            if not item_name:
+                raise ValueError("item_name cannot be empty")
+            # Integral also admits numpy integers; int() then only converts, never truncates.
+            if isinstance(quantity, bool) or not isinstance(quantity, numbers.Integral):
+                raise ValueError(f"quantity for {item_name} must be an integer")
+            self._validate_quantity(quantity)
+            actions.append(Action(action_type, position, item_name, int(quantity), inventory))
+
+        self.actions.extend(actions)
+        return len(actions)
+
+    def research(self, technology_name: str) -> None:
+        if not technology_name:
+            raise ValueError("technology_name cannot be empty")
+        action = Action(
+            "research",
+            technology_name=technology_name
+        )
+        self._add_action(action)
+    
+    def cancel_research(self) -> None:
+        action = Action("cancel_research")
+        self._add_action(action)
+
+    def walk(self, position: Position) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        action = Action(
+            "walk",
+            position=position
+        )
+        self._add_action(action)
+    
+    def take(self, position: Position, item_name: str, quantity: int, inventory_type: InventoryType) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        if not item_name:
+            raise ValueError("item_name cannot be empty")
+        self._validate_quantity(quantity)
+        if inventory_type is None:
+            raise ValueError("inventory_type cannot be None")
+        action = Action(
+            "take",
+            position=position,
+            item_name=item_name,
+            quantity=quantity,
+            inventory_type=inventory_type.value
+        )
+        self._add_action(action)
+    
+    def take_many(self, position: Position, items: Iterable[ItemStack], inventory_type: InventoryType) -> int:
+        """Queue a take for every (item_name, quantity) from one inventory; returns how many."""
+        return self._transfer_many("take", position, items, inventory_type)
+
+    def put(self, position: Position, item_name: str, quantity: int, inventory_type: InventoryType) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        if not item_name:
+            raise ValueError("item_name cannot be empty")
+        self._validate_quantity(quantity)
+        if inventory_type is None:
+            raise ValueError("inventory_type cannot be None")
+        action = Action(
+            "put",
+            position=position,
+            item_name=item_name,
+            quantity=quantity,
+            inventory_type=inventory_type.value
+        )
+        self._add_action(action)
+    
+    def put_many(self, position: Position, items: Iterable[ItemStack], inventory_type: InventoryType) -> int:
+        """Queue a put for every (item_name, quantity) into one inventory; returns how many."""
+        return self._transfer_many("put", position, items, inventory_type)
+
+    def craft(self, item_name: str, quantity: int) -> None:
+        if not item_name:
+            raise ValueError("item_name cannot be empty")
+        self._validate_quantity(quantity)
+        action = Action(
+            "craft",
+            item_name=item_name,
+            quantity=quantity
+        )
+        self._add_action(action)
+
+    def cancel_craft(self, item_name: str, quantity: int) -> None:
+        if not item_name:
+            raise ValueError("item_name cannot be empty")
+        self._validate_quantity(quantity)
+        action = Action(
+            "cancel_craft",
+            item_name=item_name,
+            quantity=quantity
+        )
+        self._add_action(action)
+
+    def build(self, position: Position, item_name: str, direction: Direction) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        if not item_name:
+            raise ValueError("item_name cannot be empty")
+        if direction is None:
+            raise ValueError("direction cannot be None")
+        action = Action(
+            "build",
+            position=position,
+            item_name=item_name,
+            direction=direction.value
+        )
+        self._add_action(action)
+    
+    def build_many(
+        self,
+        positions: Iterable[Union[Position, Sequence[float]]],
+        item_name: str,
+        direction: Direction
+    ) -> int:
+        """Queue a build of `item_name` at every position; returns how many.
+
+        Positions may be Position objects or (x, y) pairs, e.g. the rows of an N x 2 numpy
+        array. Nothing is queued unless every position is valid.
+        """
+        if not item_name:
+            raise ValueError("item_name cannot be empty")
+        if direction is None:
+            raise ValueError("direction cannot be None")
+        direction_name = direction.value
+        if hasattr(positions, "tolist"):
+            # numpy arrays: convert every coordinate to a Python float in one call
+            positions = positions.tolist()
+
+        actions = []
+        for position in positions:
+            if position is None:
+                raise ValueError("position cannot be None")
+            if not isinstance(position, Position):
+                x, y = position
+                position = Position(float(x), float(y))
+            actions.append(Action("build", position, item_name, direction=direction_name))
+
+        self.actions.extend(actions)
+        return len(actions)
+
+    def rotate(self, position: Position, reverse: bool = False) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        action = Action(
+            "rotate",
+            position=position,
+            reverse=reverse
+        )
+        self._add_action(action)
+    
+    def mine(self, position: Position, ticks: int) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        self._validate_ticks(ticks)
+        action = Action(
+            "mine",
+            position=position,
+            ticks=ticks
+        )
+        self._add_action(action)
+    
+    def recipe(self, position: Position, recipe_name: str) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        if not recipe_name:
+            raise ValueError("recipe_name cannot be empty")
+        action = Action(
+            "recipe",
+            position=position,
+            recipe_name=recipe_name
+        )
+        self._add_action(action)
+    
+    def wait(self, ticks: int) -> None:
+        self._validate_ticks(ticks)
+        action = Action(
+            "wait",
+            ticks=ticks
+        )
+        self._add_action(action)
+
+    def drop(self, position: Position, item_name: str) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        if not item_name:
+            raise ValueError("item_name cannot be empty")
+        action = Action(
+            "drop",
+            position=position,
+            item_name=item_name
+        )
+        self._add_action(action)
+    
+    def launch_rocket(self, position: Position) -> None:
+        if position is None:
+            raise ValueError("position cannot be None")
+        action = Action(
+            "launch_rocket",
+            position=position
+        )
+        self._add_action(action)
+    
+    def pick_up(self, ticks: int) -> None:
+        self._validate_ticks(ticks)
+        action = Action(
+            "pick_up",
+            ticks=ticks
+        )
+        self._add_action(action)
+    
+class ActionBatch:
+    """Actions for many agents, submitted together in a single /actions request.
+
+    Each agent gets its own ActionBuilder, so the usual builders apply:
+    `batch.agent(2).walk(position)`.
+    """
+
+    def __init__(self, agent_ids: Iterable[int] = ()):
+        self.builders: Dict[int, ActionBuilder] = {}
+        for agent_id in agent_ids:
+            self.agent(agent_id)
+
+    def agent(self, agent_id: int) -> ActionBuilder:
+        if agent_id <= 0:
+            raise ValueError("agent_id must be positive")
+        builder = self.builders.get(agent_id)
+        if builder is None:
+            builder = self.builders[agent_id] = ActionBuilder()
+        return builder
+
+    def action_counts(self) -> Dict[int, int]:
+        return {agent_id: len(builder.actions) for agent_id, builder in self.builders.items() if builder.actions}
+
+    def payload(self) -> Dict[str, Any]:
+        agent_actions = [
+            {"agent_id": agent_id, "actions": builder.action_dicts()}
+            for agent_id, builder in self.builders.items()
+            if builder.actions
+        ]
+        if not agent_actions:
+            raise ValueError("No actions to send")
+
+        return {"agent_actions": agent_actions}
+
+    def clear(self) -> None:
+        for builder in self.builders.values():
+            builder.actions.clear()
@@ -0,0 +1,357 @@
+import asyncio
+import json
+import time
+from typing import Dict, Any, AsyncIterator, Iterable, List, Optional, Tuple, Union
+
+import aiohttp
+
+from action_builder import Action, ActionBatch
+from communication_handler import (
+    BaseCommunicationHandler, BatchResult, DataType, StateStore, ServerSentEvents, PACKED_MEDIA_TYPE,
+    backoff_delays, decode_packed_map
+)
+from instrumentation import Recorder
+from models.bounding_box import BoundingBox
+from models.position import json_default
+from resilience import CircuitBreaker, CommunicationError, RetryPolicy
+
+def create_session(connection_limit: int = 100, limit_per_host: int = 0, timeout: int = 30) -> aiohttp.ClientSession:
+    """Create a bounded, pooled HTTP session that many handlers can share.
+
+    Must be called from within a running event loop.
+    """
+    if connection_limit <= 0:
+        raise ValueError("connection_limit must be positive")
+    if limit_per_host < 0:
+        raise ValueError("limit_per_host cannot be negative")
+
+    connector = aiohttp.TCPConnector(limit=connection_limit, limit_per_host=limit_per_host)
+    return aiohttp.ClientSession(connector=connector, timeout=aiohttp.ClientTimeout(total=timeout))
+
+class AsyncCommunicationHandler(BaseCommunicationHandler):
+    """Awaitable counterpart of CommunicationHandler.
+
+    Action builders (walk, build, take, ...) are identical to the sync handler; only the
+    transport methods are coroutines. Pass a session from create_session() to let many
+    handlers (instances and agents) share one connection pool on a single event loop.
+    """
+
+    def __init__(
+        self,
+        api_base_url: str,
+        agent_id: int,
+        timeout: int = 30,
+        session: Optional[aiohttp.ClientSession] = None,
+        connection_limit: int = 100,
+        recorder: Optional[Recorder] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        super().__init__(api_base_url, agent_id, timeout, recorder, retry_policy, circuit_breaker)
+        if connection_limit <= 0:
+            raise ValueError("connection_limit must be positive")
+
+        self.connection_limit = connection_limit
+        self.session = session
+        self._owns_session = session is None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self) -> None:
+        """Close the session if this handler created it."""
+        if self.session and self._owns_session:
+            await self.session.close()
+            self.session = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        # Sessions bind to the running loop, so an owned session is created on first use.
+        if self.session is None:
+            self.session = create_session(self.connection_limit, timeout=self.timeout)
+            self._owns_session = True
+        return self.session
+
+    def _request_timeout(self) -> aiohttp.ClientTimeout:
+        return aiohttp.ClientTimeout(total=self.timeout)
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        operation: str,
+        error: str,
+        actions: int = 0,
+        body: Optional[bytes] = None,
+        **kwargs
+    ) -> Tuple[bytes, str]:
+        """Send one API request, retrying transient failures; raise CommunicationError
+        prefixed with `error` once the retries run out or the failure is permanent.
+
+        Returns the response body and its content type.
+        """
+        kwargs.setdefault("timeout", self._request_timeout())
+
+        async def attempt() -> Tuple[bytes, str]:
+            with self._measure(operation, actions) as record:
+                try:
+                    async with self._get_session().request(
+                        method, f"{self.api_base_url}{path}", data=body, **kwargs
+                    ) as response:
+                        content = await response.read()
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                    raise CommunicationError(f"{error}: {e}", transient=True) from e
+                except aiohttp.ClientError as e:
+                    raise CommunicationError(f"{error}: {e}") from e
+
+                if record is not None:
+                    record.observe_response(len(body or b""), len(content), response.status, response.headers)
+                if response.status >= 400:
+                    text = content.decode("utf-8", errors="replace")
+                    raise CommunicationError(f"{error}: {response.status} - {text}", response.status)
+                return content, response.content_type
+
+        return await self.retry_policy.call_async(attempt, self.circuit_breaker)
+
+    async def send_actions(self) -> str:
+        """Send all accumulated actions to the API."""
+        body = json.dumps(self._actions_payload(), default=json_default).encode("utf-8")
+
+        content, _ = await self._request(
+            "POST", "/actions", "send_actions", "Error sending actions", len(self.actions),
+            body=body, headers=self._actions_headers()
+        )
+
+        # Clear actions after successful send
+        self.actions.clear()
+
+        return content.decode("utf-8")
+
+    async def send_batch(self, batch: ActionBatch) -> BatchResult:
+        """Send the queued actions of every agent in the batch in a single request."""
+        body = json.dumps(batch.payload(), default=json_default).encode("utf-8")
+
+        content, _ = await self._request(
+            "POST", "/actions", "send_batch", "Error sending actions", sum(batch.action_counts().values()),
+            body=body, headers=self._actions_headers()
+        )
+
+        result = self._batch_result(batch, content.decode("utf-8"))
+        batch.clear()
+
+        return result
+
+    async def send_actions_stream(
+        self,
+        actions: Iterable[Union[Action, Dict[str, Any]]],
+        max_actions: int = 500,
+        max_bytes: int = 64 * 1024
+    ) -> List[str]:
+        """Send actions from an iterable in bounded chunks as they are produced."""
+        responses = []
+        for count, body in self.iter_action_chunks(actions, max_actions, max_bytes):
+            content, _ = await self._request(
+                "POST", "/actions", "send_actions_chunk", "Error sending actions", count,
+                body=body, headers=self._actions_headers()
+            )
+            responses.append(content.decode("utf-8"))
+
+        if not responses:
+            raise ValueError("No actions to send")
+
+        return responses
+
+    async def get_data(
+        self,
+        data_type: DataType,
+        packed: bool = False,
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Get data from the API as parsed JSON, or as packed arrays for map data.
+
+        `radius`, `area` and `fields` narrow the query as in CommunicationHandler.get_data.
+        """
+        content, content_type = await self._request(
+            "GET", self._data_endpoint(data_type), f"get_data.{data_type.name.lower()}",
+            f"Error getting {data_type.value}", headers=self._data_headers(data_type, packed),
+            params=self._data_params(radius, area, fields)
+        )
+        if content_type == PACKED_MEDIA_TYPE:
+            return decode_packed_map(content)
+        return json.loads(content)
+
+    async def get_state_delta(
+        self,
+        since_version: Optional[int] = None,
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Get the agents and buildings that changed since `since_version`."""
+        content, _ = await self._request(
+            "GET", f"/data/state/{self.agent_id}/delta", "get_state_delta", "Error getting state delta",
+            params=self._state_delta_params(since_version, radius, area, fields)
+        )
+        return json.loads(content)
+
+    async def sync_state(
+        self,
+        store: StateStore,
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Bring `store` up to date with one delta poll and return the applied delta."""
+        delta = await self.get_state_delta(store.version, radius, area, fields)
+        store.apply(delta)
+        return delta
+
+    async def is_healthy(self, connect_timeout: float = 0.5) -> bool:
+        """Probe /health once; true when the API is up and its RCON link reaches the game."""
+        try:
+            async with self._get_session().get(
+                f"{self.api_base_url}/health",
+                timeout=aiohttp.ClientTimeout(total=self.timeout, sock_connect=connect_timeout)
+            ) as response:
+                return response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            return False
+
+    async def wait_for_api_ready(
+        self,
+        *,
+        timeout: float = 60.0,
+        initial_delay: float = 0.05,
+        max_delay: float = 0.5,
+        connect_timeout: float = 0.5
+    ) -> bool:
+        """Wait for the API and its RCON link without blocking the event loop."""
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        deadline = time.monotonic() + timeout
+        for delay in backoff_delays(initial_delay, max_delay):
+            if await self.is_healthy(connect_timeout):
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(delay, remaining))
+
+    async def get_actions_status(self) -> Dict[str, Any]:
+        """Progress of every agent's action queue: completed/total per agent and overall done."""
+        content, _ = await self._request("GET", "/actions/status", "get_actions_status", "Error getting actions status")
+        return json.loads(content)
+
+    async def wait_for_completion(self, timeout: float = 300.0, poll_timeout: int = 30) -> Dict[str, Any]:
+        """Wait until every agent's queued actions have finished and return the final status."""
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if poll_timeout <= 0:
+            raise ValueError("poll_timeout must be positive")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            params = self._wait_params(deadline, poll_timeout)
+            content, _ = await self._request(
+                "GET", "/actions/wait", "wait_for_completion", "Error waiting for actions",
+                params=params, timeout=aiohttp.ClientTimeout(total=self.timeout + params["timeoutSeconds"])
+            )
+            status = json.loads(content)
+
+            if status.get("done"):
+                return status
+
+    async def iter_actions_status(self, timeout: float = 300.0) -> AsyncIterator[Dict[str, Any]]:
+        """Yield action queue progress from the /actions/events stream until all queues drain.
+
+        Timeouts behave as in CommunicationHandler.iter_actions_status.
+        """
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        deadline = time.monotonic() + timeout
+        parser = ServerSentEvents()
+        try:
+            async with self._get_session().get(
+                f"{self.api_base_url}/actions/events",
+                timeout=aiohttp.ClientTimeout(
+                    total=None, sock_connect=self.timeout, sock_read=min(self.timeout, timeout)
+                )
+            ) as response:
+                response.raise_for_status()
+                async for line in response.content:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError("Actions did not complete before the timeout")
+                    event = parser.feed(line.decode("utf-8"))
+                    if event is None:
+                        continue
+                    name, data = event
+                    yield json.loads(data)
+                    if name == "done":
+                        return
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # asyncio.TimeoutError also covers the deadline check above and a silent stream
+            if time.monotonic() >= deadline:
+                raise TimeoutError("Actions did not complete before the timeout") from e
+            raise CommunicationError(f"Error streaming actions status: {e}") from e
+
+    async def reset(self, agent_count: int = 1) -> str:
+        """Reset the game state and create the specified number of agents."""
+        if agent_count <= 0:
+            raise ValueError("agent_count must be positive")
+
+        content, _ = await self._request("POST", f"/reset/{agent_count}", "reset", "Error resetting game")
+        return content.decode("utf-8")
+
+    async def execute_actions(self, until_idle: bool = False) -> str:
+        """Execute all queued actions in the game; see CommunicationHandler.execute_actions."""
+        content, _ = await self._request(
+            "POST", "/actions/execute", "execute_actions", "Error executing actions",
+            params=self._execute_params(until_idle)
+        )
+        return content.decode("utf-8")
+
+    async def run_until_idle(self, timeout: float = 300.0) -> Dict[str, Any]:
+        """Execute the queued actions as fast as the server allows and wait until they finish.
+
+        Returns the final status plus the `ticks` it took and the `ticks_per_second` achieved.
+        """
+        start = await self.get_actions_status()
+        started = time.perf_counter()
+        await self.execute_actions(until_idle=True)
+        status = await self.wait_for_completion(timeout)
+        return self._with_throughput(start, status, time.perf_counter() - started)
+
+    async def set_game_speed(self, speed: float) -> float:
+        """Run the game at `speed` times the normal 60 ticks per second; returns the speed set."""
+        content, _ = await self._request(
+            "PUT", "/game/speed", "set_game_speed", "Error setting game speed",
+            body=self._game_speed_body(speed), headers={"Content-Type": "application/json"}
+        )
+        return json.loads(content)["speed"]
+
+    async def save_checkpoint(self, name: str) -> Dict[str, Any]:
+        """Save the map, agents and research under `name`; save while the agents are idle."""
+        path = self._checkpoint_path(name)
+        content, _ = await self._request("POST", path, "save_checkpoint", "Error saving checkpoint")
+        return json.loads(content)
+
+    async def restore_checkpoint(self, name: str) -> Dict[str, Any]:
+        """Restore a saved checkpoint instead of resetting; the game is left paused."""
+        path = self._checkpoint_path(name)
+        content, _ = await self._request("POST", f"{path}/restore", "restore_checkpoint", "Error restoring checkpoint")
+        return json.loads(content)
+
+    async def list_checkpoints(self) -> List[Dict[str, Any]]:
+        content, _ = await self._request("GET", "/checkpoints", "list_checkpoints", "Error listing checkpoints")
+        return json.loads(content)
+
+    async def delete_checkpoint(self, name: str) -> None:
+        path = self._checkpoint_path(name)
+        await self._request("DELETE", path, "delete_checkpoint", "Error deleting checkpoint")
@@ -0,0 +1,79 @@
+"""Micro-benchmark for MapView against linear scans over the get_data(DataType.MAP) dicts.
+
+Usage (from integration/): python benchmarks/bench_map_view.py [--radius 150] [--queries 200]
+"""
+
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from map_view import MapView
+
+def synthetic_map_data(radius: int) -> dict:
+    """A square map of `radius` tiles around the origin with a few winding lakes."""
+    water_tiles, land_tiles = [], []
+    for x in range(-radius, radius):
+        for y in range(-radius, radius):
+            tile = {"position": {"x": x, "y": y}}
+            if math.sin(x / 17.0) + math.cos(y / 23.0) > 1.2:
+                water_tiles.append(tile)
+            else:
+                land_tiles.append(tile)
+    return {"tiles": {"water_tiles": water_tiles, "land_tiles": land_tiles}, "offshore_pump_locations": []}
+
+def scan_nearest_water(map_data: dict, x: float, y: float):
+    return min(
+        map_data["tiles"]["water_tiles"],
+        key=lambda tile: (tile["position"]["x"] + 0.5 - x) ** 2 + (tile["position"]["y"] + 0.5 - y) ** 2
+    )
+
+def scan_footprint_is_land(map_data: dict, x: float, y: float, size: int) -> bool:
+    left, top = math.floor(x - size / 2 + 0.5), math.floor(y - size / 2 + 0.5)
+    wanted = {(left + dx, top + dy) for dx in range(size) for dy in range(size)}
+    found = {
+        (tile["position"]["x"], tile["position"]["y"])
+        for tile in map_data["tiles"]["land_tiles"]
+        if (tile["position"]["x"], tile["position"]["y"]) in wanted
+    }
+    return found == wanted
+
+def timed(run) -> float:
+    start = time.perf_counter()
+    run()
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--radius", type=int, default=150)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    map_data = synthetic_map_data(args.radius)
+    random.seed(1)
+    points = [(random.uniform(-args.radius, args.radius), random.uniform(-args.radius, args.radius))
+              for _ in range(args.queries)]
+    tile_count = len(map_data["tiles"]["water_tiles"]) + len(map_data["tiles"]["land_tiles"])
+
+    map_view = None
+    def build():
+        nonlocal map_view
+        map_view = MapView.from_map_data(map_data)
+
+    print(f"Map: {tile_count:,} tiles, {args.queries} queries")
+    print(f"  {'build MapView':<34} {timed(build) * 1000:9.1f} ms")
+    for name, run in [
+        ("nearest water (dict scan)", lambda: [scan_nearest_water(map_data, x, y) for x, y in points]),
+        ("nearest water (MapView)", lambda: map_view.nearest("water", points)),
+        ("3x3 footprint (dict scan)", lambda: [scan_footprint_is_land(map_data, x, y, 3) for x, y in points]),
+        ("3x3 footprint (MapView)", lambda: map_view.footprints_are_land(points, 3, 3)),
+    ]:
+        seconds = timed(run)
+        print(f"  {name:<34} {seconds * 1000:9.1f} ms  {args.queries / seconds:14,.0f} queries/s")
+
+if __name__ == "__main__":
+    main()
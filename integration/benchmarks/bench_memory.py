@@ -0,0 +1,63 @@
+"""Memory used by compiled steps and queued actions for a large step file.
+
+Usage (from integration/): python benchmarks/bench_memory.py [--lines 100000]
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import sys
+import tempfile
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from action_builder import ActionBuilder
+from step_parser import StepParser
+from bench_step_parser import write_scaled_steps
+
+def traced(run):
+    """Run `run` and return (its result, bytes it left allocated, peak bytes while running)."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = run()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, current, peak
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="fle-bench-")
+    try:
+        path = os.path.join(work_dir, "steps_scaled.lua")
+        lines = write_scaled_steps(path, args.lines)
+        step_parser = StepParser(path, None, use_cache=False)
+
+        steps, steps_bytes, steps_peak = traced(step_parser.compile)
+
+        def queue_actions():
+            builder = ActionBuilder()
+            StepParser(path, builder, use_cache=False).replay(steps)
+            return builder
+
+        builder, actions_bytes, actions_peak = traced(queue_actions)
+        action_count = len(builder.actions)
+
+        print(f"Step file: {lines:,} step lines, {action_count:,} queued actions")
+        for name, retained, peak, count in [
+            ("compiled steps", steps_bytes, steps_peak, len(steps)),
+            ("queued actions", actions_bytes, actions_peak, action_count),
+        ]:
+            print(f"  {name:<16} {retained / 1e6:8.1f} MB retained  {peak / 1e6:8.1f} MB peak  "
+                  f"{retained / max(count, 1):7.0f} B/item")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Micro-benchmark for StepParser on steps_lab.lua scaled up to a large step file.
+
+Usage (from integration/): python benchmarks/bench_step_parser.py [--lines 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import step_parser as step_parser_module
+from communication_handler import CommunicationHandler
+from step_parser import StepParser
+
+STEPS_LAB = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "steps_lab.lua")
+
+def write_scaled_steps(path: str, line_count: int) -> int:
+    """Write a step file of roughly `line_count` step lines by repeating steps_lab.lua."""
+    with open(STEPS_LAB, "r", encoding="utf-8") as steps_file:
+        template = [line.split("=", 1)[1] for line in steps_file if line.startswith("step[")]
+
+    with open(path, "w", encoding="utf-8") as scaled_file:
+        scaled_file.write("local step = {}\n\n")
+        for number in range(1, line_count + 1):
+            scaled_file.write(f"step[{number}] ={template[(number - 1) % len(template)]}")
+        scaled_file.write("\nreturn step\n")
+
+    return line_count
+
+def best_of(repeat: int, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="fle-bench-")
+    try:
+        path = os.path.join(work_dir, "steps_scaled.lua")
+        lines = write_scaled_steps(path, args.lines)
+        cache_dir = os.path.join(work_dir, "cache")
+
+        def compile_only():
+            StepParser(path, None, use_cache=False).compile()
+
+        def parse_uncached():
+            step_parser_module._compiled_steps.clear()
+            StepParser(path, CommunicationHandler("http://localhost", 1), use_cache=False).parse()
+
+        def load_from_disk_cache():
+            step_parser_module._compiled_steps.clear()
+            StepParser(path, None, cache_dir=cache_dir).load()
+
+        def load_from_memo():
+            StepParser(path, None, cache_dir=cache_dir).load()
+
+        # Warm the on-disk cache once so the cached runs measure reads only
+        load_from_disk_cache()
+
+        print(f"Step file: {lines:,} step lines ({os.path.getsize(path) / 1e6:.1f} MB)")
+        for name, run in [
+            ("compile (tokenize only)", compile_only),
+            ("parse (compile + queue actions)", parse_uncached),
+            ("load from disk cache", load_from_disk_cache),
+            ("load from in-process memo", load_from_memo),
+        ]:
+            seconds = best_of(args.repeat, run)
+            print(f"  {name:<34} {seconds * 1000:9.1f} ms  {lines / seconds:14,.0f} lines/s")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
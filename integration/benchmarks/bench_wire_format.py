@@ -0,0 +1,63 @@
+"""Payload size and decode time of /data/map as JSON versus the packed encoding.
+
+Usage (from integration/): python benchmarks/bench_wire_format.py [--radius 150] [--repeat 5]
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from communication_handler import PACKED_MAP_MAGIC, PACKED_MAP_VERSION, decode_packed_map
+from map_view import MapView
+from bench_map_view import synthetic_map_data
+
+def pack_map_data(map_data: dict) -> bytes:
+    """Python mirror of PackedMapEncoder.Encode in the API."""
+    groups = [map_data["tiles"]["water_tiles"], map_data["tiles"]["land_tiles"], map_data["offshore_pump_locations"]]
+    header = np.array([PACKED_MAP_VERSION] + [len(group) for group in groups], dtype="<i4")
+    positions = np.array(
+        [(tile["position"]["x"], tile["position"]["y"]) for group in groups for tile in group],
+        dtype="<i4"
+    )
+    return PACKED_MAP_MAGIC + header.tobytes() + positions.tobytes()
+
+def best_of(repeat: int, run) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--radius", type=int, default=150)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    map_data = synthetic_map_data(args.radius)
+    json_body = json.dumps(map_data, separators=(",", ":")).encode("utf-8")
+    packed_body = pack_map_data(map_data)
+
+    print("Payload size:")
+    for name, body in [("json", json_body), ("packed", packed_body)]:
+        print(f"  {name:<8} {len(body) / 1e6:8.2f} MB raw  {len(gzip.compress(body)) / 1e6:8.2f} MB gzip")
+
+    print("Decode time:")
+    for name, run in [
+        ("json.loads", lambda: json.loads(json_body)),
+        ("decode_packed_map", lambda: decode_packed_map(packed_body)),
+        ("json.loads + MapView", lambda: MapView.from_map_data(json.loads(json_body))),
+        ("packed + MapView", lambda: MapView.from_map_data(decode_packed_map(packed_body))),
+    ]:
+        print(f"  {name:<24} {best_of(args.repeat, run) * 1000:9.2f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""In-process stand-in for the FLE API, for benchmarks that should run without Docker or Factorio.
+
+Serves /reset/{n}, /actions, /actions/execute, /actions/status, /actions/wait, /health and
+/data/{meta,state,map}/{agent_id} (plus the state delta) with synthetic payloads sized like
+a busy factory. `rcon_latency` adds a fixed delay per call to stand in for the round trip
+to the game.
+
+    with MockApi(buildings=5000, map_radius=150) as api:
+        CommunicationHandler(api.url, 1).get_data(DataType.STATE)
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from communication_handler import PACKED_MEDIA_TYPE, ACTIONS_ADDED
+from bench_map_view import synthetic_map_data
+from bench_wire_format import pack_map_data
+
+_DATA_PATH = re.compile(r"^/data/(meta|state|map)/(\d+)(/delta)?$")
+_RESET_PATH = re.compile(r"^/reset/(\d+)$")
+
+def synthetic_state_data(buildings: int, agents: int = 1) -> Dict[str, Any]:
+    """State data with `buildings` assembling machines and `agents` characters."""
+    inventory = {"main": [{"name": "iron-plate", "count": 100}] * 10, "guns": [], "ammo": []}
+    return {
+        "agents": [
+            {
+                "agent_id": agent_id,
+                "position": {"x": agent_id * 2.5, "y": 0.5},
+                "inventory": inventory,
+                "walking_state": {"walking": False, "direction": 0},
+                "mining": {"is_mining": False, "position": None},
+                "crafting": {"queue": [], "progress": 0},
+                "actions": {"past_actions": [], "current_action": None, "future_actions": []},
+            }
+            for agent_id in range(1, agents + 1)
+        ],
+        "buildings": [
+            {
+                "name": "assembling-machine-1",
+                "unit_number": number,
+                "key": str(number),
+                "position": {"x": 1.5 + 3 * (number % 200), "y": 1.5 + 3 * (number // 200)},
+                "selection_box": {"left_top": {"x": 0, "y": 0}, "right_bottom": {"x": 3, "y": 3}},
+                "direction": "north",
+                "status": "working",
+                "recipe": "iron-gear-wheel",
+                "inventory_stats": {"input": [{"name": "iron-plate", "count": 8}], "output": []},
+            }
+            for number in range(1, buildings + 1)
+        ],
+        "electricity": {"production": 0, "capacity": 0, "consumption": 0},
+        "flow": {"input": [], "output": []},
+        "research_queue": [],
+    }
+
+def synthetic_meta_data(items: int = 300, recipes: int = 250, technologies: int = 150) -> Dict[str, Any]:
+    """Meta data with roughly vanilla-sized item, recipe and technology lists."""
+    return {
+        "items": [
+            {"name": f"item-{index}", "stack_size": 100, "type": "item", "group": "intermediate-products",
+             "subgroup": "intermediate-product", "place_result": None}
+            for index in range(items)
+        ],
+        "recipes": [
+            {"name": f"recipe-{index}", "category": "crafting", "enabled": True, "energy": 0.5,
+             "ingredients": [{"name": f"item-{index}", "amount": 2}],
+             "results": [{"name": f"item-{(index + 1) % items}", "amount": 1, "probability": 1}]}
+            for index in range(recipes)
+        ],
+        "technologies": [
+            {"name": f"technology-{index}", "researched": False, "enabled": True, "level": 1,
+             "prerequisites": [f"technology-{index - 1}"] if index else [], "research_unit_count": 50,
+             "research_unit_energy": 10, "ingredients": [{"name": "automation-science-pack", "amount": 1}],
+             "effects": [{"type": "unlock-recipe", "recipe": f"recipe-{index}"}]}
+            for index in range(technologies)
+        ],
+        "resources": {},
+    }
+
+class MockApi:
+    """Threaded HTTP server answering like the FLE API; use as a context manager."""
+
+    def __init__(self, buildings: int = 1000, map_radius: int = 100, rcon_latency: float = 0.0, agents: int = 1):
+        if buildings < 0:
+            raise ValueError("buildings cannot be negative")
+        if map_radius <= 0:
+            raise ValueError("map_radius must be positive")
+        if rcon_latency < 0:
+            raise ValueError("rcon_latency cannot be negative")
+
+        self.rcon_latency = rcon_latency
+        self.requests = 0
+        self.actions_received = 0
+        self._lock = threading.Lock()
+
+        # Payloads are encoded once so the benchmark measures the client, not the mock.
+        map_data = synthetic_map_data(map_radius)
+        state_data = synthetic_state_data(buildings, agents)
+        self._bodies = {
+            "meta": json.dumps(synthetic_meta_data()).encode("utf-8"),
+            "state": json.dumps(state_data).encode("utf-8"),
+            "delta": json.dumps(dict(state_data, version=1, full=True, removed_agents=[], removed_buildings=[])).encode("utf-8"),
+            "map": json.dumps(map_data).encode("utf-8"),
+            "map_packed": pack_map_data(map_data),
+        }
+        self._server: Optional[ThreadingHTTPServer] = None
+
+    @property
+    def url(self) -> str:
+        if self._server is None:
+            raise RuntimeError("MockApi is not running")
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def payload_size(self, name: str) -> int:
+        return len(self._bodies[name])
+
+    def start(self) -> "MockApi":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), _handler_for(self))
+        self._server.daemon_threads = True
+        threading.Thread(target=self._server.serve_forever, name="fle-mock-api", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockApi":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _rcon(self) -> None:
+        if self.rcon_latency:
+            time.sleep(self.rcon_latency)
+
+    def handle(self, method: str, path: str, headers, body: bytes) -> Tuple[int, str, bytes]:
+        """Return (status, content type, body) for one request."""
+        with self._lock:
+            self.requests += 1
+        path = path.split("?", 1)[0]
+
+        if method == "GET" and path == "/health":
+            return _json(200, {"healthy": True, "tick": 1})
+
+        data = _DATA_PATH.match(path)
+        if method == "GET" and data:
+            self._rcon()
+            kind = "delta" if data[3] else data[1]
+            if kind == "map" and PACKED_MEDIA_TYPE in headers.get("Accept", ""):
+                return 200, PACKED_MEDIA_TYPE, self._bodies["map_packed"]
+            return 200, "application/json", self._bodies[kind]
+
+        if method == "GET" and path in ("/actions/status", "/actions/wait"):
+            self._rcon()
+            return _json(200, {"tick": 1, "paused": False, "done": True, "agents": []})
+
+        if method == "POST" and path == "/actions":
+            request = json.loads(body)
+            self._rcon()
+            results = []
+            for agent_actions in request["agent_actions"]:
+                with self._lock:
+                    self.actions_received += len(agent_actions["actions"])
+                results.append(f"Agent {agent_actions['agent_id']}: {ACTIONS_ADDED}")
+            return _json(200, {"message": "Actions processed successfully", "result": "\n".join(results)})
+
+        if method == "POST" and path == "/actions/execute":
+            self._rcon()
+            return _json(200, {"message": "Actions executed successfully", "result": "Executing actions."})
+
+        reset = _RESET_PATH.match(path)
+        if method == "POST" and reset:
+            self._rcon()
+            return _json(200, {"message": "Reset completed successfully", "result": f"Created {reset[1]} agents."})
+
+        return _json(404, {"error": f"No mock for {method} {path}"})
+
+def _json(status: int, value: Any) -> Tuple[int, str, bytes]:
+    return status, "application/json", json.dumps(value).encode("utf-8")
+
+def _handler_for(api: MockApi):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+        # Without this, Nagle's algorithm and delayed ACKs add ~40 ms to every response.
+        disable_nagle_algorithm = True
+
+        def log_message(self, format, *args):
+            pass
+
+        def _respond(self, method: str) -> None:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = self.rfile.read(length) if length else b""
+            status, content_type, response = api.handle(method, self.path, self.headers, body)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(response)))
+            self.end_headers()
+            self.wfile.write(response)
+
+        def do_GET(self):
+            self._respond("GET")
+
+        def do_POST(self):
+            self._respond("POST")
+
+    return Handler
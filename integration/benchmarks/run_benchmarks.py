@@ -0,0 +1,222 @@
+"""Benchmark suite for the integration layer against the in-process MockApi, with regression checks.
+
+Measures step parsing, action queue building, request serialization, HTTP round trips
+and fleet fan-out without Docker or Factorio. Save a baseline once, then compare later
+runs on the same machine against it:
+
+Usage (from integration/):
+    python benchmarks/run_benchmarks.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_benchmarks.py --baseline benchmarks/baseline.json [--tolerance 0.25]
+
+Exits with status 1 when a metric is worse than the baseline by more than the tolerance.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from action_builder import ActionBuilder
+from communication_handler import CommunicationHandler, DataType
+from instrumentation import Recorder
+from models.defines import Direction, InventoryType
+from models.position import Position
+from step_parser import StepParser
+from bench_step_parser import write_scaled_steps, best_of
+from mock_api import MockApi
+
+BULK_ACTIONS = 20_000
+
+@dataclass
+class Metric:
+    value: float
+    unit: str
+    higher_is_better: bool
+
+def bench_local(path: str, repeat: int) -> Dict[str, Metric]:
+    """Step parsing, action queue building and request serialization; no network."""
+    step_parser = StepParser(path, None, use_cache=False)
+    steps = step_parser.compile()
+
+    compile_seconds = best_of(repeat, step_parser.compile)
+
+    def queue_actions():
+        builder = ActionBuilder()
+        StepParser(path, builder, use_cache=False).replay(steps)
+        return builder
+
+    builder = queue_actions()
+    actions = builder.actions
+    queue_seconds = best_of(repeat, queue_actions)
+
+    handler = CommunicationHandler("http://localhost", 1)
+    chunks = list(handler.iter_action_chunks(actions, 500, 64 * 1024))
+    payload_bytes = sum(len(body) for _, body in chunks)
+    serialize_seconds = best_of(repeat, lambda: list(handler.iter_action_chunks(actions, 500, 64 * 1024)))
+
+    # Programmatic plans: a chest emptied item by item and a long belt line, via the bulk builders.
+    items = [(f"item-{number}", number + 1) for number in range(BULK_ACTIONS // 2)]
+    belt = [(x + 0.5, 0.5) for x in range(BULK_ACTIONS // 2)]
+
+    def queue_bulk():
+        builder = ActionBuilder()
+        builder.take_many(Position(0.5, -7.5), items, InventoryType.CHEST)
+        builder.build_many(belt, "transport-belt", Direction.EAST)
+
+    bulk_seconds = best_of(repeat, queue_bulk)
+
+    return {
+        "step_parsing": Metric(len(steps) / compile_seconds, "steps/s", True),
+        "action_queue": Metric(len(actions) / queue_seconds, "actions/s", True),
+        "serialization": Metric(len(actions) / serialize_seconds, "actions/s", True),
+        "serialization_bytes": Metric(payload_bytes / serialize_seconds / 1e6, "MB/s", True),
+        "bulk_action_queue": Metric(BULK_ACTIONS / bulk_seconds, "actions/s", True),
+    }
+
+def bench_round_trips(api: MockApi, path: str, repeat: int) -> Dict[str, Metric]:
+    """Median latency of each handler call against a zero-latency MockApi."""
+    recorder = Recorder()
+    actions = list(StepParser(path, None, use_cache=False).iter_actions())[:500]
+
+    with CommunicationHandler(api.url, 1, recorder=recorder) as handler:
+        for _ in range(repeat * 10):
+            handler.reset()
+            handler.get_data(DataType.META)
+            handler.get_data(DataType.STATE)
+            handler.get_data(DataType.MAP)
+            handler.send_actions_stream(actions)
+            handler.execute_actions()
+
+    # Packed map calls share the get_data.map operation name, so they get their own recorder.
+    packed = Recorder()
+    with CommunicationHandler(api.url, 1, recorder=packed) as handler:
+        for _ in range(repeat * 10):
+            handler.get_data(DataType.MAP, packed=True)
+
+    summary = recorder.summary()
+    metrics = {
+        f"http_{operation}": Metric(summary[operation]["p50"] * 1000, "ms p50", False)
+        for operation in ("reset", "get_data.meta", "get_data.state", "get_data.map", "send_actions_chunk", "execute_actions")
+    }
+    metrics["http_get_data.map_packed"] = Metric(packed.summary()["get_data.map"]["p50"] * 1000, "ms p50", False)
+    return metrics
+
+def run_mock_episode(api_url: str, path: str) -> None:
+    """reset → send → execute → wait → fetch state, as fleet_runner.run_episode does per container."""
+    with CommunicationHandler(api_url, 1) as handler:
+        handler.reset()
+        handler.send_actions_stream(StepParser(path, None, use_cache=False).iter_actions())
+        handler.execute_actions()
+        handler.wait_for_completion()
+        handler.get_data(DataType.STATE)
+
+def bench_fan_out(apis: List[MockApi], path: str, repeat: int) -> Dict[str, Metric]:
+    """Wall time of one episode per instance, run in parallel, versus one after another."""
+    def serial():
+        for api in apis:
+            run_mock_episode(api.url, path)
+
+    def parallel():
+        with ThreadPoolExecutor(max_workers=len(apis)) as executor:
+            for future in [executor.submit(run_mock_episode, api.url, path) for api in apis]:
+                future.result()
+
+    serial_seconds = best_of(repeat, serial)
+    parallel_seconds = best_of(repeat, parallel)
+
+    return {
+        "fleet_wall_time": Metric(parallel_seconds * 1000, "ms", False),
+        "fleet_speedup": Metric(serial_seconds / parallel_seconds, f"x over serial ({len(apis)} instances)", True),
+    }
+
+def compare(results: Dict[str, Metric], baseline: Dict[str, dict], tolerance: float) -> List[str]:
+    """Names of metrics that are worse than the baseline by more than `tolerance`."""
+    regressions = []
+    for name, metric in results.items():
+        if name not in baseline:
+            continue
+        previous = baseline[name]["value"]
+        if previous <= 0:
+            continue
+        change = (metric.value - previous) / previous
+        if not metric.higher_is_better:
+            change = -change
+        if change < -tolerance:
+            regressions.append(name)
+    return regressions
+
+def print_results(results: Dict[str, Metric], baseline: Optional[Dict[str, dict]], regressions: List[str]) -> None:
+    for name, metric in results.items():
+        line = f"  {name:<28} {metric.value:14,.2f} {metric.unit}"
+        if baseline and name in baseline and baseline[name]["value"]:
+            change = (metric.value - baseline[name]["value"]) / baseline[name]["value"]
+            marker = "❌" if name in regressions else "  "
+            line += f"  {marker} {change:+7.1%} vs baseline"
+        print(line)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=50_000, help="step lines in the synthetic step file")
+    parser.add_argument("--buildings", type=int, default=5_000, help="buildings in the mock state data")
+    parser.add_argument("--map-radius", type=int, default=100, help="half-width of the mock map in tiles")
+    parser.add_argument("--instances", type=int, default=8, help="mock instances for the fan-out benchmark")
+    parser.add_argument("--fleet-lines", type=int, default=5_000, help="step lines per fan-out episode")
+    parser.add_argument("--latency", type=float, default=0.005, help="simulated RCON latency (s) for fan-out")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", help="JSON file from --save-baseline to compare against")
+    parser.add_argument("--save-baseline", help="write this run's results to a JSON file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slowdown")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix="fle-bench-")
+    try:
+        path = os.path.join(work_dir, "steps_scaled.lua")
+        write_scaled_steps(path, args.lines)
+        fleet_path = os.path.join(work_dir, "steps_fleet.lua")
+        write_scaled_steps(fleet_path, args.fleet_lines)
+
+        results: Dict[str, Metric] = {}
+        start = time.perf_counter()
+        results.update(bench_local(path, args.repeat))
+
+        with MockApi(buildings=args.buildings, map_radius=args.map_radius) as api:
+            results.update(bench_round_trips(api, path, args.repeat))
+
+        apis = [MockApi(buildings=100, map_radius=10, rcon_latency=args.latency).start() for _ in range(args.instances)]
+        try:
+            results.update(bench_fan_out(apis, fleet_path, args.repeat))
+        finally:
+            for api in apis:
+                api.stop()
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    baseline = None
+    regressions: List[str] = []
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as baseline_file:
+            baseline = json.load(baseline_file)
+        regressions = compare(results, baseline, args.tolerance)
+
+    print(f"Benchmarks finished in {time.perf_counter() - start:.1f}s:")
+    print_results(results, baseline, regressions)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as baseline_file:
+            json.dump({name: vars(metric) for name, metric in results.items()}, baseline_file, indent=2)
+        print(f"Saved baseline to {args.save_baseline}")
+
+    if regressions:
+        print(f"❌ {len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import hashlib
+import json
+from typing import Callable, Iterable, Tuple
+
+from action_builder import Action, ActionBuilder, action_dict
+from communication_handler import CommunicationHandler
+from models.position import json_default
+
+def checkpoint_name(actions: Iterable[Action], agent_count: int = 1, label: str = "prefix") -> str:
+    """Name of the checkpoint reached by running `actions`; changes whenever they do."""
+    if agent_count <= 0:
+        raise ValueError("agent_count must be positive")
+
+    digest = hashlib.sha256()
+    for action in actions:
+        digest.update(json.dumps(action_dict(action), separators=(",", ":"), default=json_default).encode("utf-8"))
+    return f"{label}-{agent_count}a-{digest.hexdigest()[:16]}"
+
+def run_from_checkpoint(
+    communication_handler: CommunicationHandler,
+    queue_prefix: Callable[[ActionBuilder], None],
+    agent_count: int = 1,
+    label: str = "prefix",
+    timeout: float = 300.0
+) -> Tuple[str, bool]:
+    """Bring a freshly reset game to the state after the actions `queue_prefix` queues.
+
+    The first time on an instance the prefix is sent, executed to completion and saved as
+    a checkpoint; later calls restore that checkpoint instead of replaying it. Queue the
+    remaining actions afterwards. Returns the checkpoint name and whether it was restored.
+    """
+    builder = ActionBuilder()
+    queue_prefix(builder)
+    name = checkpoint_name(builder.actions, agent_count, label)
+
+    if any(checkpoint["name"] == name for checkpoint in communication_handler.list_checkpoints()):
+        communication_handler.restore_checkpoint(name)
+        return name, True
+
+    communication_handler.actions.extend(builder.actions)
+    communication_handler.send_actions()
+    communication_handler.execute_actions()
+    communication_handler.wait_for_completion(timeout)
+    communication_handler.save_checkpoint(name)
+    return name, False
@@ -1,29 +1,349 @@
+import json
+import math
+import re
 import requests
 import time
-from typing import List, Dict, Any, Optional
+import uuid
+import numpy as np
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import ContextManager, Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 from enum import Enum
-from models.position import Position
-from models.defines import InventoryType, Direction
+from action_builder import Action, ActionBuilder, ActionBatch, action_dict
+from models.bounding_box import BoundingBox
+from models.position import json_default
+from instrumentation import CallRecord, Recorder
+from resilience import (
+    CircuitBreaker, CommunicationError, RetryPolicy, IDEMPOTENCY_HEADER, backoff_delays
+)
+
+# Per-agent result the FLE mod returns from add_actions when the actions were queued.
+ACTIONS_ADDED = "Actions added successfully."
+
+# Opt-in compact encoding of /data/map, see API/Converters/PackedMapEncoder.cs.
+PACKED_MEDIA_TYPE = "application/x-fle-packed"
+PACKED_MAP_MAGIC = b"FLEM"
+PACKED_MAP_VERSION = 1
+
+# Checkpoint names end up in RCON commands, so the API only accepts these characters.
+CHECKPOINT_NAME = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+# game.speed bounds in the FLE mod; speed 1 is Factorio's normal 60 ticks per second.
+MIN_GAME_SPEED = 0.01
+MAX_GAME_SPEED = 1000.0
 
 class DataType(Enum):
     META = "meta_data"
     MAP = "map_data"
     STATE = "state_data"
 
-class CommunicationHandler:
-    def __init__(self, api_base_url: str, agent_id: int, timeout: int = 30):
+def decode_packed_map(body: bytes) -> Dict[str, Any]:
+    """Decode a packed /data/map response into (N, 2) int32 position arrays.
+
+    The result has the same keys as the JSON map data, with arrays in place of the
+    lists of {"position": {...}} dicts; MapView.from_map_data accepts either form.
+    """
+    if body[:4] != PACKED_MAP_MAGIC:
+        raise ValueError("Not a packed map response")
+
+    header = np.frombuffer(body, dtype="<i4", count=5)
+    version, water_count, land_count, pump_count = (int(value) for value in header[1:])
+    if version != PACKED_MAP_VERSION:
+        raise ValueError(f"Unsupported packed map version: {version}")
+
+    positions = np.frombuffer(body, dtype="<i4", offset=header.nbytes).reshape(-1, 2)
+    if len(positions) != water_count + land_count + pump_count:
+        raise ValueError("Packed map response is truncated")
+
+    return {
+        "tiles": {
+            "water_tiles": positions[:water_count],
+            "land_tiles": positions[water_count:water_count + land_count]
+        },
+        "offshore_pump_locations": positions[water_count + land_count:]
+    }
+
+class ServerSentEvents:
+    """Incremental parser for text/event-stream lines, fed one decoded line at a time."""
+
+    def __init__(self):
+        self.event = "message"
+        self.data: List[str] = []
+
+    def feed(self, line: str) -> Optional[Tuple[str, str]]:
+        """Return (event, data) when `line` completes an event, otherwise None."""
+        line = line.rstrip("\r\n")
+        if not line:
+            if not self.data:
+                return None
+            event = (self.event, "\n".join(self.data))
+            self.event, self.data = "message", []
+            return event
+
+        field, _, value = line.partition(":")
+        value = value[1:] if value.startswith(" ") else value
+        if field == "event":
+            self.event = value
+        elif field == "data":
+            self.data.append(value)
+        return None
+
+@dataclass
+class BatchResult:
+    """Per-agent accounting for one ActionBatch submission."""
+    sent: Dict[int, int]
+    results: Dict[int, str]
+
+    @property
+    def failed(self) -> Dict[int, str]:
+        return {
+            agent_id: self.results.get(agent_id, "No result returned")
+            for agent_id in self.sent
+            if ACTIONS_ADDED not in self.results.get(agent_id, "")
+        }
+
+class StateStore:
+    """Client-side copy of get_data(DataType.STATE) kept current by applying state deltas.
+
+    Agents are keyed by agent id and buildings by the key the FLE mod assigns them
+    (unit number, or name@position for entities without one).
+    """
+
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.agents: Dict[int, Dict[str, Any]] = {}
+        self.buildings: Dict[str, Dict[str, Any]] = {}
+        self.electricity: Dict[str, Any] = {}
+        self.flow: Dict[str, Any] = {}
+        self.research_queue: List[Dict[str, Any]] = []
+
+    def apply(self, delta: Dict[str, Any]) -> None:
+        """Apply one /data/state/{agent_id}/delta response."""
+        # Sections missing from the delta were not asked for and keep their stored value.
+        if "agents" in delta:
+            if delta.get("full"):
+                self.agents.clear()
+            for agent in delta["agents"]:
+                self.agents[agent["agent_id"]] = agent
+            for agent_id in delta.get("removed_agents", []):
+                self.agents.pop(agent_id, None)
+
+        if "buildings" in delta:
+            if delta.get("full"):
+                self.buildings.clear()
+            for building in delta["buildings"]:
+                self.buildings[building["key"]] = building
+            for key in delta.get("removed_buildings", []):
+                self.buildings.pop(key, None)
+
+        self.electricity = delta.get("electricity", self.electricity)
+        self.flow = delta.get("flow", self.flow)
+        self.research_queue = delta.get("research_queue", self.research_queue)
+        self.version = delta["version"]
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the stored state in the same shape as get_data(DataType.STATE)."""
+        return {
+            "agents": list(self.agents.values()),
+            "buildings": list(self.buildings.values()),
+            "electricity": self.electricity,
+            "flow": self.flow,
+            "research_queue": self.research_queue
+        }
+
+class BaseCommunicationHandler(ActionBuilder):
+    """Shared configuration and request shaping for the sync and async handlers.
+
+    Transient failures (connection errors, timeouts, 429/502/503/504) are retried according
+    to `retry_policy`, and `circuit_breaker` makes calls fail fast once the instance keeps
+    failing; share one breaker between handlers that talk to the same instance. Action
+    submissions carry an idempotency key so a retried send is never queued twice.
+    Pass a Recorder to time every transport call and count the bytes and actions it moved.
+    """
+
+    def __init__(
+        self,
+        api_base_url: str,
+        agent_id: int,
+        timeout: int = 30,
+        recorder: Optional[Recorder] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
         if not api_base_url:
             raise ValueError("api_base_url cannot be empty")
         if agent_id <= 0:
             raise ValueError("agent_id must be positive")
         if timeout <= 0:
             raise ValueError("timeout must be positive")
-            
+
+        super().__init__()
         self.api_base_url = api_base_url.rstrip('/')
         self.agent_id = agent_id
         self.timeout = timeout
+        self.recorder = recorder
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+
+    def _measure(self, operation: str, actions: int = 0) -> ContextManager[Optional[CallRecord]]:
+        # Yields None when instrumentation is off, so callers only pay for a None check.
+        if self.recorder is None:
+            return nullcontext()
+        return self.recorder.measure(operation, self.agent_id, self.api_base_url, actions)
+
+    def _actions_headers(self) -> Dict[str, str]:
+        # One key per logical submission, reused by its retries.
+        return {IDEMPOTENCY_HEADER: uuid.uuid4().hex, "Content-Type": "application/json"}
+
+    def _actions_payload(self) -> Dict[str, Any]:
+        if not self.actions:
+            raise ValueError("No actions to send")
+
+        return {
+            "agent_actions": [
+                {
+                    "agent_id": self.agent_id,
+                    "actions": self.action_dicts()
+                }
+            ]
+        }
+
+    def iter_action_chunks(
+        self,
+        actions: Iterable[Union[Action, Dict[str, Any]]],
+        max_actions: int,
+        max_bytes: int
+    ) -> Iterator[Tuple[int, bytes]]:
+        """Group actions into /actions request bodies of bounded count and size.
+
+        Each action is JSON-encoded exactly once. A chunk is yielded as soon as it is full,
+        so the caller can send it while the source iterable is still producing actions.
+        """
+        if max_actions <= 0:
+            raise ValueError("max_actions must be positive")
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+
+        prefix = f'{{"agent_actions": [{{"agent_id": {self.agent_id}, "actions": ['.encode("utf-8")
+        suffix = b"]}]}"
+        overhead = len(prefix) + len(suffix)
+
+        chunk: List[bytes] = []
+        size = overhead
+        for action in actions:
+            encoded = json.dumps(action_dict(action), default=json_default).encode("utf-8")
+            if chunk and (len(chunk) >= max_actions or size + len(encoded) + 1 > max_bytes):
+                yield len(chunk), prefix + b",".join(chunk) + suffix
+                chunk = []
+                size = overhead
+
+            chunk.append(encoded)
+            size += len(encoded) + 1
+
+        if chunk:
+            yield len(chunk), prefix + b",".join(chunk) + suffix
+
+    def _batch_result(self, batch: ActionBatch, response_text: str) -> BatchResult:
+        # The API reports one "Agent <id>: <mod response>" line per agent.
+        try:
+            result_text = json.loads(response_text).get("result", "")
+        except (ValueError, AttributeError):
+            result_text = response_text
+
+        results: Dict[int, str] = {}
+        for line in result_text.splitlines():
+            prefix, separator, message = line.partition(": ")
+            agent_id = prefix[len("Agent "):]
+            if separator and prefix.startswith("Agent ") and agent_id.isdigit():
+                results[int(agent_id)] = message
+
+        return BatchResult(sent=batch.action_counts(), results=results)
+
+    def _data_endpoint(self, data_type: DataType) -> str:
+        if data_type == DataType.META:
+            return f"/data/meta/{self.agent_id}"
+        elif data_type == DataType.MAP:
+            return f"/data/map/{self.agent_id}"
+        elif data_type == DataType.STATE:
+            return f"/data/state/{self.agent_id}"
+        else:
+            raise ValueError(f"Unknown data type: {data_type}")
+
+    def _data_headers(self, data_type: DataType, packed: bool) -> Dict[str, str]:
+        if not packed:
+            return {}
+        if data_type != DataType.MAP:
+            raise ValueError("packed encoding is only available for map data")
+        return {"Accept": f"{PACKED_MEDIA_TYPE}, application/json;q=0.5"}
+
+    def _data_params(
+        self,
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        params: Dict[str, Any] = {}
+        if radius is not None:
+            if radius <= 0:
+                raise ValueError("radius must be positive")
+            params["radius"] = radius
+        if area is not None:
+            params["bbox"] = area.to_query()
+        if fields is not None:
+            fields = list(fields)
+            if not fields:
+                raise ValueError("fields cannot be empty")
+            params["fields"] = ",".join(fields)
+        return params
+
+    def _wait_params(self, deadline: float, poll_timeout: int) -> Dict[str, int]:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError("Actions did not complete before the timeout")
+        return {"timeoutSeconds": max(1, min(poll_timeout, math.ceil(remaining)))}
+
+    def _state_delta_params(
+        self,
+        since_version: Optional[int],
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        params = self._data_params(radius, area, fields)
+        if since_version is not None:
+            params["since"] = since_version
+        return params
+
+    def _checkpoint_path(self, name: str) -> str:
+        if not CHECKPOINT_NAME.match(name):
+            raise ValueError(f"Invalid checkpoint name {name!r}: use 1-64 letters, digits, '-' or '_'")
+        return f"/checkpoints/{name}"
+
+    def _execute_params(self, until_idle: bool) -> Dict[str, str]:
+        return {"untilIdle": "true"} if until_idle else {}
+
+    def _game_speed_body(self, speed: float) -> bytes:
+        if not MIN_GAME_SPEED <= speed <= MAX_GAME_SPEED:
+            raise ValueError(f"speed must be between {MIN_GAME_SPEED} and {MAX_GAME_SPEED}")
+        return json.dumps({"speed": speed}, default=json_default).encode("utf-8")
+
+    def _with_throughput(self, start: Dict[str, Any], status: Dict[str, Any], elapsed: float) -> Dict[str, Any]:
+        # Adds the ticks run since `start` and the rate they ran at.
+        ticks = status["tick"] - start["tick"]
+        return dict(status, ticks=ticks, ticks_per_second=ticks / elapsed if elapsed > 0 else 0.0)
+
+class CommunicationHandler(BaseCommunicationHandler):
+    def __init__(
+        self,
+        api_base_url: str,
+        agent_id: int,
+        timeout: int = 30,
+        recorder: Optional[Recorder] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ):
+        super().__init__(api_base_url, agent_id, timeout, recorder, retry_policy, circuit_breaker)
         self.session = requests.Session()
-        self.actions: List[Dict[str, Any]] = []
 
     def __enter__(self):
         return self
@@ -36,290 +356,297 @@ class CommunicationHandler:
         if self.session:
             self.session.close()
 
-    def _add_action(self, action: Dict[str, Any]) -> None:
-        self.actions.append(action)
+    def _observe(self, record: Optional[CallRecord], response: requests.Response) -> None:
+        if record is not None:
+            request_bytes = len(response.request.body or b"")
+            record.observe_response(request_bytes, len(response.content), response.status_code, response.headers)
 
-    def _validate_quantity(self, quantity: int) -> None:
-        if quantity != -1 and quantity <= 0:
-            raise ValueError("quantity must be either -1 or positive")
+    def _request(self, method: str, path: str, operation: str, error: str, actions: int = 0, **kwargs) -> requests.Response:
+        """Send one API request, retrying transient failures; raise CommunicationError
+        prefixed with `error` once the retries run out or the failure is permanent."""
+        kwargs.setdefault("timeout", self.timeout)
 
-    def _validate_ticks(self, ticks: int) -> None:
-        if ticks <= 0:
-            raise ValueError("ticks must be positive")
+        def attempt() -> requests.Response:
+            with self._measure(operation, actions) as record:
+                try:
+                    response = self.session.request(method, f"{self.api_base_url}{path}", **kwargs)
+                except (requests.ConnectionError, requests.Timeout) as e:
+                    raise CommunicationError(f"{error}: {e}", transient=True) from e
+                except requests.RequestException as e:
+                    raise CommunicationError(f"{error}: {e}") from e
+
+                self._observe(record, response)
+                if response.status_code >= 400:
+                    raise CommunicationError(f"{error}: {response.status_code} - {response.text}", response.status_code)
+                return response
+
+        return self.retry_policy.call(attempt, self.circuit_breaker)
 
     def send_actions(self) -> str:
         """Send all accumulated actions to the API."""
-        if not self.actions:
+        body = json.dumps(self._actions_payload(), default=json_default).encode("utf-8")
+
+        response = self._request(
+            "POST", "/actions", "send_actions", "Error sending actions", len(self.actions),
+            data=body, headers=self._actions_headers()
+        )
+
+        # Clear actions after successful send
+        self.actions.clear()
+
+        return response.text
+
+    def send_batch(self, batch: ActionBatch) -> BatchResult:
+        """Send the queued actions of every agent in the batch in a single request."""
+        body = json.dumps(batch.payload(), default=json_default).encode("utf-8")
+
+        response = self._request(
+            "POST", "/actions", "send_batch", "Error sending actions", sum(batch.action_counts().values()),
+            data=body, headers=self._actions_headers()
+        )
+
+        result = self._batch_result(batch, response.text)
+        batch.clear()
+
+        return result
+
+    def send_actions_stream(
+        self,
+        actions: Iterable[Union[Action, Dict[str, Any]]],
+        max_actions: int = 500,
+        max_bytes: int = 64 * 1024
+    ) -> List[str]:
+        """Send actions from an iterable (e.g. StepParser.iter_actions()) in bounded chunks.
+
+        Chunks are flushed as soon as they reach `max_actions` actions or `max_bytes`
+        bytes, so long step files never build one giant request or RCON command.
+        Actions queued on the handler itself are not touched.
+        """
+        responses = [
+            self.post_actions_body(body, count)
+            for count, body in self.iter_action_chunks(actions, max_actions, max_bytes)
+        ]
+
+        if not responses:
             raise ValueError("No actions to send")
-        
-        payload = {
-            "agent_actions": [
-                {
-                    "agent_id": self.agent_id,
-                    "actions": self.actions
-                }
-            ]
-        }
-        
-        try:
-            response = self.session.post(
-                f"{self.api_base_url}/actions",
-                json=payload,
-                timeout=self.timeout
-            )
-            
-            # Get detailed error response if available
-            if response.status_code != 200:
-                try:
-                    error_detail = response.text
-                    raise Exception(f"Error sending actions: {response.status_code} - {error_detail}")
-                except:
-                    pass
-            
-            response.raise_for_status()
-            
-            # Clear actions after successful send
-            self.actions.clear()
-            
-            return response.text
-        except requests.RequestException as e:
-            # Get detailed error response if available
-            if hasattr(e, 'response') and e.response is not None:
-                try:
-                    error_detail = e.response.text
-                    raise Exception(f"Error sending actions: {e} - Server response: {error_detail}")
-                except:
-                    pass
-            raise Exception(f"Error sending actions: {e}")
-
-    def get_data(self, data_type: DataType) -> Dict[str, Any]:
-        """Get data from the API as parsed JSON."""
+
+        return responses
+
+    def post_actions_body(self, body: bytes, action_count: int = 0) -> str:
+        """POST one pre-encoded /actions request body, e.g. a chunk from iter_action_chunks.
+
+        `action_count` is only used for instrumentation.
+        """
+        response = self._request(
+            "POST", "/actions", "send_actions_chunk", "Error sending actions", action_count,
+            data=body, headers=self._actions_headers()
+        )
+        return response.text
+
+    def get_data(
+        self,
+        data_type: DataType,
+        packed: bool = False,
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Get data from the API as parsed JSON.
+
+        With packed=True (map data only) tile positions arrive as int32 arrays instead of
+        per-tile dicts; servers without packed support answer with plain JSON. `radius`
+        (tiles around the agent, server default 150) or `area` limit the search, and
+        `fields` (e.g. ["buildings"]) the top-level keys collected; the rest come back empty.
+        """
+        response = self._request(
+            "GET", self._data_endpoint(data_type), f"get_data.{data_type.name.lower()}",
+            f"Error getting {data_type.value}", headers=self._data_headers(data_type, packed),
+            params=self._data_params(radius, area, fields)
+        )
+        if response.headers.get("Content-Type", "").startswith(PACKED_MEDIA_TYPE):
+            return decode_packed_map(response.content)
+        return response.json()
+
+    def get_state_delta(
+        self,
+        since_version: Optional[int] = None,
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Get the agents and buildings that changed since `since_version`.
+
+        Without a version, with one the server no longer holds, or after changing `radius`
+        or `area`, the response is a full snapshot with "full" set to true. electricity,
+        flow and research_queue are only included when listed in `fields`.
+        """
+        response = self._request(
+            "GET", f"/data/state/{self.agent_id}/delta", "get_state_delta", "Error getting state delta",
+            params=self._state_delta_params(since_version, radius, area, fields)
+        )
+        return response.json()
+
+    def sync_state(
+        self,
+        store: StateStore,
+        radius: Optional[int] = None,
+        area: Optional[BoundingBox] = None,
+        fields: Optional[Iterable[str]] = None
+    ) -> Dict[str, Any]:
+        """Bring `store` up to date with one delta poll and return the applied delta."""
+        delta = self.get_state_delta(store.version, radius, area, fields)
+        store.apply(delta)
+        return delta
+
+    def is_healthy(self, connect_timeout: float = 0.5) -> bool:
+        """Probe /health once; true when the API is up and its RCON link reaches the game."""
         try:
-            if data_type == DataType.META:
-                endpoint = f"/data/meta/{self.agent_id}"
-            elif data_type == DataType.MAP:
-                endpoint = f"/data/map/{self.agent_id}"
-            elif data_type == DataType.STATE:
-                endpoint = f"/data/state/{self.agent_id}"
-            else:
-                raise ValueError(f"Unknown data type: {data_type}")
-            
             response = self.session.get(
-                f"{self.api_base_url}{endpoint}",
-                timeout=self.timeout
+                f"{self.api_base_url}/health",
+                timeout=(connect_timeout, self.timeout)
             )
-            response.raise_for_status()
-            return response.json()
+            return response.status_code == 200
+        except (requests.ConnectionError, requests.Timeout):
+            return False
+
+    def wait_for_api_ready(
+        self,
+        *,
+        timeout: float = 60.0,
+        initial_delay: float = 0.05,
+        max_delay: float = 0.5,
+        connect_timeout: float = 0.5
+    ) -> bool:
+        """Wait for the API and its RCON link to become available.
+
+        Probes /health with a short connect timeout, backing off exponentially with
+        jitter from `initial_delay` to `max_delay` between attempts. The arguments are
+        keyword-only: they replaced the old positional `max_attempts` and `delay`.
+        """
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        deadline = time.monotonic() + timeout
+        for delay in backoff_delays(initial_delay, max_delay):
+            if self.is_healthy(connect_timeout):
+                return True
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+
+    def get_actions_status(self) -> Dict[str, Any]:
+        """Progress of every agent's action queue: completed/total per agent and overall done."""
+        response = self._request("GET", "/actions/status", "get_actions_status", "Error getting actions status")
+        return response.json()
+
+    def wait_for_completion(self, timeout: float = 300.0, poll_timeout: int = 30) -> Dict[str, Any]:
+        """Block until every agent's queued actions have finished and return the final status.
+
+        Uses the /actions/wait long-poll, so the call returns as soon as the API sees the
+        queues drain. Raises TimeoutError after `timeout` seconds.
+        """
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+        if poll_timeout <= 0:
+            raise ValueError("poll_timeout must be positive")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            params = self._wait_params(deadline, poll_timeout)
+            status = self._request(
+                "GET", "/actions/wait", "wait_for_completion", "Error waiting for actions",
+                params=params, timeout=self.timeout + params["timeoutSeconds"]
+            ).json()
+
+            if status.get("done"):
+                return status
+
+    def iter_actions_status(self, timeout: float = 300.0) -> Iterator[Dict[str, Any]]:
+        """Yield action queue progress from the /actions/events stream until all queues drain.
+
+        Raises TimeoutError once `timeout` seconds pass before that. The server sends a
+        keep-alive every few seconds, so a stream silent for the handler's `timeout` is
+        treated as lost and raises CommunicationError.
+        """
+        if timeout <= 0:
+            raise ValueError("timeout must be positive")
+
+        deadline = time.monotonic() + timeout
+        parser = ServerSentEvents()
+        try:
+            with self.session.get(
+                f"{self.api_base_url}/actions/events",
+                stream=True,
+                timeout=(self.timeout, min(self.timeout, timeout))
+            ) as response:
+                response.raise_for_status()
+                for line in response.iter_lines(decode_unicode=True):
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError("Actions did not complete before the timeout")
+                    event = parser.feed(line or "")
+                    if event is None:
+                        continue
+                    name, data = event
+                    yield json.loads(data)
+                    if name == "done":
+                        return
         except requests.RequestException as e:
-            raise Exception(f"Error getting {data_type.value}: {e}")
-
-    def wait_for_api_ready(self, max_attempts: int = 30, delay: float = 1.0) -> bool:
-        """Wait for the API to become available."""
-        if max_attempts <= 0:
-            raise ValueError("max_attempts must be positive")
-        if delay <= 0:
-            raise ValueError("delay must be positive")
-            
-        for attempt in range(max_attempts):
-            try:
-                response = self.session.get(f"{self.api_base_url}/openapi/v1.json", timeout=self.timeout)
-                if response.status_code == 200:
-                    return True
-            except (requests.ConnectionError, requests.Timeout):
-                pass
-            
-            if attempt < max_attempts - 1:
-                time.sleep(delay)
-        
-        return False
+            if time.monotonic() >= deadline:
+                raise TimeoutError("Actions did not complete before the timeout") from e
+            raise CommunicationError(f"Error streaming actions status: {e}") from e
 
     def reset(self, agent_count: int = 1) -> str:
         """Reset the game state and create the specified number of agents."""
         if agent_count <= 0:
             raise ValueError("agent_count must be positive")
-            
-        try:
-            response = self.session.post(
-                f"{self.api_base_url}/reset/{agent_count}",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            raise Exception(f"Error resetting game: {e}")
 
-    def execute_actions(self) -> str:
-        """Execute all queued actions in the game."""
-        try:
-            response = self.session.post(
-                f"{self.api_base_url}/actions/execute",
-                timeout=self.timeout
-            )
-            response.raise_for_status()
-            return response.text
-        except requests.RequestException as e:
-            raise Exception(f"Error executing actions: {e}")
-    
-    def research(self, technology_name: str) -> None:
-        if not technology_name:
-            raise ValueError("technology_name cannot be empty")
-        action = {
-            "type": "research",
-            "technology_name": technology_name
-        }
-        self._add_action(action)
-    
-    def cancel_research(self) -> None:
-        action = {"type": "cancel_research"}
-        self._add_action(action)
-
-    def walk(self, position: Position) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        action = {
-            "type": "walk",
-            "position": position
-        }
-        self._add_action(action)
-    
-    def take(self, position: Position, item_name: str, quantity: int, inventory_type: InventoryType) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        if not item_name:
-            raise ValueError("item_name cannot be empty")
-        self._validate_quantity(quantity)
-        if inventory_type is None:
-            raise ValueError("inventory_type cannot be None")
-        action = {
-            "type": "take",
-            "position": position,
-            "item_name": item_name,
-            "quantity": quantity,
-            "inventory_type": inventory_type.value
-        }
-        self._add_action(action)
-    
-    def put(self, position: Position, item_name: str, quantity: int, inventory_type: InventoryType) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        if not item_name:
-            raise ValueError("item_name cannot be empty")
-        self._validate_quantity(quantity)
-        if inventory_type is None:
-            raise ValueError("inventory_type cannot be None")
-        action = {
-            "type": "put",
-            "position": position,
-            "item_name": item_name,
-            "quantity": quantity,
-            "inventory_type": inventory_type.value
-        }
-        self._add_action(action)
-    
-    def craft(self, item_name: str, quantity: int) -> None:
-        if not item_name:
-            raise ValueError("item_name cannot be empty")
-        self._validate_quantity(quantity)
-        action = {
-            "type": "craft",
-            "item_name": item_name,
-            "quantity": quantity
-        }
-        self._add_action(action)
-
-    def cancel_craft(self, item_name: str, quantity: int) -> None:
-        if not item_name:
-            raise ValueError("item_name cannot be empty")
-        self._validate_quantity(quantity)
-        action = {
-            "type": "cancel_craft",
-            "item_name": item_name,
-            "quantity": quantity
-        }
-        self._add_action(action)
-
-    def build(self, position: Position, item_name: str, direction: Direction) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        if not item_name:
-            raise ValueError("item_name cannot be empty")
-        if direction is None:
-            raise ValueError("direction cannot be None")
-        action = {
-            "type": "build",
-            "position": position,
-            "item_name": item_name,
-            "direction": direction.value
-        }
-        self._add_action(action)
-    
-    def rotate(self, position: Position, reverse: bool = False) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        action = {
-            "type": "rotate",
-            "position": position,
-            "reverse": reverse
-        }
-        self._add_action(action)
-    
-    def mine(self, position: Position, ticks: int) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        self._validate_ticks(ticks)
-        action = {
-            "type": "mine",
-            "position": position,
-            "ticks": ticks
-        }
-        self._add_action(action)
-    
-    def recipe(self, position: Position, recipe_name: str) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        if not recipe_name:
-            raise ValueError("recipe_name cannot be empty")
-        action = {
-            "type": "recipe",
-            "position": position,
-            "recipe_name": recipe_name
-        }
-        self._add_action(action)
-    
-    def wait(self, ticks: int) -> None:
-        self._validate_ticks(ticks)
-        action = {
-            "type": "wait",
-            "ticks": ticks
-        }
-        self._add_action(action)
-
-    def drop(self, position: Position, item_name: str) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        if not item_name:
-            raise ValueError("item_name cannot be empty")
-        action = {
-            "type": "drop",
-            "position": position,
-            "item_name": item_name
-        }
-        self._add_action(action)
-    
-    def launch_rocket(self, position: Position) -> None:
-        if position is None:
-            raise ValueError("position cannot be None")
-        action = {
-            "type": "launch_rocket",
-            "position": position
-        }
-        self._add_action(action)
-    
-    def pick_up(self, ticks: int) -> None:
-        self._validate_ticks(ticks)
-        action = {
-            "type": "pick_up",
-            "ticks": ticks
-        }
-        self._add_action(action)
-    
\ No newline at end of file
+        return self._request("POST", f"/reset/{agent_count}", "reset", "Error resetting game").text
+
+    def execute_actions(self, until_idle: bool = False) -> str:
+        """Execute all queued actions in the game.
+
+        With until_idle the game runs as fast as the server allows and pauses itself, back
+        at its previous speed, once every agent is done; run_until_idle also waits for that.
+        """
+        return self._request(
+            "POST", "/actions/execute", "execute_actions", "Error executing actions",
+            params=self._execute_params(until_idle)
+        ).text
+
+    def run_until_idle(self, timeout: float = 300.0) -> Dict[str, Any]:
+        """Execute the queued actions as fast as the server allows and wait until they finish.
+
+        Returns the final status plus the `ticks` it took and the `ticks_per_second` achieved.
+        """
+        start = self.get_actions_status()
+        started = time.perf_counter()
+        self.execute_actions(until_idle=True)
+        status = self.wait_for_completion(timeout)
+        return self._with_throughput(start, status, time.perf_counter() - started)
+
+    def set_game_speed(self, speed: float) -> float:
+        """Run the game at `speed` times the normal 60 ticks per second; returns the speed set."""
+        response = self._request(
+            "PUT", "/game/speed", "set_game_speed", "Error setting game speed",
+            data=self._game_speed_body(speed), headers={"Content-Type": "application/json"}
+        )
+        return response.json()["speed"]
+
+    def save_checkpoint(self, name: str) -> Dict[str, Any]:
+        """Save the map, agents and research under `name`; save while the agents are idle."""
+        path = self._checkpoint_path(name)
+        return self._request("POST", path, "save_checkpoint", "Error saving checkpoint").json()
+
+    def restore_checkpoint(self, name: str) -> Dict[str, Any]:
+        """Restore a saved checkpoint instead of resetting; the game is left paused."""
+        path = self._checkpoint_path(name)
+        return self._request("POST", f"{path}/restore", "restore_checkpoint", "Error restoring checkpoint").json()
+
+    def list_checkpoints(self) -> List[Dict[str, Any]]:
+        return self._request("GET", "/checkpoints", "list_checkpoints", "Error listing checkpoints").json()
+
+    def delete_checkpoint(self, name: str) -> None:
+        path = self._checkpoint_path(name)
+        self._request("DELETE", path, "delete_checkpoint", "Error deleting checkpoint")
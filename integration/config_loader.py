@@ -0,0 +1,54 @@
+import json
+import os
+from dataclasses import dataclass
+from typing import List, Dict, Any, Optional
+
+from models.position import Position
+
+DEFAULT_CONFIG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config.json")
+
+@dataclass
+class CharacterSlot:
+    """One in-game character from config.json and the agent id the API knows it by."""
+    agent_id: int
+    team_index: int
+    agent_index: int
+    character_index: int
+    provider: str
+    model: str
+    spawn_position: Position
+
+def load_config(path: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Load the list of instance configurations from config.json."""
+    with open(path or DEFAULT_CONFIG_PATH, "r", encoding="utf-8") as config_file:
+        config = json.load(config_file)
+
+    if not isinstance(config, list):
+        raise ValueError("config must be a list of instance configurations")
+
+    return config
+
+def character_slots(instance_config: Dict[str, Any]) -> List[CharacterSlot]:
+    """Flatten teams → agents → characters into slots with sequential agent ids.
+
+    Agent ids start at 1 and follow config order, matching the order in which the
+    FLE mod creates characters on reset. A character's `inventory` is not read: the mod
+    cannot set character inventories yet.
+    """
+    slots: List[CharacterSlot] = []
+
+    for team_index, team in enumerate(instance_config.get("teams", [])):
+        for agent_index, agent in enumerate(team.get("agents", [])):
+            for character_index, character in enumerate(agent.get("characters", [])):
+                spawn = character.get("spawn_position", {})
+                slots.append(CharacterSlot(
+                    agent_id=len(slots) + 1,
+                    team_index=team_index,
+                    agent_index=agent_index,
+                    character_index=character_index,
+                    provider=agent.get("provider", ""),
+                    model=agent.get("name", ""),
+                    spawn_position=Position(spawn.get("x", 0.0), spawn.get("y", 0.0))
+                ))
+
+    return slots
@@ -0,0 +1,216 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional
+from docker.client import DockerClient
+from docker.models.containers import Container
+
+from communication_handler import CommunicationHandler
+from instrumentation import Recorder
+from resilience import CircuitBreaker, RetryPolicy
+from factorio_instances import create_factorio_instance, wait_for_services, wait_for_all_services
+from placement import Layout, placement_kwargs, placement_matches
+
+POOL_LABEL = "group=FLE"
+
+@dataclass
+class PooledInstance:
+    """A warm Factorio+API container owned by a ContainerPool."""
+    instance_id: int
+    container: Container
+    api_url: str
+    episodes: int = 0
+    communication_handler: Optional[CommunicationHandler] = None
+    # Shared by every lease of this instance, so repeated failures mark it for recycling.
+    circuit_breaker: CircuitBreaker = field(default_factory=CircuitBreaker)
+
+class ContainerPool:
+    """Long-lived pool of Factorio+API containers that are reset between episodes.
+
+    Containers labeled `group: FLE` from earlier runs are adopted on start(), so a warm
+    pool survives process restarts. Each lease health-checks the instance, resets the
+    game and hands out a CommunicationHandler; instances are recycled (removed and
+    recreated) after `max_episodes` leases, when the health check fails or when the
+    instance's circuit breaker has opened. Leased handlers retry transient failures per
+    `retry_policy` and report their calls to `recorder` when one is given. With a
+    `layout` from plan_layout every container is pinned and sized as it says; warm
+    containers with other settings are replaced rather than adopted.
+    Missing containers are created up to `max_concurrency` at a time.
+    """
+
+    def __init__(
+        self,
+        docker_client: DockerClient,
+        image_name: str,
+        scenario_name: str,
+        size: int = 1,
+        max_episodes: int = 50,
+        first_udp_port: int = 34197,
+        first_rcon_port: int = 27015,
+        first_api_port: int = 5000,
+        platform: str = "linux/amd64",
+        recorder: Optional[Recorder] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        layout: Optional[Layout] = None,
+        max_concurrency: int = 4
+    ):
+        if size <= 0:
+            raise ValueError("size must be positive")
+        if layout and size > len(layout.placements):
+            raise ValueError(f"layout places {len(layout.placements)} instance(s), the pool needs {size}")
+        if max_episodes <= 0:
+            raise ValueError("max_episodes must be positive")
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+
+        self.docker_client = docker_client
+        self.image_name = image_name
+        self.scenario_name = scenario_name
+        self.size = size
+        self.max_episodes = max_episodes
+        self.first_udp_port = first_udp_port
+        self.first_rcon_port = first_rcon_port
+        self.first_api_port = first_api_port
+        self.platform = platform
+        self.recorder = recorder
+        self.retry_policy = retry_policy
+        self.layout = layout
+        self.max_concurrency = max_concurrency
+
+        self._instances: List[PooledInstance] = []
+        self._available: "queue.Queue[PooledInstance]" = queue.Queue()
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    @property
+    def instances(self) -> List[PooledInstance]:
+        with self._lock:
+            return list(self._instances)
+
+    def _instance_id(self, container: Container) -> Optional[int]:
+        prefix = f"{self.image_name}-"
+        if not container.name.startswith(prefix):
+            return None
+        suffix = container.name[len(prefix):]
+        return int(suffix) if suffix.isdigit() else None
+
+    def _create(self, instance_id: int) -> Container:
+        offset = instance_id - 1
+        return create_factorio_instance(
+            docker_client=self.docker_client,
+            instance_id=instance_id,
+            image_name=self.image_name,
+            scenario_name=self.scenario_name,
+            udp_port=self.first_udp_port + offset,
+            rcon_port=self.first_rcon_port + offset,
+            api_port=self.first_api_port + offset,
+            platform=self.platform,
+            **placement_kwargs(self.layout.for_instance(instance_id) if self.layout else None)
+        )
+
+    def start(self) -> None:
+        """Adopt running pool containers and create whatever is missing to reach `size`."""
+        adopted = {}
+        for container in self.docker_client.containers.list(all=True, filters={"label": POOL_LABEL}):
+            instance_id = self._instance_id(container)
+            if instance_id is None or instance_id > self.size:
+                continue
+            if container.status != "running":
+                print(f"Removing stopped pool container {container.name}")
+                container.remove(force=True)
+                continue
+            if self.layout and not placement_matches(container.attrs.get("HostConfig", {}), self.layout.for_instance(instance_id)):
+                print(f"Removing pool container {container.name}: its CPU/memory settings differ from the layout")
+                container.remove(force=True)
+                continue
+            print(f"♻️  Adopting warm container {container.name}")
+            adopted[instance_id] = container
+
+        missing = [instance_id for instance_id in range(1, self.size + 1) if instance_id not in adopted]
+        if missing:
+            with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(missing))) as executor:
+                adopted.update(zip(missing, executor.map(self._create, missing)))
+
+        containers = [adopted[instance_id] for instance_id in range(1, self.size + 1)]
+        api_urls = wait_for_all_services(containers)
+
+        for instance_id, (container, api_url) in enumerate(zip(containers, api_urls), start=1):
+            instance = PooledInstance(instance_id, container, api_url)
+            with self._lock:
+                self._instances.append(instance)
+            self._available.put(instance)
+
+    def _recycle(self, instance: PooledInstance) -> None:
+        print(f"Recycling {instance.container.name} after {instance.episodes} episode(s)")
+        try:
+            instance.container.remove(force=True)
+        except Exception as e:
+            print(f"Failed to remove container {instance.container.name}: {e}")
+
+        instance.container = self._create(instance.instance_id)
+        instance.api_url = wait_for_services(instance.container)
+        instance.episodes = 0
+        instance.circuit_breaker.reset()
+
+    def _is_healthy(self, instance: PooledInstance) -> bool:
+        try:
+            instance.container.reload()
+            if instance.container.status != "running":
+                return False
+            with CommunicationHandler(instance.api_url, 1, timeout=5) as communication_handler:
+                return communication_handler.is_healthy()
+        except Exception:
+            return False
+
+    @contextmanager
+    def lease(self, agent_count: int = 1, timeout: Optional[float] = None) -> Iterator[PooledInstance]:
+        """Borrow a healthy, freshly reset instance for one episode."""
+        try:
+            instance = self._available.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError(f"No pool instance became available within {timeout}s")
+
+        try:
+            if instance.circuit_breaker.is_open or not self._is_healthy(instance):
+                self._recycle(instance)
+
+            instance.communication_handler = CommunicationHandler(
+                instance.api_url,
+                1,
+                recorder=self.recorder,
+                retry_policy=self.retry_policy,
+                circuit_breaker=instance.circuit_breaker
+            )
+            instance.communication_handler.reset(agent_count=agent_count)
+            yield instance
+        finally:
+            if instance.communication_handler:
+                instance.communication_handler.close()
+                instance.communication_handler = None
+
+            instance.episodes += 1
+            try:
+                if instance.episodes >= self.max_episodes:
+                    self._recycle(instance)
+            finally:
+                self._available.put(instance)
+
+    def close(self, remove: bool = False) -> None:
+        """Release the pool. Containers stay warm for the next run unless `remove` is set."""
+        if not remove:
+            return
+
+        for instance in self.instances:
+            try:
+                instance.container.remove(force=True)
+                print(f"Removed container {instance.container.name} (ID: {instance.container.short_id})")
+            except Exception as e:
+                print(f"Failed to remove container {instance.container.name}: {e}")
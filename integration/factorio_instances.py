@@ -0,0 +1,225 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional, Tuple
+from docker.client import DockerClient
+from docker.models.containers import Container
+
+from communication_handler import CommunicationHandler
+from placement import Layout, placement_kwargs
+
+# Same probe as the Dockerfile HEALTHCHECK, but on a 1s cadence so readiness is reported
+# within a second of both services listening instead of after the 30s image interval.
+HEALTHCHECK = {
+    "test": ["CMD-SHELL", "(netstat -ln | grep :34197 && netstat -ln | grep :5000) || exit 1"],
+    "interval": 1_000_000_000,
+    "timeout": 2_000_000_000,
+    "retries": 3,
+    "start_period": 60_000_000_000,
+}
+
+def wait_for_services(container: Container, timeout: float = 60.0) -> str:
+    """Wait for API service to be available for a container."""
+    container.reload()  # ensure information is fresh
+    ports_dict = container.attrs["NetworkSettings"]["Ports"]
+    
+    # Get API port mapping
+    api_mapping = ports_dict.get("5000/tcp")
+    if not api_mapping:
+        raise ValueError(f"Container {container.name} has no 5000/tcp port mapping!")
+    
+    # Extract host and port
+    host_ip = api_mapping[0]["HostIp"]
+    if host_ip == "0.0.0.0":
+        host_ip = "127.0.0.1"
+    
+    api_port = int(api_mapping[0]["HostPort"])
+    api_url = f"http://{host_ip}:{api_port}"
+    
+    print(f"Waiting for API service on {container.name}:")
+    print(f"  - API: {api_url}")
+    
+    # Wait for API and its RCON link
+    with CommunicationHandler(api_url, 1, timeout=5) as communication_handler:
+        if communication_handler.wait_for_api_ready(timeout=timeout):
+            print(f"✅ API is ready on {container.name}")
+        else:
+            raise RuntimeError(f"❌ API timeout for {container.name}")
+    
+    return api_url
+
+def wait_for_all_services(containers: List[Container], timeout: float = 60.0) -> List[str]:
+    """Wait for the APIs of all containers at once; returns the API URLs in container order."""
+    if not containers:
+        return []
+
+    with ThreadPoolExecutor(max_workers=len(containers), thread_name_prefix="fle-readiness") as executor:
+        return list(executor.map(lambda container: wait_for_services(container, timeout), containers))
+
+def create_factorio_instance(
+    docker_client: DockerClient,
+    instance_id: int,
+    image_name: str,
+    scenario_name: str,
+    udp_port: int,
+    rcon_port: int,
+    api_port: int = None,
+    platform: str = "linux/amd64",
+    startup_timeout: float = 120.0,
+    mem_limit: str = "1024m",
+    nano_cpus: Optional[int] = 1_000_000_000,
+    cpuset_cpus: Optional[str] = None,
+    cpuset_mems: Optional[str] = None
+) -> Container:
+    """Create a single Factorio instance container with both Factorio server and API.
+
+    By default the container gets 1 CPU of time on any core; pass `cpuset_cpus` (and
+    `cpuset_mems` on NUMA hosts) to pin it instead, see placement.py. Returns once the
+    container reports healthy, exits, or `startup_timeout` passes.
+    """
+    container_name = f'{image_name}-{instance_id}'
+    
+    # Calculate API port if not provided
+    if api_port is None:
+        api_port = 5000 + (instance_id - 1)
+    
+    # Use environment variables to configure the services
+    environment = {
+        "SCENARIO_NAME": scenario_name,
+        "FACTORIO_PORT": "34197",  # Internal port (always 34197 inside container)
+        "RCON_PORT": "27015",      # Internal port (always 27015 inside container) 
+        "RCON_PASSWORD": "factorio",
+        "API_PORT": "5000"         # Internal port (always 5000 inside container)
+    }
+    
+    ports = {
+        "34197/udp": udp_port,     # Map internal 34197 to external udp_port
+        "27015/tcp": rcon_port,    # Map internal 27015 to external rcon_port
+        "5000/tcp": api_port       # Map internal 5000 to external api_port
+    }
+    
+    since = int(time.time()) - 1
+    container = docker_client.containers.run(
+        image=image_name,
+        detach=True,
+        ports=ports,
+        environment=environment,
+        name=container_name,
+        labels={"group": "FLE"},
+        user="factorio",
+        mem_limit=mem_limit,
+        nano_cpus=nano_cpus,
+        cpuset_cpus=cpuset_cpus,
+        cpuset_mems=cpuset_mems,
+        restart_policy={"Name": "unless-stopped"},
+        platform=platform,
+        healthcheck=HEALTHCHECK,
+    )
+
+    print(f"Created Factorio+API instance: {container.name} (ID: {container.short_id})")
+    print(f"  - Factorio: localhost:{udp_port} (UDP)")
+    print(f"  - RCON: localhost:{rcon_port} (TCP)")
+    print(f"  - API: http://localhost:{api_port}")
+    if cpuset_cpus:
+        print(f"  - Pinned to CPU(s) {cpuset_cpus}, {mem_limit}")
+    
+    status = wait_for_container_ready(docker_client, container, since, startup_timeout)
+    print(f"Container {container.name} status: {status}")
+    
+    if status == "exited":
+        print(f"⚠️  Container {container.name} exited immediately. Checking logs...")
+        logs = container.logs().decode('utf-8')
+        print(f"Container logs:\n{logs}")
+        print("This usually indicates a configuration or startup error.")
+    elif status != "healthy":
+        print(f"⚠️  Container {container.name} did not report healthy within {startup_timeout:.0f}s")
+    
+    return container
+
+def wait_for_container_ready(docker_client: DockerClient, container: Container, since: int, timeout: float) -> str:
+    """Block on the Docker events stream until the container is healthy or has died.
+
+    Returns "healthy", "exited", or the container status from a final reload if neither
+    event arrives within `timeout`. `since` replays events emitted before we subscribed.
+    """
+    events = docker_client.events(
+        since=since,
+        until=int(time.time() + timeout),
+        filters={"container": container.id},
+        decode=True
+    )
+
+    try:
+        for event in events:
+            action = event.get("Action") or event.get("status", "")
+            if action == "health_status: healthy":
+                return "healthy"
+            if action == "die":
+                container.reload()
+                return container.status
+    finally:
+        events.close()
+
+    container.reload()
+    return container.status
+
+def create_factorio_instances(
+    docker_client: DockerClient,
+    image_name: str,
+    scenario_name: str,
+    instance_count: int = 3,
+    first_udp_port: int = 34197,
+    first_rcon_port: int = 27015,
+    first_api_port: int = 5000,
+    platform: str = "linux/amd64",
+    max_concurrency: int = 4,
+    startup_timeout: float = 120.0,
+    layout: Optional[Layout] = None
+) -> List[Container]:
+    """Create multiple Factorio instance containers with both Factorio server and API.
+
+    Up to `max_concurrency` containers are started and awaited at once. Containers are
+    returned in instance order and the startup latency of each one is reported. With a
+    `layout` from plan_layout each container is pinned and sized as it says.
+    """
+    if max_concurrency <= 0:
+        raise ValueError("max_concurrency must be positive")
+    if layout and instance_count > len(layout.placements):
+        raise ValueError(f"layout places {len(layout.placements)} instance(s), {instance_count} requested")
+
+    def provision(i: int) -> Tuple[Container, float]:
+        start = time.perf_counter()
+        container = create_factorio_instance(
+            docker_client=docker_client,
+            instance_id=i + 1,
+            image_name=image_name,
+            scenario_name=scenario_name,
+            udp_port=first_udp_port + i,
+            rcon_port=first_rcon_port + i,
+            api_port=first_api_port + i,
+            platform=platform,
+            startup_timeout=startup_timeout,
+            **placement_kwargs(layout.for_instance(i + 1) if layout else None)
+        )
+        return container, time.perf_counter() - start
+
+    provisioning_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_concurrency, instance_count) or 1) as executor:
+        provisioned = list(executor.map(provision, range(instance_count)))
+
+    containers: List[Container] = [container for container, _ in provisioned]
+    latencies: Dict[str, float] = {container.name: latency for container, latency in provisioned}
+
+    print(f"Provisioned {len(containers)} instance(s) in {time.perf_counter() - provisioning_start:.2f}s:")
+    for name, latency in latencies.items():
+        print(f"  - {name}: ready after {latency:.2f}s")
+    
+    return containers
+
+def shutdown_factorio_instances(containers: List[Container]) -> None:
+    """Shutdown and remove multiple Factorio instance containers."""
+    for container in containers:
+        try:
+            container.remove(force=True)
+            print(f"Removed container {container.name} (ID: {container.short_id})")
+        except Exception as e:
+            print(f"Failed to remove container {container.name} (ID: {container.short_id}): {e}")
@@ -0,0 +1,273 @@
+import itertools
+import time
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Dict, Any, Optional
+from docker.models.containers import Container
+
+from communication_handler import CommunicationHandler, DataType
+from container_pool import ContainerPool
+from factorio_instances import wait_for_services
+from instrumentation import Recorder, episode
+from pipeline import run_pipelined
+
+# Queues actions on the handler; in pipelined mode it may also return a lazy iterable of
+# further actions (e.g. StepParser.iter_actions()) to stream after the queued ones.
+QueueActions = Callable[[CommunicationHandler], Optional[Iterable[Any]]]
+
+_episode_ids = itertools.count(1)
+
+@dataclass
+class EpisodeResult:
+    """Outcome of one reset → send → execute → fetch episode on a single container."""
+    container_name: str
+    api_url: Optional[str] = None
+    final_state: Optional[Dict[str, Any]] = None
+    timings: Dict[str, float] = field(default_factory=dict)
+    stage: str = "queued"
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    # Game ticks per wall-clock second, measured when the episode runs until idle.
+    ticks_per_second: Optional[float] = None
+    # Tags this episode's calls in an instrumentation trace.
+    episode: str = field(default_factory=lambda: f"episode-{next(_episode_ids)}")
+
+    @property
+    def succeeded(self) -> bool:
+        return self.error is None and self.stage == "done"
+
+    @property
+    def total_time(self) -> float:
+        return sum(self.timings.values())
+
+def timed_stage(result: EpisodeResult, stage: str, call: Callable[[], Any]) -> Any:
+    """Run `call` as episode stage `stage`, recording it in `result.stage` and its duration."""
+    result.stage = stage
+    start = time.perf_counter()
+    value = call()
+    result.timings[stage] = time.perf_counter() - start
+    return value
+
+def _run_actions(
+    result: EpisodeResult,
+    communication_handler: CommunicationHandler,
+    queue_actions: QueueActions,
+    pipelined: bool,
+    wait_for_completion: bool,
+    until_idle: bool = False
+) -> None:
+    more_actions = timed_stage(result, "queue_actions", lambda: queue_actions(communication_handler))
+
+    if until_idle:
+        timed_stage(result, "send_actions", communication_handler.send_actions)
+        status = timed_stage(result, "run_until_idle", communication_handler.run_until_idle)
+        result.ticks_per_second = status["ticks_per_second"]
+        return
+
+    if pipelined:
+        queued = list(communication_handler.actions)
+        communication_handler.actions.clear()
+        actions = itertools.chain(queued, more_actions or ())
+        timed_stage(result, "pipeline", lambda: run_pipelined(communication_handler, actions))
+    else:
+        timed_stage(result, "send_actions", communication_handler.send_actions)
+        timed_stage(result, "execute_actions", communication_handler.execute_actions)
+
+    if wait_for_completion:
+        timed_stage(result, "wait_for_completion", communication_handler.wait_for_completion)
+
+def run_episode(
+    container: Container,
+    queue_actions: QueueActions,
+    agent_count: int = 1,
+    result: Optional[EpisodeResult] = None,
+    pipelined: bool = False,
+    wait_for_completion: bool = False,
+    recorder: Optional[Recorder] = None,
+    until_idle: bool = False
+) -> EpisodeResult:
+    """Run a full episode on one container, recording the time spent in each stage."""
+    if result is None:
+        result = EpisodeResult(container_name=container.name)
+    result.started_at = time.monotonic()
+
+    with episode(result.episode):
+        try:
+            result.api_url = timed_stage(result, "wait_for_services", lambda: wait_for_services(container))
+
+            with CommunicationHandler(result.api_url, 1, recorder=recorder) as communication_handler:
+                timed_stage(result, "reset", lambda: communication_handler.reset(agent_count=agent_count))
+                _run_actions(result, communication_handler, queue_actions, pipelined, wait_for_completion, until_idle)
+                result.final_state = timed_stage(
+                    result, "get_state", lambda: communication_handler.get_data(DataType.STATE)
+                )
+
+            result.stage = "done"
+        except Exception as e:
+            result.error = f"{type(e).__name__} during {result.stage}: {e}"
+
+    return result
+
+def run_fleet(
+    containers: List[Container],
+    queue_actions: QueueActions,
+    agent_count: int = 1,
+    timeout: float = 300.0,
+    max_workers: Optional[int] = None,
+    pipelined: bool = False,
+    wait_for_completion: bool = False,
+    recorder: Optional[Recorder] = None,
+    until_idle: bool = False
+) -> List[EpisodeResult]:
+    """Run one episode on every container in parallel.
+
+    Each instance gets `timeout` seconds from the moment its episode starts. Instances
+    that exceed it are reported as timed out; their worker thread is abandoned rather
+    than killed, and finishes on its own once the in-flight HTTP call returns.
+    Results are returned in the same order as `containers`. With pipelined=True actions
+    are parsed, sent and executed as overlapping stages (see pipeline.run_pipelined).
+    With wait_for_completion=True the final state is fetched only after every agent's
+    action queue has drained. Handler calls are reported to `recorder` when one is given,
+    tagged with each result's episode. With until_idle=True the actions run as fast as
+    each server allows (see CommunicationHandler.run_until_idle) and the ticks per second
+    every instance reached are reported.
+    """
+    if not containers:
+        raise ValueError("containers cannot be empty")
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+    if until_idle and pipelined:
+        raise ValueError("until_idle cannot be combined with pipelined")
+
+    results = [EpisodeResult(container_name=container.name) for container in containers]
+    executor = ThreadPoolExecutor(max_workers=max_workers or len(containers), thread_name_prefix="fle-episode")
+    fleet_start = time.perf_counter()
+
+    try:
+        pending: Dict[Future, EpisodeResult] = {
+            executor.submit(
+                run_episode, container, queue_actions, agent_count, result, pipelined, wait_for_completion,
+                recorder, until_idle
+            ): result
+            for container, result in zip(containers, results)
+        }
+        _collect(pending, timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    wall_time = time.perf_counter() - fleet_start
+    print_fleet_summary(results, wall_time)
+
+    return results
+
+def run_pooled_episode(
+    pool: ContainerPool,
+    queue_actions: QueueActions,
+    agent_count: int = 1,
+    result: Optional[EpisodeResult] = None,
+    pipelined: bool = False,
+    wait_for_completion: bool = False,
+    until_idle: bool = False
+) -> EpisodeResult:
+    """Run one episode on a leased warm instance; the lease performs the reset."""
+    if result is None:
+        result = EpisodeResult(container_name="unassigned")
+    result.started_at = time.monotonic()
+
+    with episode(result.episode):
+        try:
+            result.stage = "lease"
+            start = time.perf_counter()
+            with pool.lease(agent_count=agent_count) as instance:
+                result.timings["lease"] = time.perf_counter() - start
+                result.container_name = instance.container.name
+                result.api_url = instance.api_url
+                communication_handler = instance.communication_handler
+
+                _run_actions(result, communication_handler, queue_actions, pipelined, wait_for_completion, until_idle)
+                result.final_state = timed_stage(
+                    result, "get_state", lambda: communication_handler.get_data(DataType.STATE)
+                )
+
+            result.stage = "done"
+        except Exception as e:
+            result.error = f"{type(e).__name__} during {result.stage}: {e}"
+
+    return result
+
+def run_pool(
+    pool: ContainerPool,
+    queue_actions: QueueActions,
+    episodes: int,
+    agent_count: int = 1,
+    timeout: float = 300.0,
+    pipelined: bool = False,
+    wait_for_completion: bool = False,
+    until_idle: bool = False
+) -> List[EpisodeResult]:
+    """Run `episodes` episodes on a warm pool, as many at once as the pool has instances.
+
+    The per-episode timeout starts when the episode starts waiting for a lease.
+    """
+    if episodes <= 0:
+        raise ValueError("episodes must be positive")
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+    if until_idle and pipelined:
+        raise ValueError("until_idle cannot be combined with pipelined")
+
+    results = [EpisodeResult(container_name="unassigned") for _ in range(episodes)]
+    executor = ThreadPoolExecutor(max_workers=min(pool.size, episodes), thread_name_prefix="fle-episode")
+    fleet_start = time.perf_counter()
+
+    try:
+        pending: Dict[Future, EpisodeResult] = {
+            executor.submit(
+                run_pooled_episode, pool, queue_actions, agent_count, result, pipelined, wait_for_completion,
+                until_idle
+            ): result
+            for result in results
+        }
+        _collect(pending, timeout)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    wall_time = time.perf_counter() - fleet_start
+    print_fleet_summary(results, wall_time)
+
+    return results
+
+def _collect(pending: Dict[Future, EpisodeResult], timeout: float) -> None:
+    # Wait for every episode, marking those that run longer than `timeout` since their
+    # own start as timed out. Timed-out workers are abandoned, not killed.
+    while pending:
+        now = time.monotonic()
+        deadlines = [r.started_at + timeout for r in pending.values() if r.started_at is not None]
+        wait_time = max(0.0, min(deadlines) - now) if deadlines else 0.05
+
+        done, _ = wait(pending, timeout=wait_time, return_when=FIRST_COMPLETED)
+        for future in done:
+            pending.pop(future)
+
+        now = time.monotonic()
+        for future, result in list(pending.items()):
+            if result.started_at is not None and now - result.started_at >= timeout:
+                result.error = f"Timed out after {timeout:.0f}s during {result.stage}"
+                future.cancel()
+                pending.pop(future)
+
+def print_fleet_summary(results: List[EpisodeResult], wall_time: float) -> None:
+    """Print per-instance outcomes and how parallel the run actually was."""
+    print(f"Fleet finished {len(results)} episode(s) in {wall_time:.2f}s:")
+    for result in results:
+        stages = ", ".join(f"{stage}={duration:.2f}s" for stage, duration in result.timings.items())
+        if result.ticks_per_second is not None:
+            stages += f"; {result.ticks_per_second:.0f} ticks/s"
+        if result.succeeded:
+            print(f"  ✅ {result.container_name}: {result.total_time:.2f}s ({stages})")
+        else:
+            print(f"  ❌ {result.container_name}: {result.error} ({stages})")
+
+    slowest = max((result.total_time for result in results), default=0.0)
+    if slowest > 0:
+        print(f"  Wall time is {wall_time / slowest:.2f}x the slowest instance")
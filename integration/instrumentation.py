@@ -0,0 +1,204 @@
+import json
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, asdict
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+# Upper bounds (seconds) of the call duration histogram buckets; +Inf is implied.
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Episode that calls made from the current thread or asyncio task belong to.
+_episode: ContextVar[Optional[str]] = ContextVar("fle_episode", default=None)
+
+@contextmanager
+def episode(name: str) -> Iterator[None]:
+    """Tag every call recorded inside the block, by any recorder, with episode `name`."""
+    token = _episode.set(name)
+    try:
+        yield
+    finally:
+        _episode.reset(token)
+
+def current_episode() -> Optional[str]:
+    return _episode.get()
+
+@dataclass
+class CallRecord:
+    """Timing and size of one handler call, plus the API's own Server-Timing breakdown."""
+    operation: str
+    agent_id: int
+    api_url: str
+    episode: Optional[str] = None
+    started_at: float = 0.0
+    duration: float = 0.0
+    request_bytes: int = 0
+    response_bytes: int = 0
+    actions: int = 0
+    status: Optional[int] = None
+    error: Optional[str] = None
+    server_timing: Dict[str, float] = field(default_factory=dict)
+
+    def observe_response(self, request_bytes: int, response_bytes: int, status: int, headers) -> None:
+        self.request_bytes = request_bytes
+        self.response_bytes = response_bytes
+        self.status = status
+        self.server_timing = parse_server_timing(headers.get("Server-Timing", ""))
+
+def parse_server_timing(header: str) -> Dict[str, float]:
+    """Parse `rcon;dur=12.5, deserialize;dur=0.8` into seconds per metric name."""
+    timings: Dict[str, float] = {}
+    for metric in header.split(","):
+        name, *parameters = [part.strip() for part in metric.split(";")]
+        for parameter in parameters:
+            key, _, value = parameter.partition("=")
+            if name and key == "dur":
+                try:
+                    timings[name] = timings.get(name, 0.0) + float(value) / 1000.0
+                except ValueError:
+                    pass
+    return timings
+
+class _Histogram:
+    def __init__(self):
+        self.buckets = [0] * (len(DURATION_BUCKETS) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(DURATION_BUCKETS):
+            if value <= bound:
+                self.buckets[index] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+        self.count += 1
+        self.sum += value
+
+class Recorder:
+    """Opt-in, thread-safe collector of per-call latency for the communication handlers.
+
+    Pass one recorder to every handler in a fleet (`CommunicationHandler(..., recorder=r)`).
+    Histograms and counters are cumulative; the trace keeps the last `max_records` calls,
+    each tagged with the enclosing `episode(...)` so concurrent episodes can be told apart.
+    """
+
+    def __init__(self, max_records: int = 100_000):
+        if max_records <= 0:
+            raise ValueError("max_records must be positive")
+
+        self._lock = threading.Lock()
+        self._records: Deque[CallRecord] = deque(maxlen=max_records)
+        self._histograms: Dict[str, _Histogram] = {}
+        self._counters: Dict[Tuple[str, str], float] = {}
+
+    def _count(self, name: str, operation: str, amount: float) -> None:
+        key = (name, operation)
+        self._counters[key] = self._counters.get(key, 0.0) + amount
+
+    def add(self, record: CallRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            self._histograms.setdefault(record.operation, _Histogram()).observe(record.duration)
+            self._count("errors", record.operation, 1 if record.error else 0)
+            self._count("request_bytes", record.operation, record.request_bytes)
+            self._count("response_bytes", record.operation, record.response_bytes)
+            self._count("actions", record.operation, record.actions)
+            for phase, seconds in record.server_timing.items():
+                self._count(f"server:{phase}", record.operation, seconds)
+
+    @contextmanager
+    def measure(self, operation: str, agent_id: int, api_url: str, actions: int = 0) -> Iterator[CallRecord]:
+        """Time the enclosed call; exceptions are recorded on the call and re-raised."""
+        record = CallRecord(operation, agent_id, api_url, current_episode(), time.time(), actions=actions)
+        start = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record.error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record.duration = time.perf_counter() - start
+            self.add(record)
+
+    def records(self, episode: Optional[str] = None) -> List[CallRecord]:
+        with self._lock:
+            return [record for record in self._records if episode is None or record.episode == episode]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Per-operation call count, error count, total/p50/p95/max seconds and bytes moved."""
+        by_operation: Dict[str, List[CallRecord]] = {}
+        for record in self.records():
+            by_operation.setdefault(record.operation, []).append(record)
+
+        summary = {}
+        for operation, records in sorted(by_operation.items()):
+            durations = sorted(record.duration for record in records)
+            summary[operation] = {
+                "calls": len(records),
+                "errors": sum(1 for record in records if record.error),
+                "total": sum(durations),
+                "p50": durations[(len(durations) - 1) // 2],
+                "p95": durations[min(len(durations) - 1, int(len(durations) * 0.95))],
+                "max": durations[-1],
+                "request_bytes": sum(record.request_bytes for record in records),
+                "response_bytes": sum(record.response_bytes for record in records),
+                "actions": sum(record.actions for record in records),
+            }
+        return summary
+
+    def print_summary(self) -> None:
+        print("Handler calls:")
+        for operation, stats in self.summary().items():
+            print(
+                f"  {operation:<22} {stats['calls']:6d} calls  {stats['errors']:3d} errors  "
+                f"p50={stats['p50'] * 1000:8.1f}ms  p95={stats['p95'] * 1000:8.1f}ms  "
+                f"total={stats['total']:7.2f}s  sent={stats['request_bytes'] / 1024:9.1f}kB  "
+                f"received={stats['response_bytes'] / 1024:9.1f}kB"
+            )
+
+    def prometheus_text(self, prefix: str = "fle_client") -> str:
+        """Render histograms and counters in the Prometheus text exposition format."""
+        with self._lock:
+            histograms = {operation: (list(h.buckets), h.count, h.sum) for operation, h in self._histograms.items()}
+            counters = dict(self._counters)
+
+        lines = [
+            f"# HELP {prefix}_call_duration_seconds Duration of communication handler calls.",
+            f"# TYPE {prefix}_call_duration_seconds histogram",
+        ]
+        for operation, (buckets, count, total) in sorted(histograms.items()):
+            cumulative = 0
+            for bound, bucket in zip(DURATION_BUCKETS + (float("inf"),), buckets):
+                cumulative += bucket
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                lines.append(f'{prefix}_call_duration_seconds_bucket{{operation="{operation}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_call_duration_seconds_sum{{operation="{operation}"}} {total}')
+            lines.append(f'{prefix}_call_duration_seconds_count{{operation="{operation}"}} {count}')
+
+        # Server-Timing phases share one metric, labelled by phase.
+        samples: Dict[str, List[str]] = {}
+        for (name, operation), value in sorted(counters.items()):
+            labels = f'operation="{operation}"'
+            if name.startswith("server:"):
+                metric = f"{prefix}_server_timing_seconds_total"
+                labels += f',phase="{name[len("server:"):]}"'
+            else:
+                metric = f"{prefix}_{name}_total"
+            samples.setdefault(metric, []).append(f"{metric}{{{labels}}} {value:g}")
+
+        for metric, metric_samples in samples.items():
+            lines.append(f"# TYPE {metric} counter")
+            lines.extend(metric_samples)
+
+        return "\n".join(lines) + "\n"
+
+    def dump_trace(self, path: str, episode: Optional[str] = None) -> int:
+        """Write recorded calls as JSON lines, optionally for one episode; returns the count."""
+        records = self.records(episode)
+        with open(path, "w", encoding="utf-8") as trace_file:
+            for record in records:
+                trace_file.write(json.dumps(asdict(record)) + "\n")
+        return len(records)
@@ -1,156 +1,21 @@
 import os
 import subprocess
-import json
-import time
-from typing import List, Dict, Any
-import docker
-from docker.client import DockerClient
-from docker.models.containers import Container
-import requests
+from functools import partial
+from typing import Iterator, Optional
 
+from action_builder import Action, ActionBuilder
+from checkpoints import run_from_checkpoint
 from communication_handler import CommunicationHandler, DataType
 from models.defines import InventoryType
 from models.position import Position
 from step_parser import StepParser
 from docker_manager import ensure_docker_running
-
-def wait_for_services(container: Container) -> str:
-    """Wait for API service to be available for a container."""
-    container.reload()  # ensure information is fresh
-    ports_dict = container.attrs["NetworkSettings"]["Ports"]
-    
-    # Get API port mapping
-    api_mapping = ports_dict.get("5000/tcp")
-    if not api_mapping:
-        raise ValueError(f"Container {container.name} has no 5000/tcp port mapping!")
-    
-    # Extract host and port
-    host_ip = api_mapping[0]["HostIp"]
-    if host_ip == "0.0.0.0":
-        host_ip = "127.0.0.1"
-    
-    api_port = int(api_mapping[0]["HostPort"])
-    api_url = f"http://{host_ip}:{api_port}"
-    
-    print(f"Waiting for API service on {container.name}:")
-    print(f"  - API: {api_url}")
-    
-    # Wait for API
-    communication_handler = CommunicationHandler(api_url, 1)
-    if communication_handler.wait_for_api_ready(max_attempts=30, delay=1.0):
-        print(f"✅ API is ready")
-    else:
-        raise RuntimeError(f"❌ API timeout for {container.name}")
-    
-    return api_url
-
-def create_factorio_instance(
-    docker_client: DockerClient,
-    instance_id: int,
-    image_name: str,
-    scenario_name: str,
-    udp_port: int,
-    rcon_port: int,
-    api_port: int = None,
-    platform: str = "linux/amd64"
-) -> Container:
-    """Create a single Factorio instance container with both Factorio server and API."""
-    container_name = f'{image_name}-{instance_id}'
-    
-    # Calculate API port if not provided
-    if api_port is None:
-        api_port = 5000 + (instance_id - 1)
-    
-    # Use environment variables to configure the services
-    environment = {
-        "SCENARIO_NAME": scenario_name,
-        "FACTORIO_PORT": "34197",  # Internal port (always 34197 inside container)
-        "RCON_PORT": "27015",      # Internal port (always 27015 inside container) 
-        "RCON_PASSWORD": "factorio",
-        "API_PORT": "5000"         # Internal port (always 5000 inside container)
-    }
-    
-    ports = {
-        "34197/udp": udp_port,     # Map internal 34197 to external udp_port
-        "27015/tcp": rcon_port,    # Map internal 27015 to external rcon_port
-        "5000/tcp": api_port       # Map internal 5000 to external api_port
-    }
-    
-    container = docker_client.containers.run(
-        image=image_name,
-        detach=True,
-        ports=ports,
-        environment=environment,
-        name=container_name,
-        labels={"group": "FLE"},
-        user="factorio",
-        mem_limit="1024m",
-        nano_cpus=1_000_000_000,  # 1 CPU
-        restart_policy={"Name": "unless-stopped"},
-        platform=platform,
-    )
-
-    print(f"Created Factorio+API instance: {container.name} (ID: {container.short_id})")
-    print(f"  - Factorio: localhost:{udp_port} (UDP)")
-    print(f"  - RCON: localhost:{rcon_port} (TCP)")
-    print(f"  - API: http://localhost:{api_port}")
-    
-    # Give the container a moment to start and check its status
-    time.sleep(2)
-    container.reload()
-    
-    status = container.status
-    print(f"Container {container.name} status: {status}")
-    
-    if status == "exited":
-        print(f"⚠️  Container {container.name} exited immediately. Checking logs...")
-        logs = container.logs().decode('utf-8')
-        print(f"Container logs:\n{logs}")
-        print("This usually indicates a configuration or startup error.")
-    
-    return container
-
-def create_factorio_instances(
-    docker_client: DockerClient,
-    image_name: str,
-    scenario_name: str,
-    instance_count: int = 3,
-    first_udp_port: int = 34197,
-    first_rcon_port: int = 27015,
-    first_api_port: int = 5000,
-    platform: str = "linux/amd64"
-) -> List[Container]:
-    """Create multiple Factorio instance containers with both Factorio server and API."""
-    containers: List[Container] = []
-
-    for i in range(instance_count):
-        instance_id = i + 1
-        udp_port = first_udp_port + i
-        rcon_port = first_rcon_port + i
-        api_port = first_api_port + i
-
-        container = create_factorio_instance(
-            docker_client=docker_client,
-            instance_id=instance_id,
-            image_name=image_name,
-            scenario_name=scenario_name,
-            udp_port=udp_port,
-            rcon_port=rcon_port,
-            api_port=api_port,
-            platform=platform
-        )
-        containers.append(container)
-    
-    return containers
-
-def shutdown_factorio_instances(containers: List[Container]) -> None:
-    """Shutdown and remove multiple Factorio instance containers."""
-    for container in containers:
-        try:
-            container.remove(force=True)
-            print(f"Removed container {container.name} (ID: {container.short_id})")
-        except Exception as e:
-            print(f"Failed to remove container {container.name} (ID: {container.short_id}): {e}")
+from container_pool import ContainerPool
+from meta_cache import MetaDataCache
+from fleet_runner import run_pool
+from orchestrator import ResourceBudget, plan_from_config, run_plans
+from placement import detect_host_topology, memory_limit_mb, plan_layout, print_layout
+from instrumentation import Recorder
 
 def run_image_check(image_name: str) -> None:
     """Run the image check script to ensure the Docker image exists."""
@@ -229,7 +94,7 @@ def run_image_check(image_name: str) -> None:
     else:
         exit(1)
 
-def setup_game_items(communication_handler: CommunicationHandler) -> None:
+def setup_game_items(communication_handler: ActionBuilder) -> None:
     """Setup initial game items and research."""
     # Research
     communication_handler.research("steel-axe")
@@ -257,86 +122,149 @@ def setup_game_items(communication_handler: CommunicationHandler) -> None:
         ("offshore-pump", 2),
     ]
     
-    for item_name, quantity in items_to_take:
-        communication_handler.take(chest_position, item_name, quantity, InventoryType.CHEST)
+    communication_handler.take_many(chest_position, items_to_take, InventoryType.CHEST)
     
     # Craft items
     communication_handler.craft("boiler", 10)
     communication_handler.cancel_craft("boiler", 1)
 
+def queue_demo_actions(
+    communication_handler: CommunicationHandler,
+    meta_cache: Optional[MetaDataCache] = None,
+    pipelined: bool = False,
+    checkpoint_steps: Optional[int] = None
+) -> Optional[Iterator[Action]]:
+    """Fetch the initial game data and queue the demo setup plus the parsed TAS steps.
+
+    When pipelined, the TAS steps are returned as a lazy iterator instead of being queued,
+    so they can be parsed while earlier actions are already executing. With
+    checkpoint_steps, the setup and the first checkpoint_steps steps are restored from a
+    checkpoint (saved on the first run) and only the remaining steps are queued.
+    """
+    if meta_cache:
+        meta_data = meta_cache.get(communication_handler)
+    else:
+        meta_data = communication_handler.get_data(DataType.META)
+    map_data = communication_handler.get_data(DataType.MAP)
+    state_data = communication_handler.get_data(DataType.STATE)
+
+    # Parse and queue additional steps
+    steps_path = os.path.join(os.path.dirname(__file__), "steps_lab.lua")
+    step_parser = StepParser(steps_path, communication_handler)
+
+    if checkpoint_steps is None:
+        setup_game_items(communication_handler)
+        if pipelined:
+            return step_parser.iter_actions()
+        step_parser.parse()
+        return None
+
+    steps = step_parser.load()
+
+    def queue_prefix(builder: ActionBuilder) -> None:
+        setup_game_items(builder)
+        StepParser(steps_path, builder).replay(steps[:checkpoint_steps])
+
+    name, restored = run_from_checkpoint(communication_handler, queue_prefix, label="steps-lab")
+    print(f"{'♻️  Restored' if restored else '💾 Saved'} checkpoint {name} after {checkpoint_steps} steps")
+
+    remaining = steps[checkpoint_steps:]
+    if pipelined:
+        return step_parser.iter_actions(remaining)
+    step_parser.replay(remaining)
+
 if __name__ == "__main__":
     IMAGE = "factorio_0.2.0"
     SCENARIO_NAME = "FLE_Lab"
     INSTANCE_COUNT = 1
+    EPISODES = 1
+    MAX_EPISODES_PER_CONTAINER = 50
+    EPISODE_TIMEOUT = 300
+    KEEP_WARM = True  # Leave containers running so the next run only pays for a reset
+    PIPELINED = False  # Start executing while later steps are still being parsed and sent
+    WAIT_FOR_COMPLETION = True  # Fetch the final state only once every action has finished
+    RUN_UNTIL_IDLE = False  # Run the actions as fast as the server allows and report ticks/s (not with PIPELINED)
+    CHECKPOINT_STEPS = None  # Replay this many TAS steps once per container, then restore them from a checkpoint
+    USE_CONFIG = False  # Size the fleet from config.json and run every team on it (see orchestrator.py)
+    PIN_CPUS = False  # Give each container a dedicated core and memory sized from the map (see placement.py)
+    INSTRUMENT = False  # Time every API call and write a per-episode trace to TRACE_PATH
+    TRACE_PATH = os.path.join(os.path.dirname(__file__), "episode_trace.jsonl")
 
     # Ensure Docker Desktop is running and get client
     docker_client = ensure_docker_running(timeout=60)
 
     run_image_check(IMAGE)
 
-    containers = create_factorio_instances(
+    recorder = Recorder() if INSTRUMENT else None
+
+    memory_mb = memory_limit_mb(surfaces=2 + (1 if CHECKPOINT_STEPS is not None else 0)) if PIN_CPUS else ResourceBudget.memory_mb
+    plans = plan_from_config(budget=ResourceBudget(memory_mb=memory_mb)) if USE_CONFIG else None
+    if plans:
+        INSTANCE_COUNT = len(plans)
+
+    layout = None
+    if PIN_CPUS:
+        layout = plan_layout(detect_host_topology(docker_client), INSTANCE_COUNT, memory_mb)
+        print_layout(layout)
+        if plans and len(layout.placements) < len(plans):
+            raise RuntimeError(f"The host sustains {len(layout.placements)} container(s), config.json needs {len(plans)}")
+        INSTANCE_COUNT = len(layout.placements)
+
+    pool = ContainerPool(
         docker_client = docker_client,
         image_name = IMAGE,
         scenario_name = SCENARIO_NAME,
-        instance_count= INSTANCE_COUNT, 
+        size = INSTANCE_COUNT,
+        max_episodes = MAX_EPISODES_PER_CONTAINER,
         first_udp_port = 34197,
         first_rcon_port = 27015,
         first_api_port = 5000,
+        recorder = recorder,
+        layout = layout,
     )
 
-    # Wait for API service to be ready
-    api_url = wait_for_services(container=containers[0])
-
     try:
-        # Setup API-based communication handler for agent 1
-        communication_handler = CommunicationHandler(api_url, 1)
-
-        # Initialize the game
-        print("Resetting game state via API...")
-        reset_response = communication_handler.reset(agent_count=1)
-        print(f"Reset response: {reset_response}")
-
-        # Get initial game data via API
-        print("Fetching initial game data via API...")
-        meta_data = communication_handler.get_data(DataType.META)
-        map_data = communication_handler.get_data(DataType.MAP)
-        state_data = communication_handler.get_data(DataType.STATE)
+        pool.start()
 
-        setup_game_items(communication_handler)
-        # Parse and queue additional steps
-        steps_path = os.path.join(os.path.dirname(__file__), "steps_lab.lua")
-        step_parser = StepParser(steps_path, communication_handler)
-        step_parser.parse()
-        
-        # Send parsed actions via API
-        print("Sending parsed actions via API...")
-        parsed_actions_response = communication_handler.send_actions()
-        print(f"Parsed actions sent: {parsed_actions_response}")
+        # Lease warm instances and run reset → send → execute → fetch on each in parallel
+        if plans:
+            results = run_plans(pool, plans, timeout=EPISODE_TIMEOUT, wait_for_completion=WAIT_FOR_COMPLETION)
+        else:
+            results = run_pool(
+                pool,
+                queue_actions=partial(
+                    queue_demo_actions,
+                    meta_cache=MetaDataCache(IMAGE),
+                    pipelined=PIPELINED,
+                    checkpoint_steps=CHECKPOINT_STEPS,
+                ),
+                episodes=EPISODES,
+                agent_count=1,
+                timeout=EPISODE_TIMEOUT,
+                pipelined=PIPELINED,
+                wait_for_completion=WAIT_FOR_COMPLETION,
+                until_idle=RUN_UNTIL_IDLE,
+            )
+        final_states = {result.container_name: result.final_state for result in results}
 
-        # Execute all queued actions
-        print("Executing all queued actions...")
-        execute_response = communication_handler.execute_actions()
-        print(f"Actions executed: {execute_response}")
+        if recorder:
+            recorder.print_summary()
+            count = recorder.dump_trace(TRACE_PATH)
+            print(f"Wrote {count} call(s) to {TRACE_PATH}")
 
-        # Get final state data via API
-        print("Fetching final game state via API...")
-        final_state_data = communication_handler.get_data(DataType.STATE)
+        failed = [result for result in results if not result.succeeded]
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(results)} episode(s) failed")
 
         print("Game session completed successfully.") # Put a breakpoint here to inspect the data
         
-    except requests.RequestException as e:
-        print(f"❌ Error during API communication: {e}")
-        shutdown_factorio_instances(containers)
-        docker_client.images.remove(IMAGE, force=True)
-        exit(1)
     except Exception as e:
         print(f"❌ Error during execution: {e}")
-        shutdown_factorio_instances(containers)
-        docker_client.images.remove(IMAGE, force=True)
+        pool.close(remove=not KEEP_WARM)
         exit(1)
 
-    shutdown_factorio_instances(containers)
-    print("All Factorio instances have been shut down.")
-
-    docker_client.images.remove(IMAGE, force=True)
-    print(f"Image {IMAGE} has been removed.")
\ No newline at end of file
+    pool.close(remove=not KEEP_WARM)
+    if KEEP_WARM:
+        print("Factorio instances left running for the next run.")
+    else:
+        print("All Factorio instances have been shut down.")
\ No newline at end of file
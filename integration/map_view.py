@@ -0,0 +1,294 @@
+from typing import List, Dict, Any, Optional, Tuple, Union
+
+import numpy as np
+
+UNKNOWN = 0
+LAND = 1
+WATER = 2
+
+def _tile_positions(tiles: Union[List[Dict[str, Any]], np.ndarray]) -> np.ndarray:
+    # [{"position": {"x": .., "y": ..}}, ...] -> (N, 2) int32 array of tile coordinates
+    if isinstance(tiles, np.ndarray):
+        return tiles.astype(np.int32, copy=False).reshape(-1, 2)
+
+    coordinates = np.fromiter(
+        (value for tile in tiles for value in (tile["position"]["x"], tile["position"]["y"])),
+        dtype=np.float64,
+        count=2 * len(tiles)
+    )
+    return np.floor(coordinates).astype(np.int32).reshape(-1, 2)
+
+def _as_points(points) -> np.ndarray:
+    points = np.asarray(points, dtype=np.float64)
+    if points.ndim == 1:
+        points = points.reshape(1, -1)
+    if points.ndim != 2 or points.shape[1] != 2:
+        raise ValueError("points must be an (x, y) pair or an array of shape (N, 2)")
+    return points
+
+class GridIndex:
+    """Grid-hash spatial index over 2D points.
+
+    Points are bucketed into square cells of `cell_size` tiles and stored sorted by
+    cell, so the points of any cell are one contiguous slice.
+    """
+
+    def __init__(self, points: np.ndarray, cell_size: int = 16):
+        if cell_size <= 0:
+            raise ValueError("cell_size must be positive")
+
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        self.cell_size = cell_size
+
+        if len(points) == 0:
+            self.points = points
+            self.order = np.zeros(0, dtype=np.intp)
+            self.cell_origin = np.zeros(2, dtype=np.int64)
+            self.cell_shape = (0, 0)
+            self.starts = np.zeros(1, dtype=np.intp)
+            return
+
+        cells = np.floor(points / cell_size).astype(np.int64)
+        self.cell_origin = cells.min(axis=0)
+        width, height = cells.max(axis=0) - self.cell_origin + 1
+        self.cell_shape = (int(width), int(height))
+
+        cell_ids = (cells[:, 1] - self.cell_origin[1]) * width + (cells[:, 0] - self.cell_origin[0])
+        self.order = np.argsort(cell_ids, kind="stable")
+        self.points = points[self.order]
+        self.starts = np.searchsorted(cell_ids[self.order], np.arange(width * height + 1))
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _cell_range(self, low: np.ndarray, high: np.ndarray) -> Tuple[int, int, int, int]:
+        # Inclusive cell bounds for the tile range [low, high], clipped to the index.
+        width, height = self.cell_shape
+        x0, y0 = np.floor(low / self.cell_size).astype(np.int64) - self.cell_origin
+        x1, y1 = np.floor(high / self.cell_size).astype(np.int64) - self.cell_origin
+        return max(int(x0), 0), max(int(y0), 0), min(int(x1), width - 1), min(int(y1), height - 1)
+
+    def _candidates(self, x0: int, y0: int, x1: int, y1: int) -> np.ndarray:
+        # Sorted-order indices of all points in the inclusive cell range.
+        if x0 > x1 or y0 > y1:
+            return np.zeros(0, dtype=np.intp)
+
+        width = self.cell_shape[0]
+        rows = np.arange(y0, y1 + 1) * width
+        starts = self.starts[rows + x0]
+        ends = self.starts[rows + x1 + 1]
+        return np.concatenate([np.arange(start, end) for start, end in zip(starts, ends)])
+
+    def query_box(self, left_top, right_bottom) -> np.ndarray:
+        """Indices (into the original points) of points inside the inclusive box."""
+        low = np.asarray(left_top, dtype=np.float64)
+        high = np.asarray(right_bottom, dtype=np.float64)
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        candidates = self._candidates(*self._cell_range(low, high))
+        inside = np.all((self.points[candidates] >= low) & (self.points[candidates] <= high), axis=1)
+        return self.order[candidates[inside]]
+
+    def query_radius(self, center, radius: float) -> np.ndarray:
+        """Indices (into the original points) of points within `radius` of `center`."""
+        if radius < 0:
+            raise ValueError("radius cannot be negative")
+        center = np.asarray(center, dtype=np.float64)
+        if len(self) == 0:
+            return np.zeros(0, dtype=np.intp)
+
+        candidates = self._candidates(*self._cell_range(center - radius, center + radius))
+        distances = np.sum((self.points[candidates] - center) ** 2, axis=1)
+        return self.order[candidates[distances <= radius * radius]]
+
+    def nearest(self, points) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest indexed point for each query point.
+
+        Returns (indices into the original points, euclidean distances). Each query
+        searches rings of cells outwards from its own cell and stops once no unvisited
+        ring can hold a closer point.
+        """
+        points = _as_points(points)
+        if len(self) == 0:
+            raise ValueError("cannot query an empty index")
+
+        indices = np.empty(len(points), dtype=np.intp)
+        distances = np.empty(len(points), dtype=np.float64)
+        width, height = self.cell_shape
+
+        for query_index, point in enumerate(points):
+            cx, cy = np.floor(point / self.cell_size).astype(np.int64) - self.cell_origin
+            # Rings before the first one that overlaps the index are empty
+            ring = max(int(-cx), int(cx - width + 1), int(-cy), int(cy - height + 1), 0)
+            best_index, best_distance = -1, np.inf
+
+            while True:
+                x0, y0, x1, y1 = cx - ring, cy - ring, cx + ring, cy + ring
+                parts = []
+                if ring == 0:
+                    parts.append((x0, y0, x1, y1))
+                else:
+                    parts.append((x0, y0, x1, y0))                  # top row
+                    parts.append((x0, y1, x1, y1))                  # bottom row
+                    parts.append((x0, y0 + 1, x0, y1 - 1))          # left column
+                    parts.append((x1, y0 + 1, x1, y1 - 1))          # right column
+
+                for px0, py0, px1, py1 in parts:
+                    candidates = self._candidates(
+                        max(int(px0), 0), max(int(py0), 0), min(int(px1), width - 1), min(int(py1), height - 1)
+                    )
+                    if len(candidates) == 0:
+                        continue
+                    squared = np.sum((self.points[candidates] - point) ** 2, axis=1)
+                    closest = int(np.argmin(squared))
+                    if squared[closest] < best_distance:
+                        best_index, best_distance = int(candidates[closest]), float(squared[closest])
+
+                # Anything in ring + 1 or beyond is at least `ring` whole cells away
+                if best_index >= 0 and np.sqrt(best_distance) <= ring * self.cell_size:
+                    break
+                ring += 1
+
+            indices[query_index] = self.order[best_index]
+            distances[query_index] = np.sqrt(best_distance)
+
+        return indices, distances
+
+class MapView:
+    """Array-backed view of get_data(DataType.MAP) for spatial queries.
+
+    Tiles are kept as (N, 2) int32 coordinate arrays and as a dense occupancy grid
+    (UNKNOWN, LAND or WATER per tile) covering the fetched area. Tile coordinates are
+    the tile's top-left corner, as Factorio reports them; distances are measured to
+    tile centres.
+    """
+
+    def __init__(
+        self,
+        water_tiles: np.ndarray,
+        land_tiles: np.ndarray,
+        offshore_pump_locations: Optional[np.ndarray] = None,
+        cell_size: int = 16
+    ):
+        self.water_tiles = np.asarray(water_tiles, dtype=np.int32).reshape(-1, 2)
+        self.land_tiles = np.asarray(land_tiles, dtype=np.int32).reshape(-1, 2)
+        if offshore_pump_locations is None:
+            offshore_pump_locations = np.zeros((0, 2), dtype=np.int32)
+        self.offshore_pump_locations = np.asarray(offshore_pump_locations, dtype=np.int32).reshape(-1, 2)
+        self.cell_size = cell_size
+
+        all_tiles = np.concatenate([self.water_tiles, self.land_tiles])
+        if len(all_tiles):
+            self.origin = all_tiles.min(axis=0)
+            width, height = all_tiles.max(axis=0) - self.origin + 1
+        else:
+            self.origin = np.zeros(2, dtype=np.int32)
+            width, height = 0, 0
+
+        # grid[y, x] for tile (origin.x + x, origin.y + y)
+        self.grid = np.full((int(height), int(width)), UNKNOWN, dtype=np.uint8)
+        self.grid[self.land_tiles[:, 1] - self.origin[1], self.land_tiles[:, 0] - self.origin[0]] = LAND
+        self.grid[self.water_tiles[:, 1] - self.origin[1], self.water_tiles[:, 0] - self.origin[0]] = WATER
+
+        # Summed-area table of land tiles, so any rectangle's land count is four lookups
+        self._land_sums = np.zeros((int(height) + 1, int(width) + 1), dtype=np.int32)
+        self._land_sums[1:, 1:] = np.cumsum(np.cumsum(self.grid == LAND, axis=0), axis=1)
+
+        self._tiles = {
+            "water": self.water_tiles,
+            "land": self.land_tiles,
+            "offshore_pump": self.offshore_pump_locations
+        }
+        self._indexes: Dict[str, GridIndex] = {}
+
+    @classmethod
+    def from_map_data(cls, map_data: Dict[str, Any], cell_size: int = 16) -> "MapView":
+        """Build a view from get_data(DataType.MAP), JSON or packed=True."""
+        tiles = map_data.get("tiles", {})
+        return cls(
+            _tile_positions(tiles.get("water_tiles", [])),
+            _tile_positions(tiles.get("land_tiles", [])),
+            _tile_positions(map_data.get("offshore_pump_locations", [])),
+            cell_size=cell_size
+        )
+
+    def _index(self, kind: str) -> GridIndex:
+        # Built on first use; tile centres are indexed so distances are centre to centre.
+        if kind not in self._tiles:
+            raise ValueError(f"Unknown tile kind: {kind}")
+        if kind not in self._indexes:
+            self._indexes[kind] = GridIndex(self._tiles[kind] + 0.5, self.cell_size)
+        return self._indexes[kind]
+
+    def tile_at(self, xs, ys) -> np.ndarray:
+        """Occupancy code for the tiles containing each (x, y); UNKNOWN outside the view."""
+        columns = np.floor(np.asarray(xs, dtype=np.float64)).astype(np.int64) - self.origin[0]
+        rows = np.floor(np.asarray(ys, dtype=np.float64)).astype(np.int64) - self.origin[1]
+        inside = (columns >= 0) & (rows >= 0) & (columns < self.grid.shape[1]) & (rows < self.grid.shape[0])
+
+        codes = np.full(np.shape(columns), UNKNOWN, dtype=np.uint8)
+        codes[inside] = self.grid[rows[inside], columns[inside]]
+        return codes
+
+    def is_land(self, xs, ys) -> np.ndarray:
+        return self.tile_at(xs, ys) == LAND
+
+    def is_water(self, xs, ys) -> np.ndarray:
+        return self.tile_at(xs, ys) == WATER
+
+    def footprints_are_land(self, positions, width: int = 1, height: int = 1) -> np.ndarray:
+        """For each entity centre position, whether every tile of a width x height footprint is land.
+
+        Tiles outside the fetched area count as not land.
+        """
+        if width <= 0 or height <= 0:
+            raise ValueError("width and height must be positive")
+
+        positions = _as_points(positions)
+        left = np.floor(positions[:, 0] - width / 2 + 0.5).astype(np.int64) - self.origin[0]
+        top = np.floor(positions[:, 1] - height / 2 + 0.5).astype(np.int64) - self.origin[1]
+
+        rows, columns = self.grid.shape
+        x0, x1 = np.clip(left, 0, columns), np.clip(left + width, 0, columns)
+        y0, y1 = np.clip(top, 0, rows), np.clip(top + height, 0, rows)
+
+        sums = self._land_sums
+        land = sums[y1, x1] - sums[y0, x1] - sums[y1, x0] + sums[y0, x0]
+        return land == width * height
+
+    def footprint_is_land(self, x: float, y: float, width: int = 1, height: int = 1) -> bool:
+        return bool(self.footprints_are_land((x, y), width, height)[0])
+
+    def region(self, left_top, right_bottom) -> np.ndarray:
+        """Occupancy grid (rows = y) for the inclusive tile range, padded with UNKNOWN."""
+        x0, y0 = np.floor(np.asarray(left_top, dtype=np.float64)).astype(np.int64)
+        x1, y1 = np.floor(np.asarray(right_bottom, dtype=np.float64)).astype(np.int64)
+        if x1 < x0 or y1 < y0:
+            raise ValueError("right_bottom must not be left of or above left_top")
+
+        region = np.full((y1 - y0 + 1, x1 - x0 + 1), UNKNOWN, dtype=np.uint8)
+        gx0, gy0 = max(x0 - self.origin[0], 0), max(y0 - self.origin[1], 0)
+        gx1 = min(x1 - self.origin[0] + 1, self.grid.shape[1])
+        gy1 = min(y1 - self.origin[1] + 1, self.grid.shape[0])
+        if gx0 < gx1 and gy0 < gy1:
+            rx, ry = gx0 + self.origin[0] - x0, gy0 + self.origin[1] - y0
+            region[ry:ry + gy1 - gy0, rx:rx + gx1 - gx0] = self.grid[gy0:gy1, gx0:gx1]
+        return region
+
+    def tiles_in_box(self, kind: str, left_top, right_bottom) -> np.ndarray:
+        """Tile coordinates of `kind` ("water", "land", "offshore_pump") whose centres lie in the box."""
+        return self._tiles[kind][self._index(kind).query_box(left_top, right_bottom)]
+
+    def tiles_within(self, kind: str, center, radius: float) -> np.ndarray:
+        """Tile coordinates of `kind` whose centres are within `radius` of `center`."""
+        return self._tiles[kind][self._index(kind).query_radius(center, radius)]
+
+    def nearest(self, kind: str, points) -> Tuple[np.ndarray, np.ndarray]:
+        """Nearest tile of `kind` for each point: ((N, 2) tile coordinates, distances)."""
+        indices, distances = self._index(kind).nearest(points)
+        return self._tiles[kind][indices], distances
+
+    def nearest_water(self, x: float, y: float) -> Tuple[Tuple[int, int], float]:
+        tiles, distances = self.nearest("water", (x, y))
+        return (int(tiles[0, 0]), int(tiles[0, 1])), float(distances[0])
@@ -0,0 +1,97 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Any, Optional
+
+from communication_handler import CommunicationHandler, DataType
+
+MOD_INFO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "server", "mods", "FLE", "info.json")
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "fle", "meta")
+
+# Process-wide memo shared by every MetaDataCache, keyed like the files on disk.
+_memo: Dict[str, Dict[str, Any]] = {}
+_memo_lock = threading.Lock()
+
+def mod_version(info_path: str = MOD_INFO_PATH) -> str:
+    """Read the FLE mod version from its info.json."""
+    with open(info_path, "r", encoding="utf-8") as info_file:
+        return json.load(info_file)["version"]
+
+class MetaDataCache:
+    """Memoized, persistent access to get_data(DataType.META).
+
+    Items, recipes and technologies only change with the game image or the FLE mod, so
+    entries are keyed by image tag, mod version and agent. The `resources` section is
+    whatever surrounded the agent on the first fetch, which is the post-reset map for
+    episodes that fetch meta data right after reset. Call get_data(DataType.META)
+    directly when live resource amounts matter.
+    """
+
+    def __init__(self, image_tag: str, cache_dir: Optional[str] = None, version: Optional[str] = None):
+        if not image_tag:
+            raise ValueError("image_tag cannot be empty")
+
+        self.image_tag = image_tag
+        self.version = version or mod_version()
+        self.cache_dir = cache_dir or DEFAULT_CACHE_DIR
+
+    def _key(self, agent_id: int) -> str:
+        key = f"{self.image_tag}-fle{self.version}-agent{agent_id}"
+        return re.sub(r"[^A-Za-z0-9_.-]", "_", key)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def _read(self, key: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as cache_file:
+                return json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+    def _write(self, key: str, meta_data: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(meta_data, cache_file, separators=(",", ":"))
+            os.replace(temp_path, self._path(key))
+        except OSError as e:
+            print(f"⚠️  Could not write meta data cache {self._path(key)}: {e}")
+
+    def get(self, communication_handler: CommunicationHandler) -> Dict[str, Any]:
+        """Return meta data for the handler's agent, fetching it over HTTP only on a miss."""
+        key = self._key(communication_handler.agent_id)
+
+        with _memo_lock:
+            meta_data = _memo.get(key)
+        if meta_data is not None:
+            return meta_data
+
+        meta_data = self._read(key)
+        if meta_data is None:
+            meta_data = communication_handler.get_data(DataType.META)
+            self._write(key, meta_data)
+
+        with _memo_lock:
+            _memo[key] = meta_data
+
+        return meta_data
+
+    def invalidate(self, agent_id: Optional[int] = None) -> None:
+        """Drop cached entries for one agent, or for every agent of this image and mod version."""
+        if agent_id is not None:
+            matches = lambda key: key == self._key(agent_id)
+        else:
+            prefix = self._key(0)[:-1]  # everything up to the agent id
+            matches = lambda key: key.startswith(prefix)
+
+        with _memo_lock:
+            for key in [key for key in _memo if matches(key)]:
+                del _memo[key]
+
+        if os.path.isdir(self.cache_dir):
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(".json") and matches(name[:-len(".json")]):
+                    os.remove(os.path.join(self.cache_dir, name))
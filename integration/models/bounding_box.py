@@ -0,0 +1,30 @@
+from models.position import Position
+
+class BoundingBox(dict):
+    """Axis-aligned area in map coordinates, JSON-shaped like the API's BoundingBox."""
+
+    __slots__ = ()
+
+    def __init__(self, left_top: Position, right_bottom: Position):
+        if left_top.x >= right_bottom.x or left_top.y >= right_bottom.y:
+            raise ValueError("left_top must be above and left of right_bottom")
+        super().__init__(left_top=left_top.to_dict(), right_bottom=right_bottom.to_dict())
+
+    @classmethod
+    def around(cls, center: Position, radius: float) -> "BoundingBox":
+        """The square of half-width `radius` centred on `center`."""
+        if radius <= 0:
+            raise ValueError("radius must be positive")
+        return cls(Position(center.x - radius, center.y - radius), Position(center.x + radius, center.y + radius))
+
+    @property
+    def left_top(self) -> Position:
+        return Position(**self["left_top"])
+
+    @property
+    def right_bottom(self) -> Position:
+        return Position(**self["right_bottom"])
+
+    def to_query(self) -> str:
+        """The `bbox` query parameter form: left,top,right,bottom."""
+        return f"{self.left_top.x},{self.left_top.y},{self.right_bottom.x},{self.right_bottom.y}"
@@ -1,10 +1,44 @@
-class Position(dict):
-    """Position class that's directly JSON-serializable."""
-    
+from typing import Any, Dict
+
+class Position:
+    """An immutable map position.
+
+    Slotted rather than a dict so the many positions held by long action queues stay
+    small; to_dict() gives the JSON shape the API expects, and json_default lets
+    json.dumps encode positions nested anywhere in a payload.
+    """
+
+    __slots__ = ("x", "y")
+
     def __init__(self, x: float, y: float):
-        super().__init__(x=x, y=y)
-        self.x = x
-        self.y = y
+        object.__setattr__(self, "x", x)
+        object.__setattr__(self, "y", y)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError("Position is immutable")
+
+    def __delattr__(self, name: str) -> None:
+        raise AttributeError("Position is immutable")
+
+    def to_dict(self) -> Dict[str, float]:
+        return {"x": self.x, "y": self.y}
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, Position):
+            return self.x == other.x and self.y == other.y
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash((self.x, self.y))
+
+    def __repr__(self) -> str:
+        return f"Position(x={self.x!r}, y={self.y!r})"
 
     def __str__(self) -> str:
-        return f"{{x = {self.x}, y = {self.y}}}"
\ No newline at end of file
+        return f"{{x = {self.x}, y = {self.y}}}"
+
+def json_default(value: Any) -> Any:
+    """`default` hook for json.dumps that encodes Positions as {"x": ..., "y": ...}."""
+    if isinstance(value, Position):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
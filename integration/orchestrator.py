@@ -0,0 +1,243 @@
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from action_builder import ActionBatch
+from communication_handler import CommunicationHandler, DataType
+from config_loader import CharacterSlot, character_slots, load_config
+from container_pool import ContainerPool
+from fleet_runner import EpisodeResult, print_fleet_summary, timed_stage
+from instrumentation import episode
+
+# The FLE mod's reset has spawn positions for this many characters.
+MAX_CHARACTERS_PER_GAME = 9
+
+@dataclass
+class ResourceBudget:
+    """CPU and memory of one container, and what the game and each character cost in it.
+
+    The container limits match what create_factorio_instance gives every container; the
+    game and per-character costs are estimates for the FLE_Lab map.
+    """
+    cpus: float = 1.0
+    memory_mb: int = 1024
+    game_cpus: float = 0.5
+    game_memory_mb: int = 512
+    character_cpus: float = 0.05
+    character_memory_mb: int = 32
+
+    def __post_init__(self):
+        if self.cpus <= self.game_cpus:
+            raise ValueError("cpus must leave room for more than the game itself")
+        if self.memory_mb <= self.game_memory_mb:
+            raise ValueError("memory_mb must leave room for more than the game itself")
+        if self.character_cpus <= 0 or self.character_memory_mb <= 0:
+            raise ValueError("character costs must be positive")
+
+    def cpus_for(self, characters: int) -> float:
+        return self.game_cpus + characters * self.character_cpus
+
+    def memory_mb_for(self, characters: int) -> int:
+        return self.game_memory_mb + characters * self.character_memory_mb
+
+    def fits(self, characters: int) -> bool:
+        return (
+            characters <= MAX_CHARACTERS_PER_GAME
+            and self.cpus_for(characters) <= self.cpus + 1e-9
+            and self.memory_mb_for(characters) <= self.memory_mb
+        )
+
+@dataclass
+class Team:
+    """One team from config.json, in one of the `instances` copies of its configuration."""
+    config_index: int
+    copy: int
+    team_index: int
+    goal: Dict[str, Any]
+    slots: List[CharacterSlot]
+
+    @property
+    def name(self) -> str:
+        return f"config{self.config_index + 1}.{self.copy + 1}/team{self.team_index + 1}"
+
+    @property
+    def agent_ids(self) -> List[int]:
+        return [slot.agent_id for slot in self.slots]
+
+@dataclass
+class ContainerPlan:
+    """Teams sharing one container; their characters get agent ids 1..agent_count in order."""
+    index: int
+    teams: List[Team] = field(default_factory=list)
+
+    @property
+    def agent_count(self) -> int:
+        return sum(len(team.slots) for team in self.teams)
+
+    def add(self, team: Team) -> None:
+        first_agent_id = self.agent_count + 1
+        slots = [replace(slot, agent_id=first_agent_id + offset) for offset, slot in enumerate(team.slots)]
+        self.teams.append(replace(team, slots=slots))
+
+def load_teams(config: List[Dict[str, Any]]) -> List[Team]:
+    """Every team of every configuration, repeated for each of its `instances` copies."""
+    teams: List[Team] = []
+    for config_index, instance_config in enumerate(config):
+        copies = instance_config.get("instances", 1)
+        if copies <= 0:
+            raise ValueError(f"instances must be positive in configuration {config_index + 1}")
+
+        slots = character_slots(instance_config)
+        for copy in range(copies):
+            for team_index, team_config in enumerate(instance_config.get("teams", [])):
+                team_slots = [slot for slot in slots if slot.team_index == team_index]
+                if team_slots:
+                    teams.append(Team(config_index, copy, team_index, team_config.get("goal", {}), team_slots))
+
+    return teams
+
+def plan_placement(teams: List[Team], budget: ResourceBudget) -> List[ContainerPlan]:
+    """Pack teams onto as few containers as the budget allows (first-fit decreasing).
+
+    Each `instances` copy of a configuration is its own world, so only teams of the same
+    configuration and copy share a container; a team is never split either.
+    """
+    worlds: Dict[Tuple[int, int], List[Team]] = {}
+    for team in teams:
+        worlds.setdefault((team.config_index, team.copy), []).append(team)
+
+    plans: List[ContainerPlan] = []
+    for world in worlds.values():
+        world_plans: List[ContainerPlan] = []
+        for team in sorted(world, key=lambda team: len(team.slots), reverse=True):
+            if not budget.fits(len(team.slots)):
+                raise ValueError(f"{team.name} has {len(team.slots)} characters, more than one container fits")
+
+            plan = next((plan for plan in world_plans if budget.fits(plan.agent_count + len(team.slots))), None)
+            if plan is None:
+                plan = ContainerPlan(index=len(plans) + 1)
+                plans.append(plan)
+                world_plans.append(plan)
+            plan.add(team)
+
+    return plans
+
+def print_plan(plans: List[ContainerPlan], budget: ResourceBudget) -> None:
+    print(f"Placement: {len(plans)} container(s) of {budget.cpus:g} CPU / {budget.memory_mb}m:")
+    for plan in plans:
+        teams = ", ".join(f"{team.name} (agents {team.agent_ids[0]}-{team.agent_ids[-1]})" for team in plan.teams)
+        print(
+            f"  - container {plan.index}: {plan.agent_count} agent(s), "
+            f"~{budget.cpus_for(plan.agent_count):.2f} CPU / ~{budget.memory_mb_for(plan.agent_count)}m: {teams}"
+        )
+
+# Queues a team's actions on a batch holding a builder for each of its agent ids.
+QueueTeamActions = Callable[[Team, ActionBatch], None]
+
+def walk_to_spawn(team: Team, batch: ActionBatch) -> None:
+    """Walk every character to its configured spawn position; reset spawns them around 0,0."""
+    for slot in team.slots:
+        batch.agent(slot.agent_id).walk(slot.spawn_position)
+
+def run_container_plan(
+    pool: ContainerPool,
+    plan: ContainerPlan,
+    queue_team_actions: QueueTeamActions,
+    result: Optional[EpisodeResult] = None,
+    wait_for_completion: bool = True
+) -> EpisodeResult:
+    """Reset one leased instance for the plan's agents, send every team's actions at once, then execute."""
+    if result is None:
+        result = EpisodeResult(container_name=f"plan-{plan.index}")
+    result.started_at = time.monotonic()
+
+    with episode(result.episode):
+        try:
+            result.stage = "lease"
+            start = time.perf_counter()
+            with pool.lease(agent_count=plan.agent_count) as instance:
+                result.timings["lease"] = time.perf_counter() - start
+                result.container_name = instance.container.name
+                result.api_url = instance.api_url
+
+                def send_team(team: Team) -> None:
+                    batch = ActionBatch(team.agent_ids)
+                    queue_team_actions(team, batch)
+                    if not batch.action_counts():
+                        return
+                    with CommunicationHandler(
+                        instance.api_url,
+                        team.agent_ids[0],
+                        recorder=pool.recorder,
+                        retry_policy=pool.retry_policy,
+                        circuit_breaker=instance.circuit_breaker
+                    ) as team_handler:
+                        failed = team_handler.send_batch(batch).failed
+                    if failed:
+                        raise RuntimeError(f"{team.name}: actions rejected for agents {sorted(failed)}")
+
+                def send_teams() -> None:
+                    with ThreadPoolExecutor(max_workers=len(plan.teams), thread_name_prefix="fle-team") as executor:
+                        list(executor.map(send_team, plan.teams))
+
+                communication_handler = instance.communication_handler
+                timed_stage(result, "send_teams", send_teams)
+                timed_stage(result, "execute_actions", communication_handler.execute_actions)
+                if wait_for_completion:
+                    timed_stage(result, "wait_for_completion", communication_handler.wait_for_completion)
+                result.final_state = timed_stage(
+                    result, "get_state", lambda: communication_handler.get_data(DataType.STATE)
+                )
+
+            result.stage = "done"
+        except Exception as e:
+            result.error = f"{type(e).__name__} during {result.stage}: {e}"
+
+    return result
+
+def run_plans(
+    pool: ContainerPool,
+    plans: List[ContainerPlan],
+    queue_team_actions: QueueTeamActions = walk_to_spawn,
+    timeout: float = 300.0,
+    wait_for_completion: bool = True
+) -> List[EpisodeResult]:
+    """Run every container plan in parallel on the pool, one instance per plan."""
+    if not plans:
+        raise ValueError("plans cannot be empty")
+    if len(plans) > pool.size:
+        raise ValueError(f"{len(plans)} plans need {len(plans)} containers, the pool has {pool.size}")
+    if timeout <= 0:
+        raise ValueError("timeout must be positive")
+
+    results = [EpisodeResult(container_name=f"plan-{plan.index}") for plan in plans]
+    executor = ThreadPoolExecutor(max_workers=len(plans), thread_name_prefix="fle-plan")
+    fleet_start = time.perf_counter()
+
+    try:
+        futures = [
+            executor.submit(run_container_plan, pool, plan, queue_team_actions, result, wait_for_completion)
+            for plan, result in zip(plans, results)
+        ]
+        _, not_done = wait(futures, timeout=timeout)
+        for future, result in zip(futures, results):
+            if future in not_done:
+                result.error = f"Timed out after {timeout:.0f}s during {result.stage}"
+                future.cancel()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    print_fleet_summary(results, time.perf_counter() - fleet_start)
+    return results
+
+def plan_from_config(path: Optional[str] = None, budget: Optional[ResourceBudget] = None) -> List[ContainerPlan]:
+    """Load config.json and pack its teams onto containers."""
+    budget = budget or ResourceBudget()
+    plans = plan_placement(load_teams(load_config(path)), budget)
+    print_plan(plans, budget)
+    return plans
+
+if __name__ == "__main__":
+    # Dry run: show how config.json would be placed without starting any containers.
+    plan_from_config()
@@ -0,0 +1,98 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from action_builder import Action
+from communication_handler import CommunicationHandler
+
+_DONE = object()
+
+@dataclass
+class PipelineResult:
+    """What a pipelined run submitted and when the game started executing."""
+    chunks: int = 0
+    actions: int = 0
+    responses: List[str] = field(default_factory=list)
+    execute_response: Optional[str] = None
+    time_to_execute: Optional[float] = None
+    total_time: float = 0.0
+
+def run_pipelined(
+    communication_handler: CommunicationHandler,
+    actions: Iterable[Union[Action, Dict[str, Any]]],
+    max_actions: int = 500,
+    max_bytes: int = 64 * 1024,
+    queue_size: int = 4,
+    execute: bool = True
+) -> PipelineResult:
+    """Parse, submit and execute actions as overlapping stages.
+
+    A producer thread pulls from `actions` (e.g. StepParser.iter_actions(), which parses
+    the step file lazily) and encodes chunks into a bounded queue, while this thread
+    submits them. The game is told to execute right after the first chunk is accepted,
+    so it works through early actions while later ones are still being parsed and sent;
+    the FLE mod appends each chunk to the agent's running action list.
+
+    If production falls behind the game, the agent idles until the next chunk arrives.
+    Step files that rely on exact tick timing should use the sequential
+    send_actions → execute_actions flow instead.
+    """
+    if queue_size <= 0:
+        raise ValueError("queue_size must be positive")
+
+    chunks: "queue.Queue[Any]" = queue.Queue(maxsize=queue_size)
+    stop = threading.Event()
+    errors: List[BaseException] = []
+
+    def put(item: Any) -> bool:
+        # Blocks while the queue is full, but gives up once the consumer has stopped.
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def produce() -> None:
+        try:
+            for chunk in communication_handler.iter_action_chunks(actions, max_actions, max_bytes):
+                if not put(chunk):
+                    return
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            put(_DONE)
+
+    result = PipelineResult()
+    start = time.perf_counter()
+    producer = threading.Thread(target=produce, name="fle-pipeline-producer", daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            item = chunks.get()
+            if item is _DONE:
+                break
+
+            count, body = item
+            result.responses.append(communication_handler.post_actions_body(body, count))
+            result.chunks += 1
+            result.actions += count
+
+            if execute and result.execute_response is None:
+                result.execute_response = communication_handler.execute_actions()
+                result.time_to_execute = time.perf_counter() - start
+    finally:
+        stop.set()
+        producer.join()
+
+    if errors:
+        raise errors[0]
+    if result.chunks == 0:
+        raise ValueError("No actions to send")
+
+    result.total_time = time.perf_counter() - start
+    return result
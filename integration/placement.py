@@ -0,0 +1,223 @@
+import glob
+import math
+import os
+import sys
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from docker.client import DockerClient
+
+# Side of the square area the FLE mod copies to its backup surface on init and back on every reset.
+FLE_AREA_TILES = 2000
+
+@dataclass
+class CpuCore:
+    """One physical core and the logical CPUs (SMT siblings) that share it."""
+    node: int
+    cpus: List[int]
+
+@dataclass
+class HostTopology:
+    cores: List[CpuCore]
+    memory_mb: int
+    source: str
+
+    @property
+    def nodes(self) -> List[int]:
+        return sorted({core.node for core in self.cores})
+
+@dataclass
+class InstancePlacement:
+    """Docker resource settings for one Factorio+API container."""
+    instance_id: int
+    cpuset_cpus: str
+    cpuset_mems: Optional[str]
+    mem_limit: str
+
+@dataclass
+class Layout:
+    placements: List[InstancePlacement]
+    requested: int
+    max_instances: int
+    memory_mb: int
+    topology: HostTopology
+    notes: List[str] = field(default_factory=list)
+
+    def for_instance(self, instance_id: int) -> Optional[InstancePlacement]:
+        if 1 <= instance_id <= len(self.placements):
+            return self.placements[instance_id - 1]
+        return None
+
+def placement_kwargs(placement: Optional[InstancePlacement]) -> Dict[str, Any]:
+    """create_factorio_instance arguments for a placement; none keeps its defaults."""
+    if placement is None:
+        return {}
+    return {
+        "mem_limit": placement.mem_limit,
+        "nano_cpus": None,  # The dedicated core is the limit
+        "cpuset_cpus": placement.cpuset_cpus,
+        "cpuset_mems": placement.cpuset_mems
+    }
+
+def _memory_bytes(mem_limit: str) -> int:
+    """Bytes in a Docker memory limit such as "1024m"."""
+    units = {"b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+    suffix = mem_limit[-1].lower()
+    if suffix in units:
+        return int(mem_limit[:-1]) * units[suffix]
+    return int(mem_limit)
+
+def placement_matches(host_config: Dict[str, Any], placement: InstancePlacement) -> bool:
+    """Whether a container's HostConfig has the CPU and memory settings `placement` gives it."""
+    return (
+        (host_config.get("CpusetCpus") or "") == placement.cpuset_cpus
+        and (host_config.get("CpusetMems") or "") == (placement.cpuset_mems or "")
+        and host_config.get("Memory") == _memory_bytes(placement.mem_limit)
+        and not host_config.get("NanoCpus")  # placement_kwargs drops the CPU time limit
+    )
+
+def _parse_cpu_list(text: str) -> List[int]:
+    """Parse a sysfs CPU list such as "0-3,8-11"."""
+    cpus: List[int] = []
+    for part in text.strip().split(","):
+        if not part:
+            continue
+        first, _, last = part.partition("-")
+        cpus.extend(range(int(first), int(last or first) + 1))
+    return cpus
+
+def _read(path: str) -> Optional[str]:
+    try:
+        with open(path, "r", encoding="utf-8") as sys_file:
+            return sys_file.read()
+    except OSError:
+        return None
+
+def _sysfs_cores() -> List[CpuCore]:
+    """Physical cores from /sys, tagged with their NUMA node; empty when unavailable."""
+    allowed = set(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else None
+
+    node_of: Dict[int, int] = {}
+    for node_path in glob.glob("/sys/devices/system/node/node[0-9]*"):
+        cpulist = _read(os.path.join(node_path, "cpulist"))
+        if cpulist:
+            node = int(os.path.basename(node_path)[len("node"):])
+            node_of.update((cpu, node) for cpu in _parse_cpu_list(cpulist))
+
+    cores: Dict[str, CpuCore] = {}
+    for cpu_path in glob.glob("/sys/devices/system/cpu/cpu[0-9]*"):
+        cpu = int(os.path.basename(cpu_path)[len("cpu"):])
+        if allowed is not None and cpu not in allowed:
+            continue
+        siblings = _read(os.path.join(cpu_path, "topology", "thread_siblings_list"))
+        key = siblings.strip() if siblings else str(cpu)
+        core = cores.setdefault(key, CpuCore(node=node_of.get(cpu, 0), cpus=[]))
+        core.cpus.append(cpu)
+
+    for core in cores.values():
+        core.cpus.sort()
+    return sorted(cores.values(), key=lambda core: core.cpus[0])
+
+def detect_host_topology(docker_client: Optional[DockerClient] = None) -> HostTopology:
+    """Cores, NUMA nodes and memory available to containers.
+
+    On a Linux Docker host the layout comes from /sys. Docker Desktop runs containers in
+    a VM whose CPUs are not the local ones, so there only the daemon's CPU count and
+    memory are known and every CPU is treated as its own core on node 0.
+    """
+    info = docker_client.info() if docker_client else {}
+    local_daemon = sys.platform.startswith("linux") and "Docker Desktop" not in info.get("OperatingSystem", "")
+
+    cores = _sysfs_cores() if local_daemon else []
+    if cores:
+        source = "sysfs"
+    else:
+        count = info.get("NCPU") or os.cpu_count() or 1
+        cores = [CpuCore(node=0, cpus=[cpu]) for cpu in range(count)]
+        source = "docker info" if info else "cpu count"
+
+    memory_bytes = info.get("MemTotal")
+    if not memory_bytes and hasattr(os, "sysconf"):
+        memory_bytes = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    return HostTopology(cores=cores, memory_mb=int(memory_bytes or 0) // (1024 * 1024), source=source)
+
+def memory_limit_mb(map_tiles: int = FLE_AREA_TILES, surfaces: int = 2, base_mb: int = 384, mb_per_chunk: float = 0.08) -> int:
+    """Container memory for a game holding `surfaces` copies of a `map_tiles`-wide square area.
+
+    The FLE mod keeps the game surface and its backup (plus one surface per checkpoint).
+    The defaults give the 1024m the containers have always run with for the 2000 tile
+    FLE area; the result is rounded up to 64 MB.
+    """
+    if map_tiles <= 0:
+        raise ValueError("map_tiles must be positive")
+    if surfaces <= 0:
+        raise ValueError("surfaces must be positive")
+
+    chunks = math.ceil(map_tiles / 32) ** 2
+    return int(math.ceil((base_mb + chunks * surfaces * mb_per_chunk) / 64) * 64)
+
+def plan_layout(
+    topology: HostTopology,
+    instance_count: int,
+    memory_mb: int,
+    reserved_cores: int = 1,
+    reserved_memory_mb: int = 1024
+) -> Layout:
+    """Give each instance a dedicated physical core and memory on that core's NUMA node.
+
+    Instances are spread over the nodes in turn. `reserved_cores` (the lowest-numbered)
+    and `reserved_memory_mb` are left for the host, Docker and this process; the instance
+    count is capped at what the remaining cores and memory sustain.
+    """
+    if instance_count <= 0:
+        raise ValueError("instance_count must be positive")
+    if memory_mb <= 0:
+        raise ValueError("memory_mb must be positive")
+
+    notes: List[str] = []
+    usable = topology.cores[reserved_cores:]
+    if not usable:
+        usable = topology.cores
+        notes.append(f"only {len(topology.cores)} core(s); not reserving {reserved_cores} for the host")
+
+    by_memory = max(0, (topology.memory_mb - reserved_memory_mb) // memory_mb) if topology.memory_mb else len(usable)
+    max_instances = min(len(usable), by_memory)
+    if max_instances == 0:
+        raise ValueError(f"{topology.memory_mb}m of host memory cannot fit one {memory_mb}m instance")
+    if instance_count > max_instances:
+        notes.append(f"capped {instance_count} requested instance(s) at {max_instances}")
+
+    per_node: Dict[int, List[CpuCore]] = {}
+    for core in usable:
+        per_node.setdefault(core.node, []).append(core)
+
+    # Round-robin over nodes so memory bandwidth is shared evenly.
+    ordered: List[CpuCore] = []
+    while len(ordered) < max_instances:
+        for node in sorted(per_node):
+            if per_node[node] and len(ordered) < max_instances:
+                ordered.append(per_node[node].pop(0))
+
+    multi_node = len(topology.nodes) > 1
+    placements = [
+        InstancePlacement(
+            instance_id=instance_id,
+            cpuset_cpus=",".join(str(cpu) for cpu in core.cpus),
+            cpuset_mems=str(core.node) if multi_node else None,
+            mem_limit=f"{memory_mb}m"
+        )
+        for instance_id, core in enumerate(ordered[:min(instance_count, max_instances)], start=1)
+    ]
+
+    return Layout(placements, instance_count, max_instances, memory_mb, topology, notes)
+
+def print_layout(layout: Layout) -> None:
+    topology = layout.topology
+    print(
+        f"Host ({topology.source}): {len(topology.cores)} core(s) on {len(topology.nodes)} NUMA node(s), "
+        f"{topology.memory_mb}m memory; sustains {layout.max_instances} instance(s) of {layout.memory_mb}m"
+    )
+    for placement in layout.placements:
+        node = f", node {placement.cpuset_mems}" if placement.cpuset_mems is not None else ""
+        print(f"  - instance {placement.instance_id}: cpus {placement.cpuset_cpus}{node}, {placement.mem_limit}")
+    for note in layout.notes:
+        print(f"  ⚠️  {note}")
@@ -0,0 +1,163 @@
+import asyncio
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+
+# Statuses the API answers with when the game or its RCON link is briefly unavailable.
+TRANSIENT_STATUSES = frozenset({429, 502, 503, 504})
+
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+class CommunicationError(Exception):
+    """A failed API call. `transient` errors (connection problems, timeouts and the
+    statuses in TRANSIENT_STATUSES) are worth retrying; the rest are not."""
+
+    def __init__(self, message: str, status: Optional[int] = None, transient: Optional[bool] = None):
+        super().__init__(message)
+        self.status = status
+        self.transient = status in TRANSIENT_STATUSES if transient is None else transient
+
+class CircuitOpenError(CommunicationError):
+    """Raised without contacting the API while its circuit breaker is open."""
+
+    def __init__(self, message: str):
+        super().__init__(message, transient=False)
+
+def backoff_delays(initial_delay: float, max_delay: float) -> Iterator[float]:
+    """Exponential backoff with jitter: each delay is drawn from the upper half of a
+    doubling window capped at `max_delay`, so many clients probing at once spread out."""
+    if initial_delay <= 0:
+        raise ValueError("initial_delay must be positive")
+    if max_delay < initial_delay:
+        raise ValueError("max_delay cannot be less than initial_delay")
+
+    window = initial_delay
+    while True:
+        yield random.uniform(window / 2, window)
+        window = min(window * 2, max_delay)
+
+class CircuitBreaker:
+    """Stops calling an instance after `failure_threshold` consecutive transient failures.
+
+    While open, calls fail fast with CircuitOpenError. After `reset_timeout` seconds the
+    breaker lets calls through again (half open); one success closes it, one more
+    failure opens it for another `reset_timeout`.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        if failure_threshold <= 0:
+            raise ValueError("failure_threshold must be positive")
+        if reset_timeout <= 0:
+            raise ValueError("reset_timeout must be positive")
+
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if time.monotonic() - self._opened_at < self.reset_timeout:
+                return "open"
+            return "half_open"
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open"
+
+    def before_call(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                remaining = self.reset_timeout - (time.monotonic() - self._opened_at)
+                if remaining > 0:
+                    raise CircuitOpenError(
+                        f"Circuit open after {self.failures} consecutive failures, retry in {remaining:.1f}s"
+                    )
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.failures += 1
+            if self._opened_at is not None or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def reset(self) -> None:
+        self.record_success()
+
+@dataclass
+class RetryPolicy:
+    """How often and how patiently a handler retries transient failures.
+
+    `attempts` counts the first try, so attempts=1 disables retries. Delays between
+    attempts follow backoff_delays(initial_delay, max_delay).
+    """
+    attempts: int = 3
+    initial_delay: float = 0.1
+    max_delay: float = 2.0
+
+    def __post_init__(self):
+        if self.attempts <= 0:
+            raise ValueError("attempts must be positive")
+        if self.initial_delay <= 0:
+            raise ValueError("initial_delay must be positive")
+        if self.max_delay < self.initial_delay:
+            raise ValueError("max_delay cannot be less than initial_delay")
+
+    def _should_retry(self, error: CommunicationError, attempt: int) -> bool:
+        return error.transient and attempt < self.attempts
+
+    def call(self, send: Callable[[], T], circuit_breaker: Optional[CircuitBreaker] = None) -> T:
+        """Run `send`, retrying transient CommunicationErrors and reporting to the breaker."""
+        delays = backoff_delays(self.initial_delay, self.max_delay)
+        for attempt in range(1, self.attempts + 1):
+            if circuit_breaker:
+                circuit_breaker.before_call()
+            try:
+                result = send()
+            except CommunicationError as e:
+                if circuit_breaker and e.transient:
+                    circuit_breaker.record_failure()
+                if not self._should_retry(e, attempt):
+                    raise
+                time.sleep(next(delays))
+                continue
+
+            if circuit_breaker:
+                circuit_breaker.record_success()
+            return result
+
+    async def call_async(
+        self,
+        send: Callable[[], Awaitable[T]],
+        circuit_breaker: Optional[CircuitBreaker] = None
+    ) -> T:
+        """Awaitable counterpart of call()."""
+        delays = backoff_delays(self.initial_delay, self.max_delay)
+        for attempt in range(1, self.attempts + 1):
+            if circuit_breaker:
+                circuit_breaker.before_call()
+            try:
+                result = await send()
+            except CommunicationError as e:
+                if circuit_breaker and e.transient:
+                    circuit_breaker.record_failure()
+                if not self._should_retry(e, attempt):
+                    raise
+                await asyncio.sleep(next(delays))
+                continue
+
+            if circuit_breaker:
+                circuit_breaker.record_success()
+            return result
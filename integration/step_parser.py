@@ -1,215 +1,256 @@
+import hashlib
+import json
 import os
 import re
-from typing import Tuple
+import sys
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 from models.position import Position
 from models.defines import InventoryType, Direction
+from action_builder import Action, ActionBuilder
 from communication_handler import CommunicationHandler
+from pipeline import PipelineResult, run_pipelined
+
+# Compiled steps are plain tuples: the step type followed by its arguments, with positions
+# flattened to x, y and enums stored by value, e.g. ("build", 3.5, 10.5, "transport-belt", "south").
+Step = Tuple[Any, ...]
+
+# Bump when the compiled step layout changes so stale caches are ignored.
+CACHE_VERSION = 1
+
+# Process-wide memo so repeated episodes in one orchestrator skip even the cache read.
+_compiled_steps: Dict[Tuple[str, int, int], List[Step]] = {}
+
+# Single-pass grammar for `step[n] = {{n,1}, "type", ...}` lines. The header is matched
+# once, then the type-specific pattern is matched in place from the header's end, so no
+# intermediate substrings are created.
+_NUMBER = r"(-?\d+(?:\.\d*)?(?:[eE][-+]?\d+)?)"
+_INTEGER = r"(-?\d+)"
+_POSITION = rf"\{{\s*{_NUMBER}\s*,\s*{_NUMBER}\s*\}}"
+_STRING = r'"([^"]*)"'
+_SEP = r"\s*,\s*"
+
+_STEP_HEADER = re.compile(r'\s*step\[\d+\]\s*=\s*\{\s*\{[^}]*\}\s*,\s*"([A-Za-z_]+)"')
+
+_DIRECTIONS = {"north", "south", "east", "west"}
+_INVENTORIES = {"fuel", "chest"}
+
+# Item, recipe and technology names repeat across thousands of steps; interning them
+# keeps one string object per distinct name instead of one per step.
+_name = sys.intern
+
+def _direction(name: str) -> str:
+    return name if name in _DIRECTIONS else Direction.NORTH.value
+
+def _inventory(name: str) -> str:
+    return name if name in _INVENTORIES else InventoryType.MAIN.value
+
+# Step type -> (argument pattern, builder from match groups to a compiled step)
+_STEP_GRAMMAR: Dict[str, Tuple[re.Pattern, Callable[[re.Match], Step]]] = {
+    "walk": (
+        re.compile(_SEP + _POSITION),
+        lambda m: ("walk", float(m[1]), float(m[2]))
+    ),
+    "build": (
+        re.compile(_SEP + _POSITION + _SEP + _STRING + _SEP + r"defines\.direction\.(\w+)"),
+        lambda m: ("build", float(m[1]), float(m[2]), _name(m[3]), _direction(m[4]))
+    ),
+    "recipe": (
+        re.compile(_SEP + _POSITION + _SEP + _STRING),
+        lambda m: ("recipe", float(m[1]), float(m[2]), _name(m[3]))
+    ),
+    "put": (
+        re.compile(_SEP + _POSITION + _SEP + _STRING + _SEP + _INTEGER + _SEP + r"defines\.inventory\.(\w+)"),
+        lambda m: ("put", float(m[1]), float(m[2]), _name(m[3]), int(m[4]), _inventory(m[5]))
+    ),
+    "take": (
+        re.compile(_SEP + _POSITION + _SEP + _STRING + _SEP + _INTEGER + _SEP + r"defines\.inventory\.(\w+)"),
+        lambda m: ("take", float(m[1]), float(m[2]), _name(m[3]), int(m[4]), _inventory(m[5]))
+    ),
+    "rotate": (
+        re.compile(_SEP + _POSITION + _SEP + r"(true|false)"),
+        lambda m: ("rotate", float(m[1]), float(m[2]), m[3] == "true")
+    ),
+    "idle": (
+        re.compile(_SEP + _INTEGER),
+        lambda m: ("idle", int(m[1]))
+    ),
+    "mine": (
+        re.compile(_SEP + _POSITION + _SEP + _INTEGER),
+        lambda m: ("mine", float(m[1]), float(m[2]), int(m[3]))
+    ),
+    "craft": (
+        re.compile(_SEP + _INTEGER + _SEP + _STRING),
+        lambda m: ("craft", _name(m[2]), int(m[1]))
+    ),
+    "tech": (
+        re.compile(_SEP + _STRING),
+        lambda m: ("tech", _name(m[1]))
+    ),
+}
+
+# Step type -> how a compiled step is queued on an action builder or communication handler
+_STEP_REPLAY: Dict[str, Callable[[ActionBuilder, Step], None]] = {
+    "walk": lambda h, s: h.walk(Position(s[1], s[2])),
+    "build": lambda h, s: h.build(Position(s[1], s[2]), s[3], Direction(s[4])),
+    "recipe": lambda h, s: h.recipe(Position(s[1], s[2]), s[3]),
+    "put": lambda h, s: h.put(Position(s[1], s[2]), s[3], s[4], InventoryType(s[5])),
+    "take": lambda h, s: h.take(Position(s[1], s[2]), s[3], s[4], InventoryType(s[5])),
+    "rotate": lambda h, s: h.rotate(Position(s[1], s[2]), s[3]),
+    "idle": lambda h, s: h.wait(s[1]),
+    "mine": lambda h, s: h.mine(Position(s[1], s[2]), s[3]),
+    "craft": lambda h, s: h.craft(s[1], s[2]),
+    "tech": lambda h, s: h.research(s[1]),
+}
 
 class StepParser:
 
-    def __init__(self, path, communication_handler: CommunicationHandler):
+    def __init__(self, path, communication_handler: CommunicationHandler, cache_dir: Optional[str] = None, use_cache: bool = True):
         self.path = path
         self.communication_handler = communication_handler
-
-    _direction_re = re.compile(r"defines\.direction\.([A-Za-z_][A-Za-z0-9_]*)")
-    _inventory_re = re.compile(r"defines\.inventory\.([A-Za-z_][A-Za-z0-9_]*)")
-
-    def _find_last(self, remaining_step: str) -> str:
-        close_brace = remaining_step.find('}')
-        found = remaining_step[1 : close_brace]
-
-        return found.strip()
-
-    def _find_between_commas(self, remaining_step: str) -> Tuple[str, str]:
-        remaining = remaining_step.strip()
-
-        first = remaining.find(',')
-        if first == -1:
-            return "", ""
-        second = remaining.find(',', first + 1)
-        if second == -1:
-            return "", ""
-        
-        found = remaining[first + 1 : second]
-        remaining = remaining[second + 1 :].lstrip()
-
-        return found, remaining
-
-    def _find_between_quotes(self, remaining_step: str) -> Tuple[str, str]:
-        remaining = remaining_step.strip()
-
-        first = remaining.find('"')
-        if first == -1:
-            return "", ""
-        second = remaining.find('"', first + 1)
-        if second == -1:
-            return "", ""
-        
-        found = remaining[first + 1 : second]
-        remaining = remaining[second + 1 :].lstrip()
-
-        return found, remaining
-    
-    def _find_between_bracers(self, remaining_step: str) -> Tuple[str, str]:
-        remaining = remaining_step.strip()
-
-        first = remaining.find('[')
-        if first == -1:
-            return "", ""
-        second = remaining.find(']', first + 1)
-        if second == -1:
-            return "", ""
-        
-        found = remaining[first + 1 : second]
-        remaining = remaining[second + 1 :].lstrip()
-
-        return found, remaining
-    
-    def _find_between_curly_bracers(self, remaining_step:str) -> Tuple[Position, str]:
-        open_brace = remaining_step.find('{')
-        if open_brace == -1:
-            raise ValueError("No opening brace for first coords found")
-
-        close_brace = remaining_step.find('}', open_brace + 1)
-        if close_brace == -1:
-            raise ValueError("No closing brace for first coords found")
-
-        position_str = remaining_step[open_brace + 1 : close_brace]
-        x1_str, y1_str = position_str.split(',', 1)
-
-        position = Position(float(x1_str), float(y1_str))
-        remaining = remaining_step[close_brace + 1 :].lstrip()
-
-        return position, remaining
-    
-    def _find_direction_definition(self, remaining_step: str) -> Tuple[str, str]:
-        match = self._direction_re.search(remaining_step)
-        if not match:
-            raise ValueError("No direction found")
-
-        direction = match.group(1)
-        remainder = remaining_step[match.end():].lstrip()
-
-        return direction, remainder
-    
-    def _find_inventory_definition(self, remaining_step: str) -> Tuple[str, str]:
-        match = self._inventory_re.search(remaining_step)
-        if not match:
-            raise ValueError("No inventory found")
-
-        inventory = match.group(1)
-        remainder = remaining_step[match.end():].lstrip()
-
-        return inventory, remainder
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(path)), ".step_cache")
+        self.use_cache = use_cache
+
+    def _compile_line(self, line: str) -> Optional[Step]:
+        header = _STEP_HEADER.match(line)
+        if header is None:  # empty lines, Lua comments and non-step statements
+            return None
+
+        grammar = _STEP_GRAMMAR.get(header[1])
+        if grammar is None:
+            # TODO: Implement other step types
+            return None
+
+        pattern, build_step = grammar
+        arguments = pattern.match(line, header.end())
+        if arguments is None:
+            raise ValueError(f"Malformed {header[1]} step: {line.strip()}")
+
+        return build_step(arguments)
+
+    def iter_steps(self) -> Iterator[Step]:
+        """Lazily yield compiled steps, reading the file one line at a time."""
+        with open(self.path, "r", encoding="utf-8") as steps_file:
+            for line in steps_file:
+                step = self._compile_line(line)
+                if step is not None:
+                    yield step
+
+    def compile(self) -> List[Step]:
+        """Parse the step file into a list of compact, JSON-serializable step tuples."""
+        return list(self.iter_steps())
+
+    def _cache_path(self) -> str:
+        path_key = hashlib.sha256(os.path.abspath(self.path).encode("utf-8")).hexdigest()[:16]
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        return os.path.join(self.cache_dir, f"{name}.{path_key}.json")
+
+    def _file_sha256(self) -> str:
+        digest = hashlib.sha256()
+        with open(self.path, "rb") as steps_file:
+            for chunk in iter(lambda: steps_file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _read_cache(self, stat: os.stat_result) -> Optional[List[Step]]:
+        try:
+            with open(self._cache_path(), "r", encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return None
+
+        if cache.get("version") != CACHE_VERSION:
+            return None
+
+        # mtime and size are the cheap check; fall back to the content hash so a touched
+        # but unchanged file (e.g. after a git checkout) still hits the cache.
+        if cache.get("mtime_ns") != stat.st_mtime_ns or cache.get("size") != stat.st_size:
+            if cache.get("sha256") != self._file_sha256():
+                return None
+            self._write_cache(stat, cache["sha256"], cache["steps"])
+
+        return [tuple(_name(value) if type(value) is str else value for value in step) for step in cache["steps"]]
+
+    def _write_cache(self, stat: os.stat_result, sha256: str, steps: List[Step]) -> None:
+        cache = {
+            "version": CACHE_VERSION,
+            "mtime_ns": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "sha256": sha256,
+            "steps": steps
+        }
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            temp_path = f"{self._cache_path()}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as cache_file:
+                json.dump(cache, cache_file, separators=(",", ":"))
+            os.replace(temp_path, self._cache_path())
+        except OSError as e:
+            print(f"⚠️  Could not write step cache {self._cache_path()}: {e}")
+
+    def load(self) -> List[Step]:
+        """Return the compiled steps, from memory or the on-disk cache when still valid."""
+        stat = os.stat(self.path)
+        memo_key = (os.path.abspath(self.path), stat.st_mtime_ns, stat.st_size)
+
+        steps = _compiled_steps.get(memo_key)
+        if steps is not None:
+            return steps
+
+        if self.use_cache:
+            steps = self._read_cache(stat)
+
+        if steps is None:
+            steps = self.compile()
+            if self.use_cache:
+                self._write_cache(stat, self._file_sha256(), steps)
+
+        _compiled_steps[memo_key] = steps
+        return steps
+
+    def replay(self, steps: Iterable[Step]) -> None:
+        """Queue compiled steps on the communication handler."""
+        handler = self.communication_handler
+        for step in steps:
+            _STEP_REPLAY[step[0]](handler, step)
+
+    def iter_actions(self, steps: Optional[Iterable[Step]] = None) -> Iterator[Action]:
+        """Yield action payloads one step at a time without queuing them on the handler.
+
+        Defaults to streaming straight from the step file, so memory stays flat
+        regardless of file length.
+        """
+        builder = ActionBuilder()
+        for step in steps if steps is not None else self.iter_steps():
+            _STEP_REPLAY[step[0]](builder, step)
+            yield from builder.actions
+            builder.actions.clear()
+
+    def stream(self, max_actions: int = 500, max_bytes: int = 64 * 1024) -> List[str]:
+        """Parse and submit the step file in bounded chunks as it is being read."""
+        if not os.path.exists(self.path):
+            return ["Path doesn't exist."]
+
+        return self.communication_handler.send_actions_stream(
+            self.iter_actions(), max_actions=max_actions, max_bytes=max_bytes
+        )
+
+    def pipeline(self, max_actions: int = 500, max_bytes: int = 64 * 1024, queue_size: int = 4) -> PipelineResult:
+        """Parse, submit and execute the step file as overlapping stages (see run_pipelined)."""
+        if not os.path.exists(self.path):
+            raise FileNotFoundError(f"Path doesn't exist: {self.path}")
+
+        return run_pipelined(
+            self.communication_handler,
+            self.iter_actions(),
+            max_actions=max_actions,
+            max_bytes=max_bytes,
+            queue_size=queue_size
+        )
 
     def parse(self):
         if os.path.exists(self.path):
-            with open(self.path, "r", encoding="utf-8") as steps_file:
-                for line in steps_file:
-                    line = line.strip()
-
-                    if not line or line.startswith("--"):  # skip empty lines and Lua comments
-                        continue
-                    else:
-                        step_number, remaining = self._find_between_bracers(line)
-                        if step_number == "":
-                            continue
-
-                        type, remaining = self._find_between_quotes(remaining)
-                        if type == "walk":
-                            position, remaining = self._find_between_curly_bracers(remaining)
-
-                            self.communication_handler.walk(position)
-
-                        elif type == "build":
-                            position, remaining = self._find_between_curly_bracers(remaining)
-                            name, remaining = self._find_between_quotes(remaining)
-
-                            direction_definition, remaining = self._find_direction_definition(remaining)
-                            direction = Direction.NORTH
-                            if direction_definition == "south":
-                                direction = Direction.SOUTH
-                            elif direction_definition == "east": 
-                                direction = Direction.EAST
-                            elif direction_definition == "west":
-                                direction = Direction.WEST
-
-                            self.communication_handler.build(position, name, direction)
-
-                        elif type == "recipe":
-                            position, remaining = self._find_between_curly_bracers(remaining)
-                            name, remaining = self._find_between_quotes(remaining)
-
-                            self.communication_handler.recipe(position, name)
-
-                        elif type == "put":
-                            position, remaining = self._find_between_curly_bracers(remaining)
-                            name, remaining = self._find_between_quotes(remaining)
-                            quantity, remaining = self._find_between_commas(remaining)
-                            quantity = int(quantity)
-
-                            inventory_definition, remaining = self._find_inventory_definition(remaining)
-                            inventory = InventoryType.MAIN
-                            if inventory_definition == "fuel":
-                                inventory = InventoryType.FUEL
-                            elif inventory_definition == "chest": 
-                                inventory = InventoryType.CHEST
-
-                            self.communication_handler.put(position, name, quantity, inventory)
-
-                        elif type == "take":
-                            position, remaining = self._find_between_curly_bracers(remaining)
-                            name, remaining = self._find_between_quotes(remaining)
-                            quantity, remaining = self._find_between_commas(remaining)
-                            quantity = int(quantity)
-
-                            inventory_definition, remaining = self._find_inventory_definition(remaining)
-                            inventory = InventoryType.MAIN
-                            if inventory_definition == "fuel":
-                                inventory = InventoryType.FUEL
-                            elif inventory_definition == "chest": 
-                                inventory = InventoryType.CHEST
-
-                            self.communication_handler.take(position, name, quantity, inventory)
-
-                        elif type == "rotate":
-                            position, remaining = self._find_between_curly_bracers(remaining)
-                            reverse_str = self._find_last(remaining)
-
-                            reverse = False
-                            if reverse_str == "true":
-                                reverse = True
-
-                            self.communication_handler.rotate(position, reverse)
-
-                        elif type == "idle":
-                            ticks = self._find_last(remaining)
-                            ticks = int(ticks)
-
-                            self.communication_handler.wait(ticks)
-
-                        elif type == "mine":
-                            position, remaining = self._find_between_curly_bracers(remaining)
-                            ticks = self._find_last(remaining)
-                            ticks = int(ticks)
-
-                            self.communication_handler.mine(position, ticks)
-
-                        elif type == "craft":
-                            quantity, remaining = self._find_between_commas(remaining)
-                            quantity = int(quantity)
-                            name, remaining = self._find_between_quotes(remaining)
-
-                            self.communication_handler.craft(name, quantity)
-                        elif type == "tech":
-                            name, remaining = self._find_between_quotes(remaining)
-
-                            self.communication_handler.research(name)
-
-                        else:
-                            # TODO: Implement other step types
-                            do_nothing = True
+            self.replay(self.load())
         else:
             return "Path doesn't exist."
-        
\ No newline at end of file
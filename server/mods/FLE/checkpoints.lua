@@ -0,0 +1,191 @@
+local util = require("util")
+local fle_utils = require("fle_utils")
+local entity_changes = require("data.entity_changes")
+
+local checkpoints = {}
+
+local CHARACTER_INVENTORIES = {
+    defines.inventory.character_main,
+    defines.inventory.character_guns,
+    defines.inventory.character_ammo,
+    defines.inventory.character_armor,
+    defines.inventory.character_trash
+}
+
+local function destroy_all_characters(surface)
+    for _, entity in pairs(surface.find_entities_filtered {type = "character"}) do
+        if entity.valid then entity.destroy() end
+    end
+end
+
+local function save_character(character, character_config)
+    local inventories = {}
+    for _, inventory_type in ipairs(CHARACTER_INVENTORIES) do
+        local inventory = character.get_inventory(inventory_type)
+        if inventory then inventories[inventory_type] = inventory.get_contents() end
+    end
+
+    -- Entity references would point into the old surface; take and put select their
+    -- target again when they run.
+    local config = util.table.deepcopy(character_config)
+    config.target_inventory = nil
+
+    return {
+        position = {x = character.position.x, y = character.position.y},
+        direction = character.direction,
+        inventories = inventories,
+        config = config
+    }
+end
+
+local function restore_character(surface, saved)
+    local character = surface.create_entity {
+        name = "character",
+        position = saved.position,
+        direction = saved.direction,
+        force = game.forces.player
+    }
+    if not (character and character.valid) then return nil end
+
+    for inventory_type, contents in pairs(saved.inventories) do
+        local inventory = character.get_inventory(inventory_type)
+        if inventory then
+            for name, count in pairs(contents) do
+                inventory.insert({name = name, count = count})
+            end
+        end
+    end
+
+    return character
+end
+
+local function save_research(force)
+    local researched = {}
+    for name, technology in pairs(force.technologies) do
+        if technology.researched then researched[name] = true end
+    end
+
+    return {
+        researched = researched,
+        current = force.current_research and force.current_research.name,
+        progress = force.research_progress
+    }
+end
+
+local function restore_research(force, research)
+    for name, technology in pairs(force.technologies) do
+        technology.researched = research.researched[name] == true
+    end
+
+    force.cancel_current_research()
+    if research.current then
+        force.add_research(research.current)
+        force.research_progress = research.progress
+    end
+end
+
+local function describe(name, checkpoint)
+    return {name = name, tick = checkpoint.tick, agents = checkpoint.agents}
+end
+
+-- Copies the game surface, every agent (position, inventories and action queue) and the
+-- research state, so restore can skip replaying the actions that led here. Crafting
+-- queues are not captured; save once the agents are idle.
+function checkpoints.save(name)
+    if not global.fle.characters then
+        return {error = "Reset the scenario before saving a checkpoint."}
+    end
+
+    global.fle.checkpoints = global.fle.checkpoints or {}
+    global.fle.checkpoint_count = (global.fle.checkpoint_count or 0) + 1
+
+    -- Surface deletion only happens at the end of the tick, so every save gets a fresh name.
+    local surface = game.create_surface("fle_checkpoint_" .. global.fle.checkpoint_count)
+    global.fle.game_surface.clone_area {
+        source_area = global.fle.area,
+        destination_area = global.fle.area,
+        destination_surface = surface,
+        clone_tiles = true,
+        clone_entities = true
+    }
+    destroy_all_characters(surface)
+
+    local characters, agents = {}, 0
+    for character_id, character in pairs(global.fle.characters) do
+        if character.valid then
+            characters[character_id] = save_character(character, global.fle.character_configs[character_id])
+            agents = agents + 1
+        end
+    end
+
+    checkpoints.delete(name)
+    global.fle.checkpoints[name] = {
+        surface = surface.name,
+        tick = game.tick,
+        agents = agents,
+        characters = characters,
+        research = save_research(game.forces.player)
+    }
+
+    return describe(name, global.fle.checkpoints[name])
+end
+
+-- Replaces the game surface, agents and research with a saved checkpoint and pauses the
+-- game, as reset does. Agents keep the action queues they had when the checkpoint was saved.
+function checkpoints.restore(name)
+    local checkpoint = (global.fle.checkpoints or {})[name]
+    if not checkpoint then
+        return {error = "Checkpoint " .. name .. " does not exist."}
+    end
+
+    fle_utils.stop_run_until_idle()
+
+    game.surfaces[checkpoint.surface].clone_area {
+        source_area = global.fle.area,
+        destination_area = global.fle.area,
+        destination_surface = global.fle.game_surface,
+        clone_tiles = true,
+        clone_entities = true
+    }
+    destroy_all_characters(global.fle.game_surface)
+
+    global.fle.characters = {}
+    global.fle.character_configs = {}
+    entity_changes.forget()
+
+    for character_id, saved in pairs(checkpoint.characters) do
+        local character = restore_character(global.fle.game_surface, saved)
+        if character then
+            global.fle.characters[character_id] = character
+            global.fle.character_configs[character_id] = util.table.deepcopy(saved.config)
+        end
+    end
+
+    restore_research(game.forces.player, checkpoint.research)
+
+    game.tick_paused = true
+
+    return describe(name, checkpoint)
+end
+
+function checkpoints.list()
+    local list = {}
+    for name, checkpoint in pairs(global.fle.checkpoints or {}) do
+        table.insert(list, describe(name, checkpoint))
+    end
+    table.sort(list, function(a, b) return a.name < b.name end)
+
+    return list
+end
+
+function checkpoints.delete(name)
+    local checkpoint = (global.fle.checkpoints or {})[name]
+    if not checkpoint then return false end
+
+    if game.surfaces[checkpoint.surface] then game.delete_surface(checkpoint.surface) end
+    global.fle.checkpoints[name] = nil
+
+    return true
+end
+
+return checkpoints
@@ -4,16 +4,47 @@ local util = require("util")
 
 local fle_utils = require("fle_utils")
 local handle_tick = require("handle_tick")
+local checkpoints = require("checkpoints")
 local state_data = require("data.state_data")
+local state_data_delta = require("data.state_delta")
+local entity_changes = require("data.entity_changes")
 local meta_data = require("data.meta_data")
 local map_data = require("data.map_data")
 
+-- game.speed bounds; at the maximum a headless server runs as fast as the CPU allows.
+local MIN_GAME_SPEED = 0.01
+local MAX_GAME_SPEED = 1000
+
 local function destroy_all_characters(surface)
     for _, entity in pairs(surface.find_entities_filtered {type = "character"}) do
         if entity.valid then entity.destroy() end
     end
 end
 
+-- An agent is done once it has started its last action and is no longer walking,
+-- waiting, mining or picking up.
+local function agent_progress(character_config)
+    local total = #character_config.actions
+    local completed = math.min(character_config.action_number - 1, total)
+    local busy = character_config.walking_state.walking or
+                     character_config.wait > 0 or
+                     character_config.pickup_ticks > 0 or
+                     character_config.ticks_mined > 0
+
+    return completed, total, completed >= total and not busy
+end
+
+local function all_agents_done()
+    for character_id, character_config in pairs(global.fle.character_configs or {}) do
+        if global.fle.characters and global.fle.characters[character_id] then
+            local _, _, done = agent_progress(character_config)
+            if not done then return false end
+        end
+    end
+
+    return true
+end
+
 script.on_init(function()
     global.tick_paused = true
     global.fle = {}
@@ -54,6 +85,8 @@ script.on_event(defines.events.on_player_joined_game, function(event)
     end
 end)
 
+script.on_event(entity_changes.events, entity_changes.on_structure_changed)
+
 script.on_event(defines.events.on_tick, function(event)
     if not global.fle.characters then return end
 
@@ -76,9 +109,13 @@ script.on_event(defines.events.on_tick, function(event)
             character.walking_state = character_config.walking_state
         end
     end
+
+    if global.fle.run_until_idle and all_agents_done() then fle_utils.stop_run_until_idle() end
 end)
 
 function reset_scenario(num_characters)
+    fle_utils.stop_run_until_idle()
+
     global.fle.backup.clone_area {
         source_area = global.fle.area,
         destination_area = global.fle.area,
@@ -100,6 +137,7 @@ function reset_scenario(num_characters)
     }
 
     global.fle.characters = {}
+    entity_changes.forget()
 
     for i = 1, num_characters do
         local character = global.fle.game_surface.create_entity {
@@ -163,11 +201,35 @@ function reset_scenario(num_characters)
 end
 
 -- The intention is that the game with be paused when an agent either runs out of actions or runs into an error. Then once it thinks it has been fixed it can start executing actions again.
-function execute_actions()
+-- With until_idle the game runs at MAX_GAME_SPEED and pauses itself, back at the previous
+-- speed, on the first tick where every agent is done.
+function execute_actions(until_idle)
+    if until_idle then
+        if all_agents_done() then return "No actions to execute." end
+
+        global.fle.run_until_idle = global.fle.run_until_idle or {speed = game.speed}
+        game.speed = MAX_GAME_SPEED
+    end
+
     game.tick_paused = false
     return "Actions set to be executed."
 end
 
+function set_game_speed(speed)
+    if type(speed) ~= "number" or speed < MIN_GAME_SPEED or speed > MAX_GAME_SPEED then
+        return {error = "Game speed must be between " .. MIN_GAME_SPEED .. " and " .. MAX_GAME_SPEED .. "."}
+    end
+
+    -- Applies once a run until idle ends, so it does not slow that run down.
+    if global.fle.run_until_idle then
+        global.fle.run_until_idle.speed = speed
+    else
+        game.speed = speed
+    end
+
+    return {speed = speed}
+end
+
 function add_actions(character_id, actions)
     if not global.fle.characters[character_id] then
         return "Agent does not exist."
@@ -191,6 +253,34 @@ function add_actions(character_id, actions)
     return "Actions added successfully."
 end
 
+-- Progress of every agent's action queue.
+function actions_status()
+    local status = {
+        tick = game.tick,
+        paused = game.tick_paused,
+        speed = game.speed,
+        until_idle = global.fle.run_until_idle ~= nil,
+        done = true,
+        agents = {}
+    }
+
+    for character_id, character_config in pairs(global.fle.character_configs or {}) do
+        if global.fle.characters and global.fle.characters[character_id] then
+            local completed, total, agent_done = agent_progress(character_config)
+            status.done = status.done and agent_done
+
+            table.insert(status.agents, {
+                agent_id = character_id,
+                completed = completed,
+                total = total,
+                done = agent_done
+            })
+        end
+    end
+
+    return status
+end
+
 remote.add_interface("FLE", {
     reset = function(num_characters)
         if not num_characters or num_characters < 1 and num_characters > 9 then
@@ -199,22 +289,44 @@ remote.add_interface("FLE", {
 
         return reset_scenario(num_characters)
     end,
-    state_data = function(character_id, radius)
-        local data = state_data(character_id, radius)
+    state_data = function(character_id, radius, options)
+        local data = state_data(character_id, radius, options)
         rcon.print(json.encode(data))
     end,
-    meta_data = function(character_id, radius)
-        local data = meta_data(character_id, radius)
+    state_data_delta = function(character_id, radius, since_version, options)
+        local data = state_data_delta(character_id, radius, since_version, options)
         rcon.print(json.encode(data))
     end,
-    map_data = function(character_id, radius)
-        local data = map_data(character_id, radius)
+    meta_data = function(character_id, radius, options)
+        local data = meta_data(character_id, radius, options)
+        rcon.print(json.encode(data))
+    end,
+    map_data = function(character_id, radius, options)
+        local data = map_data(character_id, radius, options)
         rcon.print(json.encode(data))
     end,
     add_actions = function(character_id, actions)
         return add_actions(character_id, actions)
     end,
-    execute_actions = function() 
-        return execute_actions() 
+    execute_actions = function(until_idle)
+        return execute_actions(until_idle)
+    end,
+    set_game_speed = function(speed)
+        rcon.print(json.encode(set_game_speed(speed)))
+    end,
+    actions_status = function()
+        rcon.print(json.encode(actions_status()))
+    end,
+    save_checkpoint = function(name)
+        rcon.print(json.encode(checkpoints.save(name)))
+    end,
+    restore_checkpoint = function(name)
+        rcon.print(json.encode(checkpoints.restore(name)))
+    end,
+    list_checkpoints = function()
+        rcon.print(json.encode(checkpoints.list()))
+    end,
+    delete_checkpoint = function(name)
+        rcon.print(json.encode({deleted = checkpoints.delete(name)}))
     end
 })
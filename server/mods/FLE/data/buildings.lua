@@ -0,0 +1,125 @@
+local fle_utils = require("fle_utils")
+
+local wreck_names = {
+    "crash-site-spaceship-wreck-big-1", "crash-site-spaceship-wreck-big-2",
+    "crash-site-spaceship-wreck-medium-1",
+    "crash-site-spaceship-wreck-medium-2", "crash-site-spaceship-wreck-medium-3"
+}
+
+local status_names, direction_names = {}, {}
+for n, c in pairs(defines.entity_status) do status_names[c] = n end
+for n, c in pairs(defines.direction) do direction_names[c] = n end
+
+local buildings = {}
+
+-- The character's buildings plus the crash site wrecks in the searched area.
+function buildings.find(character, radius, options)
+    local found = global.fle.game_surface.find_entities_filtered(
+        fle_utils.search_filter(character, radius, options, {force = character.force}))
+
+    for _, enttity in ipairs(global.fle.game_surface.find_entities_filtered(
+        fle_utils.search_filter(character, radius, options, {name = wreck_names}))) do
+        table.insert(found, enttity)
+    end
+
+    return found
+end
+
+-- Stable key the state delta uses for a building.
+function buildings.key(building)
+    if building.unit_number then return tostring(building.unit_number) end
+
+    return building.name .. "@" .. building.position.x .. "," .. building.position.y
+end
+
+local function inventories(building)
+    local result = {}
+
+    result.fuel = building.get_fuel_inventory()
+    result.input = building.get_inventory(defines.inventory.assembling_machine_input) or
+                       building.get_inventory(defines.inventory.lab_input)
+    result.output = building.get_output_inventory()
+    result.moduels = building.get_module_inventory()
+
+    return result
+end
+
+local function recipe_name(building)
+    if not building.prototype.crafting_categories then return nil end
+
+    local recipe = building.get_recipe()
+    return recipe and recipe.name
+end
+
+-- Cheap summary of what a building's record shows that can change without the building
+-- being rebuilt: status, direction, recipe, targets and item counts. Used by the state
+-- delta to decide which records to rebuild; a swap of items at equal counts goes unseen
+-- until anything else about the building changes.
+function buildings.fingerprint(building)
+    local parts = {
+        building.status or "",
+        building.direction or 0,
+        recipe_name(building) or "",
+        building.drop_target and buildings.key(building.drop_target) or "",
+        building.type == "inserter" and building.pickup_target and buildings.key(building.pickup_target) or ""
+    }
+
+    local building_inventories = inventories(building)
+    for _, inventory_name in ipairs({"fuel", "input", "output", "moduels"}) do
+        local inventory = building_inventories[inventory_name]
+        if inventory then
+            table.insert(parts, inventory.get_item_count())
+            table.insert(parts, inventory.count_empty_stacks())
+        end
+    end
+
+    return table.concat(parts, "|")
+end
+
+function buildings.record(building)
+    local direction = direction_names[building.direction or 0] or
+                          tostring(building.direction)
+
+    local record = {
+        name = building.name,
+        unit_number = building.unit_number,
+        position = building.position,
+        selection_box = building.selection_box,
+        status = building.status,
+        direction = direction
+    }
+
+    local status = status_names[building.status]
+    if status then record.status = status end
+
+    local inventory_stats = {}
+    for inventory_name, inventory in pairs(inventories(building)) do
+        inventory_stats[inventory_name] = fle_utils.inventory_stats(inventory)
+    end
+
+    if next(inventory_stats) then
+        record.inventory_stats = inventory_stats
+    end
+
+    record.recipe = recipe_name(building)
+
+    if building.drop_target then
+        record.drop_target = {
+            name = building.drop_target.name,
+            position = building.drop_target.position
+        }
+    end
+
+    if building.type == "inserter" and building.pickup_target then
+        record.pickup_target = {
+            name = building.pickup_target.name,
+            position = building.pickup_target.position
+        }
+    end
+
+    -- Add how many ticks of fuel is left, how many ticks is left for the next craft to finish, how many crafts can be made with the current input inventory and how much time that is.
+
+    return record
+end
+
+return buildings
@@ -0,0 +1,44 @@
+-- Bookkeeping for state_data_delta. It lives in module locals rather than `global`: it is
+-- only a cache, so it stays out of saves, and after a load every poller simply gets a full
+-- snapshot. Nothing here feeds back into the game, so peers holding different caches
+-- cannot desync.
+local entity_changes = {}
+
+local snapshots = {}
+local structure_version = 0
+
+-- Events after which a cached list of buildings may be missing or holding an entity.
+entity_changes.events = {
+    defines.events.on_built_entity,
+    defines.events.on_robot_built_entity,
+    defines.events.script_raised_built,
+    defines.events.script_raised_revive,
+    defines.events.on_entity_cloned,
+    defines.events.on_player_mined_entity,
+    defines.events.on_robot_mined_entity,
+    defines.events.on_entity_died,
+    defines.events.script_raised_destroy
+}
+
+function entity_changes.on_structure_changed()
+    structure_version = structure_version + 1
+end
+
+function entity_changes.structure_version()
+    return structure_version
+end
+
+function entity_changes.snapshot(character_id)
+    return snapshots[character_id]
+end
+
+function entity_changes.store(character_id, snapshot)
+    snapshots[character_id] = snapshot
+end
+
+-- Makes every poller start over with a full snapshot, e.g. after a reset or restore.
+function entity_changes.forget()
+    snapshots = {}
+end
+
+return entity_changes
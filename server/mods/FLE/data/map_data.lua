@@ -1,4 +1,5 @@
 local json = require("include.dkjson")
+local fle_utils = require("fle_utils")
 
 local function is_water_tile(tile_name)
     return tile_name == "water" or tile_name == "water-green" or tile_name ==
@@ -47,7 +48,9 @@ local function valid_position(surface, position)
     return false
 end
 
-function map_data(character_id, radius)
+-- `options` may narrow the search to `area` and the result to `fields`; the offshore pump
+-- check is the expensive part and is skipped unless offshore_pump_locations is wanted.
+function map_data(character_id, radius, options)
     local character = global.fle.characters[character_id]
     local force = character.force
     local surface = character.surface
@@ -57,21 +60,25 @@ function map_data(character_id, radius)
         offshore_pump_locations = {}
     }
 
-    local tiles = surface.find_tiles_filtered {
-        position = character.position,
-        radius = radius
-    }
+    local want_tiles = fle_utils.wants(options, "tiles")
+    local want_pumps = fle_utils.wants(options, "offshore_pump_locations")
+
+    local tiles = surface.find_tiles_filtered(fle_utils.search_filter(character, radius, options))
 
     for _, tile in ipairs(tiles) do
         local position = tile.position
 
         if is_water_tile(tile.name) then
-            table.insert(map_data.tiles.water_tiles, {position = position})
+            if want_tiles then
+                table.insert(map_data.tiles.water_tiles, {position = position})
+            end
 
         else
-            table.insert(map_data.tiles.land_tiles, {position = position})
+            if want_tiles then
+                table.insert(map_data.tiles.land_tiles, {position = position})
+            end
 
-            if surface.can_place_entity {
+            if want_pumps and surface.can_place_entity {
                 name = "offshore-pump",
                 position = position
             } and valid_position(surface, position) then
@@ -81,6 +88,9 @@ function map_data(character_id, radius)
         end
     end
 
+    if not want_tiles then map_data.tiles = nil end
+    if not want_pumps then map_data.offshore_pump_locations = nil end
+
     return map_data
 end
 
@@ -0,0 +1,127 @@
+local json = require("include.dkjson")
+local fle_utils = require("fle_utils")
+local buildings = require("data.buildings")
+local entity_changes = require("data.entity_changes")
+local state_data = require("data.state_data")
+
+-- Sections a delta contains when the caller does not list `options.fields`; the others
+-- cost a full scan of their own on every poll, so they are only collected when asked for.
+local DEFAULT_FIELDS = {agents = true, buildings = true}
+
+local function wants(options, field)
+    if not options.fields then return DEFAULT_FIELDS[field] == true end
+
+    return fle_utils.wants(options, field)
+end
+
+-- Agents are few, so they are compared by their JSON encoding.
+local function diff_agents(previous, records, full)
+    local encodings, changed, removed = {}, {}, {}
+
+    for _, record in ipairs(records) do
+        local key = record.agent_id
+        encodings[key] = json.encode(record)
+        if full or previous[key] ~= encodings[key] then table.insert(changed, record) end
+    end
+
+    if not full then
+        for key in pairs(previous) do
+            if not encodings[key] then table.insert(removed, key) end
+        end
+    end
+
+    return encodings, changed, removed
+end
+
+-- Buildings are compared by buildings.fingerprint, and only changed ones get a full record.
+-- The searched list is reused until an entity is built or removed, or a radius search
+-- moves with its character.
+local function diff_buildings(previous, character, radius, options, search_key, full)
+    local entities = previous.entities
+    if not entities or previous.search_key ~= search_key or
+        previous.structure_version ~= entity_changes.structure_version() then
+        entities = buildings.find(character, radius, options)
+    end
+
+    local found, fingerprints, changed, removed = {}, {}, {}, {}
+    local previous_fingerprints = previous.fingerprints or {}
+
+    for _, building in ipairs(entities) do
+        if building.valid and building.name ~= "character" then
+            local key = buildings.key(building)
+            local fingerprint = buildings.fingerprint(building)
+            fingerprints[key] = fingerprint
+            table.insert(found, building)
+
+            if full or previous_fingerprints[key] ~= fingerprint then
+                local record = buildings.record(building)
+                record.key = key
+                table.insert(changed, record)
+            end
+        end
+    end
+
+    if not full then
+        for key in pairs(previous_fingerprints) do
+            if not fingerprints[key] then table.insert(removed, key) end
+        end
+    end
+
+    return found, fingerprints, changed, removed
+end
+
+-- Returns only what changed since `since_version` for this character. When the client's
+-- version does not match the stored snapshot (first call, reset, load, another poller)
+-- the response has full = true and contains every agent and building. `options.area`
+-- scopes the search (changing it also yields a full snapshot) and `options.fields` picks
+-- the sections; electricity, flow and research_queue are only included when listed.
+function state_data_delta(character_id, radius, since_version, options)
+    options = options or {}
+
+    local extra_fields = {}
+    for _, field in ipairs({"agents", "electricity", "flow", "research_queue"}) do
+        if wants(options, field) then table.insert(extra_fields, field) end
+    end
+
+    local state = state_data(character_id, radius, {area = options.area, fields = extra_fields})
+    if state.Developer_Error then return state end
+
+    local character = global.fle.characters[character_id]
+    local scope = options.area and json.encode(options.area) or tostring(radius)
+
+    local previous = entity_changes.snapshot(character_id)
+    local full = previous == nil or previous.version ~= since_version or previous.scope ~= scope
+    previous = previous or {}
+
+    -- Sections left out of this poll keep their previous snapshot for the next one.
+    local snapshot = {}
+    for key, value in pairs(previous) do snapshot[key] = value end
+    snapshot.version = (previous.version or 0) + 1
+    snapshot.scope = scope
+
+    local delta = {version = snapshot.version, full = full}
+
+    if wants(options, "agents") then
+        snapshot.agents, delta.agents, delta.removed_agents = diff_agents(previous.agents or {}, state.agents, full)
+    end
+
+    if wants(options, "buildings") then
+        local search_key = options.area and scope or
+                               scope .. "@" .. math.floor(character.position.x) .. "," .. math.floor(character.position.y)
+
+        snapshot.search_key = search_key
+        snapshot.structure_version = entity_changes.structure_version()
+        snapshot.entities, snapshot.fingerprints, delta.buildings, delta.removed_buildings =
+            diff_buildings(previous, character, radius, options, search_key, full)
+    end
+
+    delta.electricity = state.electricity
+    delta.flow = state.flow
+    delta.research_queue = state.research_queue
+
+    entity_changes.store(character_id, snapshot)
+
+    return delta
+end
+
+return state_data_delta
@@ -16,6 +16,16 @@ function fle_utils.inventory_stats(inv)
     return {slots = slots, empty = empty, items = items}
 end
 
+-- Ends a run started by execute_actions(true): pause and go back to the previous speed.
+function fle_utils.stop_run_until_idle()
+    local run = global.fle.run_until_idle
+    if not run then return end
+
+    global.fle.run_until_idle = nil
+    game.speed = run.speed
+    game.tick_paused = true
+end
+
 function fle_utils.floor(x, d)
     local p = 10 ^ d
     return math.floor(x * p) / p
@@ -26,6 +36,34 @@ function fle_utils.ceil(x, d)
     return math.ceil(x * power) / power
 end
 
+-- Filter for find_entities_filtered/find_tiles_filtered covering the area the caller asked
+-- for in `options.area`, or `radius` tiles around the character. `extra` filter keys are
+-- copied in.
+function fle_utils.search_filter(character, radius, options, extra)
+    local filter = {}
+    if options and options.area then
+        filter.area = options.area
+    else
+        filter.position = character.position
+        filter.radius = radius
+    end
+
+    for key, value in pairs(extra or {}) do filter[key] = value end
+
+    return filter
+end
+
+-- Whether the caller asked for `field`; every field is wanted when `options.fields` is unset.
+function fle_utils.wants(options, field)
+    if not options or not options.fields then return true end
+
+    for _, wanted in ipairs(options.fields) do
+        if wanted == field then return true end
+    end
+
+    return false
+end
+
 function fle_utils.check_selection_reach(character, character_config,
                                          target_position)
     character.update_selected_entity(target_position)